@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import wave
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from teamspeak_meeting_notes import pipeline, summarize, transcribe
+from teamspeak_meeting_notes.models import TranscriptSegment
+
+SEGMENT_SECONDS = 4.0
+
+
+def fake_transcribe(path: Path, language: str | None = None, **_: Any) -> list[TranscriptSegment]:
+    with wave.open(str(path), "rb") as reader:
+        duration = reader.getnframes() / reader.getframerate()
+    segments: list[TranscriptSegment] = []
+    start = 0.0
+    while start < duration:
+        end = min(duration, start + SEGMENT_SECONDS)
+        index = len(segments)
+        text = f"第{index}段 我们讨论一下进度 next step {index % 7}，需要跟进。"
+        segments.append(TranscriptSegment(start_seconds=start, end_seconds=end, text=text))
+        start = end
+    return segments
+
+
+class FakeResponses:
+    def create(self, model: str, input: list[dict[str, str]], stream: bool = False) -> Any:
+        prompt = input[-1]["content"]
+        text = f"会议助手00:00 共收到{len(prompt)}字符的转写。\n综合观察 合成数据。"
+        return SimpleNamespace(output_text=text)
+
+
+class FakeClient:
+    responses = FakeResponses()
+
+
+@contextmanager
+def fake_backends() -> Iterator[None]:
+    # Swap out everything that would leave the machine: ASR, the LLM and the ffmpeg check.
+    saved = (
+        transcribe.transcribe_with_openai,
+        transcribe.transcribe_with_local_whisper,
+        summarize._ollama_client,
+        pipeline.ensure_ffmpeg_tools,
+    )
+    transcribe.transcribe_with_openai = fake_transcribe
+    transcribe.transcribe_with_local_whisper = fake_transcribe
+    summarize._ollama_client = lambda: (FakeClient(), "fake-model")
+    pipeline.ensure_ffmpeg_tools = lambda: None
+    try:
+        yield
+    finally:
+        (
+            transcribe.transcribe_with_openai,
+            transcribe.transcribe_with_local_whisper,
+            summarize._ollama_client,
+            pipeline.ensure_ffmpeg_tools,
+        ) = saved
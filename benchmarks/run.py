@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+from fakes import fake_backends, fake_transcribe
+from synthetic import RECORDING_STARTER, MeetingSpec, write_meeting
+
+from teamspeak_meeting_notes.audio_probe import probe_audios
+from teamspeak_meeting_notes.filename_parser import parse_tracks
+from teamspeak_meeting_notes.pipeline import PipelineConfig, run_pipeline
+from teamspeak_meeting_notes.summarize import summarize_heuristic
+from teamspeak_meeting_notes.timeline import merge_timeline
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+PROFILES: dict[str, list[MeetingSpec]] = {
+    "quick": [
+        MeetingSpec("duo_1m", tracks=2, duration_seconds=60, silence_ratio=0.5),
+    ],
+    "standard": [
+        MeetingSpec("duo_1m", tracks=2, duration_seconds=60, silence_ratio=0.5),
+        MeetingSpec("team_5m", tracks=6, duration_seconds=300, silence_ratio=0.7, seed=1),
+        MeetingSpec("quiet_5m", tracks=4, duration_seconds=300, silence_ratio=0.95, seed=2),
+        MeetingSpec("dense_5m", tracks=4, duration_seconds=300, silence_ratio=0.2, seed=3),
+    ],
+    "full": [
+        MeetingSpec("duo_1m", tracks=2, duration_seconds=60, silence_ratio=0.5),
+        MeetingSpec("team_5m", tracks=6, duration_seconds=300, silence_ratio=0.7, seed=1),
+        MeetingSpec("quiet_5m", tracks=4, duration_seconds=300, silence_ratio=0.95, seed=2),
+        MeetingSpec("dense_5m", tracks=4, duration_seconds=300, silence_ratio=0.2, seed=3),
+        MeetingSpec("town_hall_20m", tracks=10, duration_seconds=1200, silence_ratio=0.85, seed=4),
+    ],
+}
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    # One untimed call first, so lazy imports, lru caches and regex compilation are not
+    # charged to whichever run happens to go first.
+    fn()
+    timings: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate() -> float:
+    # A fixed mix of interpreter and NumPy work; results are reported relative to it so a
+    # baseline recorded on one machine stays meaningful on another.
+    def work() -> None:
+        total = 0
+        for index in range(300_000):
+            total += index % 7
+        data = np.random.default_rng(0).normal(size=480 * 2_000)
+        np.sqrt(np.mean(data.reshape(-1, 480) ** 2, axis=1))
+
+    return measure(work, repeat=5)
+
+
+def pipeline_config(meeting_dir: Path, output_dir: Path) -> PipelineConfig:
+    return PipelineConfig(
+        audio_dir=meeting_dir,
+        recording_starter=RECORDING_STARTER,
+        output_dir=output_dir,
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="cloud",
+        whisper_device="cpu",
+        language="zh",
+        meeting_title="基准测试",
+        use_cache=False,
+        run_report=False,
+    )
+
+
+def run_cases(specs: list[MeetingSpec], work_dir: Path, repeat: int) -> dict[str, float]:
+    results: dict[str, float] = {}
+    for spec in specs:
+        started = time.perf_counter()
+        meeting_dir = write_meeting(work_dir / "meetings", spec)
+        logging.info("Generated %s in %.1fs", spec.name, time.perf_counter() - started)
+
+        tracks = parse_tracks(meeting_dir, recording_starter=RECORDING_STARTER)
+        paths = [track.path for track in tracks]
+        results[f"parse:{spec.name}"] = measure(
+            lambda meeting_dir=meeting_dir: parse_tracks(meeting_dir, RECORDING_STARTER), repeat
+        )
+        results[f"probe:{spec.name}"] = measure(lambda paths=paths: probe_audios(paths), repeat)
+
+        track_segments = [(track, fake_transcribe(track.path)) for track in tracks]
+        results[f"merge:{spec.name}"] = measure(
+            lambda track_segments=track_segments: merge_timeline(track_segments), repeat
+        )
+        utterances = merge_timeline(track_segments)
+        results[f"summarize_heuristic:{spec.name}"] = measure(
+            lambda utterances=utterances: summarize_heuristic(utterances, "基准测试"), repeat
+        )
+
+        config = pipeline_config(meeting_dir, work_dir / "output" / spec.name)
+        with fake_backends():
+            pipeline_seconds = measure(lambda config=config: run_pipeline(config), repeat)
+            resumed = replace(config, resume=True)
+            results[f"pipeline_resume:{spec.name}"] = measure(
+                lambda resumed=resumed: run_pipeline(resumed), repeat
+            )
+        results[f"pipeline:{spec.name}"] = pipeline_seconds
+        logging.info(
+            "%s: pipeline %.2fs for %.0fs of audio (%.0fx real time)",
+            spec.name,
+            pipeline_seconds,
+            spec.audio_seconds,
+            spec.audio_seconds / pipeline_seconds,
+        )
+    return results
+
+
+def compare(
+    results: dict[str, float],
+    calibration: float,
+    baseline: dict[str, object],
+    tolerance: float,
+    min_seconds: float,
+) -> list[str]:
+    base_cases: dict[str, float] = baseline["cases"]  # type: ignore[assignment]
+    base_calibration = float(baseline["calibration_seconds"])  # type: ignore[arg-type]
+    speed = calibration / base_calibration
+    regressions: list[str] = []
+    print(f"{'case':<40} {'baseline':>10} {'expected':>10} {'now':>10} {'ratio':>7}")
+    for name, seconds in sorted(results.items()):
+        if name not in base_cases:
+            print(f"{name:<40} {'-':>10} {'-':>10} {seconds:>10.4f} {'new':>7}")
+            continue
+        expected = base_cases[name] * speed
+        ratio = seconds / expected if expected else float("inf")
+        flag = ""
+        # Tiny cases are dominated by timer noise; only flag them past an absolute slack too.
+        if ratio > 1 + tolerance and seconds - expected > min_seconds:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<40} {base_cases[name]:>10.4f} {expected:>10.4f} {seconds:>10.4f} "
+            f"{ratio:>7.2f}{flag}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline on synthetic meetings.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="standard")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run's timings as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="Allowed slowdown relative to the (speed-adjusted) baseline, e.g. 0.3 = 30%%.",
+    )
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    parser.add_argument("--work-dir", type=Path, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("teamspeak_meeting_notes").setLevel(logging.WARNING)
+
+    calibration = calibrate()
+    with tempfile.TemporaryDirectory(prefix="ts_bench_") as tmp_dir:
+        work_dir = args.work_dir or Path(tmp_dir)
+        results = run_cases(PROFILES[args.profile], work_dir, args.repeat)
+
+    if args.update_baseline:
+        cases = dict(results)
+        if args.baseline.exists():
+            # Keep cases from other profiles, rescaled to this machine's calibration.
+            previous = json.loads(args.baseline.read_text(encoding="utf-8"))
+            scale = calibration / float(previous["calibration_seconds"])
+            cases = {name: value * scale for name, value in previous["cases"].items()} | cases
+        baseline = {
+            "profile": args.profile,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "calibration_seconds": calibration,
+            "cases": cases,
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline first.")
+        return 2
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, calibration, baseline, args.tolerance, args.min_seconds)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import wave
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+MEETING_START = datetime(2026, 2, 23, 10, 0, 0)
+RECORDING_STARTER = "主持人"
+SPEAKERS = [
+    "曾庆宝",
+    "iOS_Client",
+    "Alice",
+    "Bob",
+    "王小明",
+    "Carol",
+    "Dave",
+    "李雷",
+    "Eve",
+    "韩梅梅",
+]
+BLOCK_SECONDS = 30
+
+
+@dataclass(frozen=True, slots=True)
+class MeetingSpec:
+    name: str
+    tracks: int
+    duration_seconds: float
+    silence_ratio: float
+    sample_rate: int = 16000
+    capture: bool = True
+    seed: int = 0
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.tracks * self.duration_seconds
+
+
+def _stamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d_%H-%M-%S.%f")
+
+
+def track_filename(spec: MeetingSpec, index: int) -> str:
+    # Later speakers join a little after the recording starts, like real sessions.
+    started = MEETING_START + timedelta(seconds=index * 1.5, microseconds=index * 1234)
+    if spec.capture and index == 0:
+        return f"capture_{_stamp(started)}.wav"
+    speaker = SPEAKERS[index % len(SPEAKERS)]
+    if index >= len(SPEAKERS):
+        speaker = f"{speaker}_{index}"
+    return f"playback_{speaker}_{40 + index}_{_stamp(started)}.wav"
+
+
+def _speech_mask(rng: np.random.Generator, spec: MeetingSpec) -> np.ndarray:
+    # Alternate talk bursts and pauses whose mean lengths produce the requested silence ratio.
+    frames = int(spec.duration_seconds * 10)
+    mask = np.zeros(frames, dtype=bool)
+    talk_mean = 4.0
+    pause_mean = talk_mean * spec.silence_ratio / max(1e-6, 1.0 - spec.silence_ratio)
+    position = int(rng.exponential(pause_mean) * 10)
+    while position < frames:
+        talk = max(5, int(rng.exponential(talk_mean) * 10))
+        mask[position : position + talk] = True
+        position += talk + max(3, int(rng.exponential(pause_mean) * 10))
+    return mask
+
+
+def _render_block(
+    rng: np.random.Generator,
+    mask: np.ndarray,
+    start_seconds: float,
+    seconds: float,
+    sample_rate: int,
+    pitch: float,
+) -> np.ndarray:
+    count = int(seconds * sample_rate)
+    t = start_seconds + np.arange(count) / sample_rate
+    noise = rng.normal(0.0, 0.0008, size=count)
+    voiced = mask[np.minimum((t * 10).astype(np.int64), len(mask) - 1)]
+    # A vibrato tone with harmonics is enough for the energy/ZCR VAD to call it speech.
+    vibrato = pitch * (1.0 + 0.03 * np.sin(2 * np.pi * 5.0 * t))
+    phase = 2 * np.pi * np.cumsum(vibrato) / sample_rate
+    tone = 0.25 * np.sin(phase) + 0.1 * np.sin(2 * phase) + 0.05 * np.sin(3 * phase)
+    return noise + np.where(voiced, tone, 0.0)
+
+
+def write_meeting(root: Path, spec: MeetingSpec) -> Path:
+    meeting_dir = root / spec.name
+    meeting_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(spec.tracks):
+        rng = np.random.default_rng([spec.seed, index])
+        mask = _speech_mask(rng, spec)
+        pitch = 110.0 + 25.0 * (index % 7)
+        path = meeting_dir / track_filename(spec, index)
+        with wave.open(str(path), "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(spec.sample_rate)
+            written = 0.0
+            while written < spec.duration_seconds:
+                seconds = min(BLOCK_SECONDS, spec.duration_seconds - written)
+                block = _render_block(rng, mask, written, seconds, spec.sample_rate, pitch)
+                writer.writeframes((np.clip(block, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+                written += seconds
+    return meeting_dir
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from teamspeak_meeting_notes.models import TimelineUtterance
+
+DEFAULT_PEAK_WINDOW_SECONDS = 180.0
+LONG_GAP_SECONDS = 60.0
+
+
+@dataclass(slots=True)
+class SpeakerStats:
+    name: str
+    utterances: int
+    talk_seconds: float
+    # Seconds this speaker talked while at least one other speaker was talking too.
+    overlap_seconds: float
+    # Turns started while another speaker was still talking.
+    interruptions: int
+
+
+@dataclass(slots=True)
+class ActivityPeak:
+    start_at: datetime
+    end_at: datetime
+    talk_seconds: float
+    overlap_seconds: float
+    # (name, talk seconds inside the window), most talkative first.
+    speakers: list[tuple[str, float]]
+    # Indices into the analyzed utterances whose start falls inside the window.
+    rows: np.ndarray
+
+
+@dataclass(slots=True)
+class TimelineStats:
+    start_at: datetime
+    end_at: datetime
+    duration_seconds: float
+    speech_seconds: float
+    overlap_seconds: float
+    interruptions: int
+    # Most talk time first; ties keep the order of first appearance.
+    speakers: list[SpeakerStats]
+    gaps: int
+    median_gap_seconds: float
+    p90_gap_seconds: float
+    longest_gap_seconds: float
+    long_gaps: int
+    # Busiest non-overlapping windows by talk time, in chronological order.
+    peaks: list[ActivityPeak]
+
+
+def _merge_intervals(
+    starts: np.ndarray, ends: np.ndarray, groups: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Union of the intervals of each group. Shifting every group past the previous one lets a
+    # single running maximum track the reach of each group without resetting between groups.
+    order = np.lexsort((starts, groups))
+    starts, ends, groups = starts[order], ends[order], groups[order]
+    shift = groups * (float(ends.max()) + 1.0)
+    reach = np.maximum.accumulate(ends + shift) - shift
+    begins = np.ones(len(starts), dtype=bool)
+    begins[1:] = (groups[1:] != groups[:-1]) | (starts[1:] > reach[:-1])
+    first = np.flatnonzero(begins)
+    last = np.append(first[1:] - 1, len(starts) - 1)
+    return starts[first], reach[last], groups[first]
+
+
+def _between(
+    points: np.ndarray, totals: np.ndarray, begin: np.ndarray, end: np.ndarray
+) -> np.ndarray:
+    return np.interp(end, points, totals) - np.interp(begin, points, totals)
+
+
+def timeline_stats(
+    utterances: Sequence[TimelineUtterance],
+    window_seconds: float = DEFAULT_PEAK_WINDOW_SECONDS,
+    peaks: int = 2,
+) -> TimelineStats:
+    if not utterances:
+        raise ValueError("Cannot analyze empty timeline")
+    count = len(utterances)
+    origin = min(row.start_at for row in utterances)
+    speaker_index: dict[str, int] = {}
+    codes = np.fromiter(
+        (speaker_index.setdefault(row.speaker_name, len(speaker_index)) for row in utterances),
+        dtype=np.int64,
+        count=count,
+    )
+    names = list(speaker_index)
+    starts = np.fromiter(
+        ((row.start_at - origin).total_seconds() for row in utterances),
+        dtype=np.float64,
+        count=count,
+    )
+    ends = np.fromiter(
+        ((row.end_at - origin).total_seconds() for row in utterances), dtype=np.float64, count=count
+    )
+    ends = np.maximum(ends, starts)
+    duration = float(ends.max())
+
+    # Per-speaker turns: a speaker's own overlapping or touching segments count once.
+    turn_starts, turn_ends, turn_codes = _merge_intervals(starts, ends, codes)
+    talk = np.bincount(turn_codes, weights=turn_ends - turn_starts, minlength=len(names))
+
+    # Sweep over turn boundaries: the number of speakers talking is constant between two
+    # consecutive boundaries. Ends sort before starts so back-to-back turns do not overlap.
+    points = np.concatenate((turn_starts, turn_ends))
+    deltas = np.concatenate((np.ones(len(turn_starts)), -np.ones(len(turn_ends))))
+    order = np.lexsort((deltas, points))
+    points = points[order]
+    active = np.cumsum(deltas[order])[:-1]
+    steps = np.diff(points)
+    # Piecewise-linear running totals at each boundary, read anywhere else with np.interp.
+    talk_total = np.concatenate(([0.0], np.cumsum(active * steps)))
+    overlap_total = np.concatenate(([0.0], np.cumsum((active >= 2) * steps)))
+
+    overlap = np.bincount(
+        turn_codes,
+        weights=_between(points, overlap_total, turn_starts, turn_ends),
+        minlength=len(names),
+    )
+    # Turns open at a turn start, not counting the new turn itself: a speaker's own earlier
+    # turns always ended before it, so anything left belongs to someone else.
+    sorted_starts = np.sort(turn_starts)
+    sorted_ends = np.sort(turn_ends)
+    others = (
+        np.searchsorted(sorted_starts, turn_starts, side="left")
+        - np.searchsorted(sorted_ends, turn_starts, side="right")
+        + (turn_ends == turn_starts)
+    )
+    interrupting = others > 0
+    interruptions = np.bincount(turn_codes[interrupting], minlength=len(names))
+
+    speech_starts, speech_ends, _ = _merge_intervals(
+        turn_starts, turn_ends, np.zeros(len(turn_starts), dtype=np.int64)
+    )
+    gaps = speech_starts[1:] - speech_ends[:-1]
+
+    # Rounded so float noise from different offsets does not reorder equal talk times.
+    ranked = np.argsort(-np.round(talk, 3), kind="stable")
+    utterance_counts = np.bincount(codes, minlength=len(names))
+    speakers = [
+        SpeakerStats(
+            name=names[code],
+            utterances=int(utterance_counts[code]),
+            talk_seconds=float(talk[code]),
+            overlap_seconds=float(overlap[code]),
+            interruptions=int(interruptions[code]),
+        )
+        for code in ranked
+    ]
+
+    return TimelineStats(
+        start_at=origin,
+        end_at=origin + timedelta(seconds=duration),
+        duration_seconds=duration,
+        speech_seconds=float((speech_ends - speech_starts).sum()),
+        overlap_seconds=float(overlap_total[-1]),
+        interruptions=int(interrupting.sum()),
+        speakers=speakers,
+        gaps=len(gaps),
+        median_gap_seconds=float(np.median(gaps)) if len(gaps) else 0.0,
+        p90_gap_seconds=float(np.percentile(gaps, 90)) if len(gaps) else 0.0,
+        longest_gap_seconds=float(gaps.max()) if len(gaps) else 0.0,
+        long_gaps=int((gaps > LONG_GAP_SECONDS).sum()),
+        peaks=_activity_peaks(
+            origin,
+            names,
+            starts,
+            (turn_starts, turn_ends, turn_codes),
+            (points, talk_total, overlap_total),
+            window_seconds,
+            peaks,
+        ),
+    )
+
+
+def _activity_peaks(
+    origin: datetime,
+    names: list[str],
+    starts: np.ndarray,
+    turns: tuple[np.ndarray, np.ndarray, np.ndarray],
+    totals: tuple[np.ndarray, np.ndarray, np.ndarray],
+    window_seconds: float,
+    limit: int,
+) -> list[ActivityPeak]:
+    turn_starts, turn_ends, turn_codes = turns
+    points, talk_total, overlap_total = totals
+    # Talk time in a sliding window is piecewise linear in the window start, so its maximum
+    # sits where the window opens on a turn start or closes on a turn end. Each candidate
+    # costs two lookups into the running total.
+    candidates = np.unique(
+        np.concatenate((turn_starts, np.maximum(turn_ends - window_seconds, 0.0)))
+    )
+    talk = _between(points, talk_total, candidates, candidates + window_seconds)
+    chosen: list[float] = []
+    while len(chosen) < limit and len(candidates):
+        best = int(np.argmax(talk))
+        chosen.append(float(candidates[best]))
+        keep = np.abs(candidates - candidates[best]) >= window_seconds
+        candidates, talk = candidates[keep], talk[keep]
+
+    result: list[ActivityPeak] = []
+    for begin in sorted(chosen):
+        end = begin + window_seconds
+        inside = np.clip(np.minimum(turn_ends, end) - np.maximum(turn_starts, begin), 0.0, None)
+        per_speaker = np.bincount(turn_codes, weights=inside, minlength=len(names))
+        ranked = np.argsort(-np.round(per_speaker, 3), kind="stable")
+        window = np.array([begin]), np.array([end])
+        result.append(
+            ActivityPeak(
+                start_at=origin + timedelta(seconds=begin),
+                end_at=origin + timedelta(seconds=end),
+                talk_seconds=float(_between(points, talk_total, *window)[0]),
+                overlap_seconds=float(_between(points, overlap_total, *window)[0]),
+                speakers=[
+                    (names[code], float(per_speaker[code]))
+                    for code in ranked
+                    if per_speaker[code] > 0
+                ],
+                rows=np.flatnonzero((starts >= begin) & (starts < end)),
+            )
+        )
+    return result
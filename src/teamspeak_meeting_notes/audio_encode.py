@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from teamspeak_meeting_notes.instrument import span
+from teamspeak_meeting_notes.models import AudioInfo
+
+UploadFormat = Literal["flac", "opus", "wav"]
+
+UPLOAD_SAMPLE_RATE = 16000
+MIN_ENCODE_BYTES = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+_CODEC_ARGS: dict[str, tuple[str, list[str]]] = {
+    "flac": (".flac", ["-c:a", "flac", "-compression_level", "5"]),
+    "opus": (".ogg", ["-c:a", "libopus", "-b:a", "24k", "-application", "voip"]),
+}
+# Rough output rates at 16 kHz mono: flac keeps about 60% of PCM speech, opus runs at 24 kbit/s.
+_ENCODED_BYTES_PER_SECOND: dict[str, float] = {"flac": 20000.0, "opus": 3000.0}
+
+
+@dataclass(slots=True)
+class EncodedUpload:
+    path: Path
+    original_bytes: int
+    encoded_bytes: int
+    encode_seconds: float
+
+
+def build_encode_command(path: Path, output_path: Path, upload_format: UploadFormat) -> list[str]:
+    if upload_format not in _CODEC_ARGS:
+        raise ValueError(f"Unsupported upload format: {upload_format}")
+    _, codec_args = _CODEC_ARGS[upload_format]
+    return [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-i",
+        str(path),
+        "-ac",
+        "1",
+        "-ar",
+        str(UPLOAD_SAMPLE_RATE),
+        *codec_args,
+        str(output_path),
+    ]
+
+
+def _already_small(
+    size: int, info: AudioInfo | None, upload_format: UploadFormat, min_bytes: int
+) -> bool:
+    if size < min_bytes:
+        return True
+    if info is None or not info.duration_seconds:
+        return False
+    # Skip inputs that are already close to what the encoder would produce, e.g. 16 kHz mono
+    # PCM for flac, where the saving would not pay for the ffmpeg run.
+    estimated_bytes = info.duration_seconds * _ENCODED_BYTES_PER_SECOND[upload_format]
+    return size - estimated_bytes < min_bytes
+
+
+@contextmanager
+def encoded_for_upload(
+    path: Path,
+    upload_format: UploadFormat,
+    info: AudioInfo | None = None,
+    min_bytes: int = MIN_ENCODE_BYTES,
+) -> Iterator[EncodedUpload]:
+    size = path.stat().st_size
+    passthrough = EncodedUpload(
+        path=path, original_bytes=size, encoded_bytes=size, encode_seconds=0.0
+    )
+    if upload_format == "wav" or _already_small(size, info, upload_format, min_bytes):
+        yield passthrough
+        return
+
+    suffix, _ = _CODEC_ARGS[upload_format]
+    with tempfile.TemporaryDirectory(prefix="ts_upload_") as tmp_dir:
+        output_path = Path(tmp_dir) / f"{path.stem}{suffix}"
+        cmd = build_encode_command(path, output_path, upload_format)
+        started = time.perf_counter()
+        with span("encode", file=path.name, format=upload_format):
+            proc = subprocess.run(cmd, check=False, capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        if proc.returncode != 0 or not output_path.exists():
+            stderr = proc.stderr.strip()
+            tail = stderr[-600:] if stderr else "<no stderr>"
+            logger.warning("Upload encode failed for %s, sending original: %s", path.name, tail)
+            yield passthrough
+            return
+
+        encoded = EncodedUpload(
+            path=output_path,
+            original_bytes=size,
+            encoded_bytes=output_path.stat().st_size,
+            encode_seconds=elapsed,
+        )
+        logger.info(
+            "Encoded %s to %s for upload: %d -> %d bytes (%.0f%% smaller) in %.2fs",
+            path.name,
+            upload_format,
+            encoded.original_bytes,
+            encoded.encoded_bytes,
+            100.0 * (1 - encoded.encoded_bytes / max(1, encoded.original_bytes)),
+            encoded.encode_seconds,
+        )
+        yield encoded
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 import json
+import logging
 import shutil
+import struct
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 from teamspeak_meeting_notes.models import AudioInfo
 
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_UNKNOWN_CHUNK_SIZE = 0xFFFFFFFF
+
+logger = logging.getLogger(__name__)
+
 
 def ensure_ffmpeg_tools() -> None:
     missing = [tool for tool in ("ffmpeg", "ffprobe") if shutil.which(tool) is None]
@@ -15,7 +26,95 @@ def ensure_ffmpeg_tools() -> None:
         raise RuntimeError(f"Missing required tools: {names}. Please install ffmpeg.")
 
 
-def probe_audio(path: Path) -> AudioInfo:
+@dataclass(slots=True)
+class WavLayout:
+    audio_format: int
+    channels: int
+    sample_rate: int
+    byte_rate: int
+    block_align: int
+    bits_per_sample: int
+    data_offset: int
+    data_size: int
+
+
+def read_wav_layout(path: Path) -> WavLayout | None:
+    with path.open("rb") as handle:
+        header = handle.read(12)
+        if len(header) < 12 or header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+            return None
+        file_size = path.stat().st_size
+
+        fmt: tuple[int, int, int, int, int, int] | None = None
+        data: tuple[int, int] | None = None
+        ds64_data_size: int | None = None
+        offset = 12
+        while offset + 8 <= file_size:
+            handle.seek(offset)
+            chunk_id, chunk_size = struct.unpack("<4sI", handle.read(8))
+            body_offset = offset + 8
+            if chunk_id == b"ds64":
+                ds64 = handle.read(min(chunk_size, 28))
+                if len(ds64) >= 16:
+                    ds64_data_size = struct.unpack_from("<Q", ds64, 8)[0]
+            elif chunk_id == b"fmt ":
+                body = handle.read(min(chunk_size, 40))
+                if len(body) < 16:
+                    return None
+                audio_format, channels, sample_rate, byte_rate, block_align, bits = (
+                    struct.unpack_from("<HHIIHH", body)
+                )
+                if audio_format == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    # The real format tag is the first two bytes of the SubFormat GUID.
+                    audio_format = struct.unpack_from("<H", body, 24)[0]
+                fmt = (audio_format, channels, sample_rate, byte_rate, block_align, bits)
+            elif chunk_id == b"data":
+                available = file_size - body_offset
+                if header[:4] == b"RF64" and ds64_data_size is not None:
+                    chunk_size = ds64_data_size
+                if chunk_size in (0, _UNKNOWN_CHUNK_SIZE) or chunk_size > available:
+                    # Writers that are still recording leave the size unset or stale.
+                    chunk_size = available
+                data = (body_offset, chunk_size)
+                if fmt is not None:
+                    break
+            if chunk_id != b"data" and chunk_size == _UNKNOWN_CHUNK_SIZE:
+                return None
+            offset = body_offset + chunk_size + (chunk_size & 1)
+
+    if fmt is None or data is None:
+        return None
+    audio_format, channels, sample_rate, byte_rate, block_align, bits = fmt
+    return WavLayout(
+        audio_format=audio_format,
+        channels=channels,
+        sample_rate=sample_rate,
+        byte_rate=byte_rate,
+        block_align=block_align,
+        bits_per_sample=bits,
+        data_offset=data[0],
+        data_size=data[1],
+    )
+
+
+def probe_wav_header(path: Path) -> AudioInfo | None:
+    layout = read_wav_layout(path)
+    if layout is None or layout.sample_rate <= 0:
+        return None
+    if layout.audio_format in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) and layout.block_align > 0:
+        duration = (layout.data_size // layout.block_align) / layout.sample_rate
+    elif layout.byte_rate > 0:
+        duration = layout.data_size / layout.byte_rate
+    else:
+        return None
+    return AudioInfo(
+        duration_seconds=duration,
+        sample_rate=layout.sample_rate,
+        channels=layout.channels or None,
+    )
+
+
+def probe_audio_ffprobe(path: Path) -> AudioInfo:
     cmd = [
         "ffprobe",
         "-v",
@@ -39,3 +138,32 @@ def probe_audio(path: Path) -> AudioInfo:
             channels = int(stream["channels"])
 
     return AudioInfo(duration_seconds=duration, sample_rate=sample_rate, channels=channels)
+
+
+def _probe_native(path: Path) -> AudioInfo | None:
+    if path.suffix.lower() not in (".wav", ".wave"):
+        return None
+    try:
+        return probe_wav_header(path)
+    except (OSError, struct.error) as exc:
+        logger.debug("Native WAV probe failed for %s: %s", path.name, exc)
+        return None
+
+
+def probe_audio(path: Path) -> AudioInfo:
+    info = _probe_native(path)
+    if info is not None:
+        return info
+    return probe_audio_ffprobe(path)
+
+
+def probe_audios(paths: list[Path], workers: int = 8) -> list[AudioInfo]:
+    infos = [_probe_native(path) for path in paths]
+    pending = [index for index, info in enumerate(infos) if info is None]
+    if pending:
+        logger.debug("Falling back to ffprobe for %d file(s)", len(pending))
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as executor:
+            probed = executor.map(probe_audio_ffprobe, [paths[index] for index in pending])
+            for index, info in zip(pending, probed, strict=True):
+                infos[index] = info
+    return [info for info in infos if info is not None]
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from teamspeak_meeting_notes.columnar import ColumnarTimeline
+from teamspeak_meeting_notes.models import (
+    AudioInfo,
+    ParsedTrack,
+    TimelineUtterance,
+    TranscriptSegment,
+)
+
+CHECKPOINT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*parts: object) -> str:
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(path: Path) -> list[object]:
+    stat = path.stat()
+    return [path.name, stat.st_size, stat.st_mtime_ns]
+
+
+def tracks_to_json(tracks: list[ParsedTrack]) -> list[dict[str, Any]]:
+    return [
+        {
+            "path": str(track.path),
+            "kind": track.kind,
+            "speaker_name": track.speaker_name,
+            "speaker_id": track.speaker_id,
+            "started_at": track.started_at.isoformat(),
+        }
+        for track in tracks
+    ]
+
+
+def tracks_from_json(rows: list[dict[str, Any]]) -> list[ParsedTrack]:
+    return [
+        ParsedTrack(
+            path=Path(row["path"]),
+            kind=row["kind"],
+            speaker_name=row["speaker_name"],
+            speaker_id=row["speaker_id"],
+            started_at=datetime.fromisoformat(row["started_at"]),
+        )
+        for row in rows
+    ]
+
+
+def infos_to_json(infos: list[AudioInfo]) -> list[dict[str, Any]]:
+    return [
+        {
+            "duration_seconds": info.duration_seconds,
+            "sample_rate": info.sample_rate,
+            "channels": info.channels,
+        }
+        for info in infos
+    ]
+
+
+def infos_from_json(rows: list[dict[str, Any]]) -> list[AudioInfo]:
+    return [
+        AudioInfo(
+            duration_seconds=float(row["duration_seconds"]),
+            sample_rate=row["sample_rate"],
+            channels=row["channels"],
+        )
+        for row in rows
+    ]
+
+
+def segments_to_json(segments: list[TranscriptSegment]) -> list[dict[str, Any]]:
+    return [
+        {"start": seg.start_seconds, "end": seg.end_seconds, "text": seg.text} for seg in segments
+    ]
+
+
+def segments_from_json(rows: list[dict[str, Any]]) -> list[TranscriptSegment]:
+    return [
+        TranscriptSegment(
+            start_seconds=float(row["start"]),
+            end_seconds=float(row["end"]),
+            text=str(row["text"]),
+        )
+        for row in rows
+    ]
+
+
+def utterances_to_json(utterances: list[TimelineUtterance]) -> list[dict[str, Any]]:
+    return [
+        {
+            "speaker_name": row.speaker_name,
+            "start_at": row.start_at.isoformat(),
+            "end_at": row.end_at.isoformat(),
+            "text": row.text,
+            "source_file": str(row.source_file),
+        }
+        for row in utterances
+    ]
+
+
+def utterances_from_json(rows: list[dict[str, Any]]) -> list[TimelineUtterance]:
+    return [
+        TimelineUtterance(
+            speaker_name=row["speaker_name"],
+            start_at=datetime.fromisoformat(row["start_at"]),
+            end_at=datetime.fromisoformat(row["end_at"]),
+            text=row["text"],
+            source_file=Path(row["source_file"]),
+        )
+        for row in rows
+    ]
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".tmp_", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@dataclass(slots=True)
+class CheckpointStore:
+    path: Path
+    resume: bool
+    stages: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def load(self, stage: str, stage_fingerprint: str) -> Any | None:
+        if not self.resume:
+            return None
+        with self._lock:
+            entry = self.stages.get(stage)
+        if entry is None or entry.get("fingerprint") != stage_fingerprint:
+            return None
+        if "file" in entry:
+            side_path = self.path.with_name(entry["file"])
+            try:
+                data = json.loads(side_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable checkpoint %s: %s", side_path, exc)
+                return None
+        else:
+            data = entry["data"]
+        logger.info("Resuming from checkpoint: %s", stage)
+        return data
+
+    def save(self, stage: str, stage_fingerprint: str, data: Any) -> None:
+        self._commit(stage, {"fingerprint": stage_fingerprint, "data": data})
+
+    def save_external(self, stage: str, stage_fingerprint: str, data: Any) -> None:
+        # Segment lists go to their own file: the manifest is rewritten on every save, so
+        # keeping them inline would rewrite every earlier track's segments once per track.
+        side_path = self.path.with_name(f"{self.path.stem}.{fingerprint(stage)[:16]}.json")
+        _write_json(side_path, data)
+        self._commit(stage, {"fingerprint": stage_fingerprint, "file": side_path.name})
+
+    def _commit(self, stage: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self.stages[stage] = entry
+            _write_json(self.path, {"version": CHECKPOINT_VERSION, "stages": self.stages})
+
+    def _timeline_path(self, stage: str) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{stage}.columns")
+
+    def load_timeline(self, stage: str, stage_fingerprint: str) -> list[TimelineUtterance] | None:
+        data = self.load(stage, stage_fingerprint)
+        if data is None:
+            return None
+        if isinstance(data, list):
+            # Manifests written before the columnar file kept the timeline inline.
+            return utterances_from_json(data)
+        path = self.path.with_name(data["file"])
+        try:
+            return ColumnarTimeline.load(path).to_utterances()
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable timeline checkpoint %s: %s", path, exc)
+            return None
+
+    def save_timeline(
+        self, stage: str, stage_fingerprint: str, utterances: list[TimelineUtterance]
+    ) -> None:
+        # Large timelines go to a memory-mappable side file so the JSON manifest stays small.
+        path = self._timeline_path(stage)
+        ColumnarTimeline.from_utterances(utterances).save(path)
+        self.save(stage, stage_fingerprint, {"file": path.name, "count": len(utterances)})
+
+
+def open_checkpoints(
+    output_dir: Path,
+    audio_dir: Path,
+    resume: bool,
+    track_paths: list[Path] | None = None,
+) -> CheckpointStore:
+    source = str(audio_dir.resolve())
+    if track_paths is not None:
+        source += "\n" + "\n".join(sorted(str(path.resolve()) for path in track_paths))
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    path = output_dir / ".checkpoints" / f"{key}.json"
+    store = CheckpointStore(path=path, resume=resume)
+    if not resume:
+        return store
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        logger.info("No checkpoint manifest at %s; starting fresh", path)
+        return store
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable checkpoint manifest %s: %s", path, exc)
+        return store
+    if payload.get("version") == CHECKPOINT_VERSION:
+        store.stages = payload.get("stages", {})
+    return store
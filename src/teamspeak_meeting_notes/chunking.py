@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import logging
+import re
+import tempfile
+import wave
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from teamspeak_meeting_notes.instrument import in_current_context
+from teamspeak_meeting_notes.models import ASR_PLACEHOLDER_PREFIX, TranscriptSegment
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+@dataclass(slots=True)
+class ChunkSettings:
+    chunk_seconds: float = 600.0
+    overlap_seconds: float = 5.0
+    max_attempts: int = 2
+    workers: int = 2
+
+
+def chunk_variant(settings: ChunkSettings) -> str:
+    # Only the chunk layout can change a transcript; retry and worker counts cannot.
+    return f"chunks={settings.chunk_seconds}/{settings.overlap_seconds}"
+
+
+@dataclass(slots=True)
+class AudioChunk:
+    index: int
+    start_seconds: float
+    end_seconds: float
+
+
+def plan_chunks(
+    duration_seconds: float,
+    chunk_seconds: float,
+    overlap_seconds: float,
+) -> list[AudioChunk]:
+    if chunk_seconds <= 0 or duration_seconds <= chunk_seconds:
+        return [AudioChunk(index=0, start_seconds=0.0, end_seconds=duration_seconds)]
+    if not 0 <= overlap_seconds < chunk_seconds:
+        raise ValueError("Chunk overlap must be non-negative and shorter than the chunk length")
+
+    step = chunk_seconds - overlap_seconds
+    chunks: list[AudioChunk] = []
+    start = 0.0
+    while True:
+        end = min(start + chunk_seconds, duration_seconds)
+        chunks.append(AudioChunk(index=len(chunks), start_seconds=start, end_seconds=end))
+        if end >= duration_seconds:
+            return chunks
+        start += step
+
+
+def wav_duration(path: Path) -> float:
+    with wave.open(str(path), "rb") as reader:
+        return reader.getnframes() / reader.getframerate()
+
+
+def write_wav_slice(path: Path, chunk: AudioChunk, output_path: Path) -> None:
+    with wave.open(str(path), "rb") as reader, wave.open(str(output_path), "wb") as writer:
+        sample_rate = reader.getframerate()
+        writer.setnchannels(reader.getnchannels())
+        writer.setsampwidth(reader.getsampwidth())
+        writer.setframerate(sample_rate)
+        start_frame = int(chunk.start_seconds * sample_rate)
+        remaining = min(int(chunk.end_seconds * sample_rate), reader.getnframes()) - start_frame
+        reader.setpos(start_frame)
+        frame_bytes = reader.getsampwidth() * reader.getnchannels()
+        while remaining > 0:
+            raw = reader.readframes(min(remaining, sample_rate * 10))
+            if not raw:
+                break
+            writer.writeframes(raw)
+            remaining -= len(raw) // frame_bytes
+
+
+def _normalise(text: str) -> str:
+    return _NON_WORD.sub("", text).casefold()
+
+
+def stitch_segments(
+    results: list[tuple[AudioChunk, list[TranscriptSegment]]],
+) -> list[TranscriptSegment]:
+    stitched: list[TranscriptSegment] = []
+    for position, (chunk, segments) in enumerate(results):
+        lower = float("-inf")
+        upper = float("inf")
+        if position > 0:
+            previous = results[position - 1][0]
+            lower = (chunk.start_seconds + previous.end_seconds) / 2
+        if position + 1 < len(results):
+            following = results[position + 1][0]
+            upper = (following.start_seconds + chunk.end_seconds) / 2
+
+        for segment in segments:
+            start = chunk.start_seconds + segment.start_seconds
+            end = chunk.start_seconds + segment.end_seconds
+            if not lower <= (start + end) / 2 < upper:
+                continue
+            candidate = TranscriptSegment(start_seconds=start, end_seconds=end, text=segment.text)
+            if stitched and start < stitched[-1].end_seconds:
+                previous_text = _normalise(stitched[-1].text)
+                text = _normalise(segment.text)
+                if text and (text in previous_text or previous_text in text):
+                    # The same words were heard on both sides of a chunk boundary.
+                    if len(text) > len(previous_text):
+                        stitched[-1] = candidate
+                    continue
+            stitched.append(candidate)
+    return stitched
+
+
+def transcribe_chunked(
+    path: Path,
+    chunks: list[AudioChunk],
+    transcribe_chunk: Callable[[Path], list[TranscriptSegment]],
+    settings: ChunkSettings,
+    retryable: Callable[[BaseException], bool] = lambda _: True,
+) -> tuple[list[TranscriptSegment], bool]:
+    with tempfile.TemporaryDirectory(prefix="ts_chunks_") as tmp_dir:
+
+        def run(chunk: AudioChunk) -> tuple[list[TranscriptSegment], bool]:
+            chunk_path = Path(tmp_dir) / f"{path.stem}.chunk{chunk.index:04d}{path.suffix}"
+            write_wav_slice(path, chunk, chunk_path)
+            last_error: Exception | None = None
+            try:
+                for attempt in range(1, settings.max_attempts + 1):
+                    try:
+                        return transcribe_chunk(chunk_path), True
+                    except Exception as exc:
+                        last_error = exc
+                        logger.warning(
+                            "Chunk %d of %s failed (attempt %d/%d): %s",
+                            chunk.index,
+                            path.name,
+                            attempt,
+                            settings.max_attempts,
+                            exc,
+                        )
+                        if not retryable(exc):
+                            break
+            finally:
+                chunk_path.unlink(missing_ok=True)
+            placeholder = TranscriptSegment(
+                start_seconds=0.0,
+                end_seconds=chunk.end_seconds - chunk.start_seconds,
+                text=(
+                    f"{ASR_PLACEHOLDER_PREFIX}{path.name} "
+                    f"({chunk.start_seconds:.0f}s-{chunk.end_seconds:.0f}s): {last_error}]"
+                ),
+            )
+            return [placeholder], False
+
+        logger.info(
+            "Transcribing %s in %d chunk(s) of %.0fs with %.0fs overlap",
+            path.name,
+            len(chunks),
+            settings.chunk_seconds,
+            settings.overlap_seconds,
+        )
+        workers = max(1, min(settings.workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asr-chunk") as executor:
+            outcomes = list(executor.map(in_current_context(run), chunks))
+
+    stitched = stitch_segments(
+        [(chunk, segments) for chunk, (segments, _) in zip(chunks, outcomes, strict=True)]
+    )
+    return stitched, all(ok for _, ok in outcomes)
@@ -1,18 +1,35 @@
 from __future__ import annotations
 
 import argparse
+import glob
 import logging
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from teamspeak_meeting_notes.pipeline import PipelineConfig, run_pipeline
+# The pipeline modules pull in numpy (and, for some modes, openai/whisper); they are
+# imported inside the run functions so `--help` and argument errors stay instant.
+if TYPE_CHECKING:
+    from teamspeak_meeting_notes.pipeline import PipelineConfig
 
 
-def _build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="teamspeak-meeting-notes",
-        description="Generate meeting-note style summary from TeamSpeak wav recordings.",
-    )
-    parser.add_argument("--audio-dir", type=Path, default=Path("voice_record"))
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number, got {value}")
+    return number
+
+
+def _add_pipeline_arguments(parser: argparse.ArgumentParser, audio_dir: bool = True) -> None:
+    if audio_dir:
+        parser.add_argument("--audio-dir", type=Path, default=Path("voice_record"))
     parser.add_argument(
         "--recording-starter",
         type=str,
@@ -42,32 +59,342 @@ def _build_parser() -> argparse.ArgumentParser:
         default="hybrid",
         help="local=whisper CLI, cloud=OpenAI API, hybrid=local then cloud fallback.",
     )
+    parser.add_argument(
+        "--asr-strategy",
+        choices=("per-track", "mixdown"),
+        default="per-track",
+        help="per-track runs ASR on every track; mixdown mixes the time-aligned tracks, runs "
+        "ASR once and attributes each segment to the loudest track (cheaper for sparse "
+        "meetings, less accurate when people talk over each other).",
+    )
     parser.add_argument(
         "--whisper-device",
         choices=("auto", "cpu", "mps", "cuda"),
         default="auto",
         help="Local Whisper device selection. auto prefers cuda, then mps, then cpu.",
     )
+    parser.add_argument(
+        "--whisper-model",
+        type=str,
+        default="turbo",
+        help="Local Whisper model name, e.g. tiny, small, turbo, large-v3.",
+    )
+    parser.add_argument(
+        "--whisper-backend",
+        choices=("auto", "inprocess", "cli"),
+        default="auto",
+        help="inprocess=load the model once and reuse it, cli=spawn whisper per track, "
+        "auto=inprocess when the whisper module is importable, otherwise cli.",
+    )
+    parser.add_argument(
+        "--asr-workers",
+        type=_positive_int,
+        default=4,
+        help="Number of tracks transcribed concurrently.",
+    )
+    parser.add_argument(
+        "--local-asr-workers",
+        type=_positive_int,
+        default=2,
+        help="Max concurrent local Whisper runs (applies to local and hybrid modes).",
+    )
+    parser.add_argument(
+        "--cloud-asr-workers",
+        type=_positive_int,
+        default=4,
+        help="Max concurrent cloud ASR requests (applies to cloud and hybrid modes).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Transcript cache directory "
+        "(default: $XDG_CACHE_HOME/teamspeak-meeting-notes/transcripts).",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=_positive_int,
+        default=512,
+        help="Transcript cache size limit; least recently used entries are evicted first.",
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the transcript and summary caches.",
+    )
+    cache_group.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore cached transcripts and summaries and overwrite them with fresh results.",
+    )
+    parser.add_argument(
+        "--summary-cache-dir",
+        type=Path,
+        default=None,
+        help="Summary cache directory "
+        "(default: $XDG_CACHE_HOME/teamspeak-meeting-notes/summaries).",
+    )
+    parser.add_argument(
+        "--summary-cache-max-mb",
+        type=_positive_int,
+        default=64,
+        help="Summary cache size limit; least recently used entries are evicted first.",
+    )
+    parser.add_argument(
+        "--summary-cache-max-age-days",
+        type=float,
+        default=30.0,
+        help="Drop cached summaries not used for this many days; 0 keeps them indefinitely.",
+    )
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Send full tracks to ASR instead of only the speech regions found by VAD.",
+    )
+    parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=600.0,
+        help="Split tracks longer than this into overlapping chunks for ASR (0 disables).",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=float,
+        default=5.0,
+        help="Overlap in seconds between consecutive ASR chunks.",
+    )
+    parser.add_argument(
+        "--chunk-workers",
+        type=_positive_int,
+        default=2,
+        help="Number of chunks of one track transcribed concurrently.",
+    )
+    parser.add_argument(
+        "--upload-format",
+        choices=("flac", "opus", "wav"),
+        default="flac",
+        help="Encode audio to mono 16 kHz flac/opus before cloud ASR upload (wav=send as is).",
+    )
     parser.add_argument("--language", type=str, default=None, help="ASR language hint, e.g. zh")
     parser.add_argument("--meeting-title", type=str, default=None)
+    parser.add_argument(
+        "--summary-window-tokens",
+        type=_positive_int,
+        default=6000,
+        help="Transcripts larger than this are summarized per time window, then merged.",
+    )
+    parser.add_argument(
+        "--summary-concurrency",
+        type=_positive_int,
+        default=2,
+        help="Max concurrent window summary requests to the Ollama endpoint.",
+    )
+    parser.add_argument(
+        "--llm-max-concurrency",
+        type=_positive_int,
+        default=2,
+        help="Max in-flight requests to the Ollama endpoint across all meetings in this "
+        "process (watch and batch run several at once).",
+    )
+    parser.add_argument(
+        "--llm-tokens-per-minute",
+        type=int,
+        default=0,
+        help="Cap on prompt tokens sent to the Ollama endpoint per minute; 0 disables it.",
+    )
+    parser.add_argument(
+        "--stream-summary",
+        action="store_true",
+        help="Write summary tokens to the note file and stdout as they are generated.",
+    )
+    parser.add_argument(
+        "--heuristic-summary",
+        action="store_true",
+        help="Skip the LLM and write the rule-based summary; works offline and never "
+        "loads the openai client.",
+    )
+    parser.add_argument(
+        "--no-prompt-compaction",
+        action="store_true",
+        help="Send every ASR segment to the LLM verbatim instead of merging same-speaker runs, "
+        "aliasing speaker names and dropping filler and placeholder lines.",
+    )
+    parser.add_argument(
+        "--summary-stats",
+        action="store_true",
+        help="Add talk time, overlap, interruption and silence statistics to the LLM prompt.",
+    )
+    parser.add_argument(
+        "--heuristic-keywords",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help='JSON file {"action": [...], "off_topic": [...]} replacing the heuristic '
+        "summary's built-in keyword lists.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse checkpoints from a previous run in --output-dir; only redo changed or "
+        "failed stages and tracks.",
+    )
+    parser.add_argument(
+        "--no-run-report",
+        action="store_true",
+        help="Do not write the JSON run report (<note>.run.json) with per-stage timings.",
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=Path,
+        default=None,
+        help="Append the run's spans to this file as OpenTelemetry OTLP/JSON lines.",
+    )
     parser.add_argument(
         "--log-level",
         choices=("DEBUG", "INFO", "WARNING", "ERROR"),
         default="INFO",
         help="Runtime log verbosity.",
     )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="teamspeak-meeting-notes",
+        description="Generate meeting-note style summary from TeamSpeak wav recordings. "
+        "Run `teamspeak-meeting-notes watch --help` for the watch-folder daemon and "
+        "`teamspeak-meeting-notes live --help` to transcribe a meeting while it is recorded; "
+        "`teamspeak-meeting-notes batch --help` processes many meeting directories at once.",
+    )
+    _add_pipeline_arguments(parser)
     return parser
 
 
-def run_cli() -> None:
-    parser = _build_parser()
-    args = parser.parse_args()
-    logging.basicConfig(
-        level=getattr(logging, args.log_level),
-        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+def _build_watch_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="teamspeak-meeting-notes watch",
+        description="Watch --audio-dir (recursively) for new TeamSpeak recordings and write a "
+        "meeting note for each meeting once its tracks stop growing.",
+    )
+    _add_pipeline_arguments(parser)
+    parser.add_argument(
+        "--poll-interval",
+        type=_positive_float,
+        default=5.0,
+        help="Seconds between rescans of the watched directory.",
     )
+    parser.add_argument(
+        "--settle-seconds",
+        type=_positive_float,
+        default=60.0,
+        help="A meeting is processed once none of its tracks changed for this long.",
+    )
+    parser.add_argument(
+        "--meeting-gap",
+        type=_positive_float,
+        default=600.0,
+        help="Tracks starting more than this many seconds after a meeting ended begin a "
+        "new meeting.",
+    )
+    parser.add_argument(
+        "--meeting-workers",
+        type=_positive_int,
+        default=1,
+        help="Number of meetings processed concurrently.",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=_positive_int,
+        default=3,
+        help="Stop retrying a failing meeting after this many attempts until its tracks change.",
+    )
+    parser.add_argument(
+        "--retry-backoff",
+        type=_positive_float,
+        default=300.0,
+        help="Seconds before retrying a failed meeting; doubles after every further failure.",
+    )
+    parser.add_argument(
+        "--no-inotify",
+        action="store_true",
+        help="Always poll instead of waking up on inotify events (Linux only).",
+    )
+    return parser
+
 
-    config = PipelineConfig(
+def _build_live_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="teamspeak-meeting-notes live",
+        description="Transcribe the wav files in --audio-dir while TeamSpeak is still writing "
+        "them, then summarize as soon as the meeting ends.",
+    )
+    _add_pipeline_arguments(parser)
+    parser.add_argument(
+        "--poll-interval",
+        type=_positive_float,
+        default=2.0,
+        help="Seconds between checks for newly written audio.",
+    )
+    parser.add_argument(
+        "--window-seconds",
+        type=_positive_float,
+        default=20.0,
+        help="Minimum amount of new audio per track before it is sent to ASR.",
+    )
+    parser.add_argument(
+        "--max-window-seconds",
+        type=_positive_float,
+        default=60.0,
+        help="Send audio to ASR at this length even if nobody paused.",
+    )
+    parser.add_argument(
+        "--idle-seconds",
+        type=_positive_float,
+        default=60.0,
+        help="The meeting is over once no track has grown for this long.",
+    )
+    return parser
+
+
+def _build_batch_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="teamspeak-meeting-notes batch",
+        description="Process many meeting directories in one run. Tracks of all meetings share "
+        "one ASR worker queue, one Whisper model and one HTTP client per endpoint.",
+    )
+    parser.add_argument(
+        "meeting_dirs",
+        nargs="+",
+        help="Meeting directories or glob patterns, e.g. 'archive/2026-02-*'.",
+    )
+    _add_pipeline_arguments(parser, audio_dir=False)
+    # Every meeting directory replaces this placeholder in its own PipelineConfig.
+    parser.set_defaults(audio_dir=Path("."))
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Where to write the per-meeting JSON report "
+        "(default: output/batch_report_<time>.json).",
+    )
+    return parser
+
+
+def _expand_meeting_dirs(patterns: list[str]) -> list[Path]:
+    dirs: list[Path] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if any(ch in pattern for ch in "*?[") else [pattern]
+        for match in matches:
+            path = Path(match)
+            if path.is_dir() and path not in dirs:
+                dirs.append(path)
+    return dirs
+
+
+def _config_from_args(args: argparse.Namespace) -> PipelineConfig:
+    from teamspeak_meeting_notes.pipeline import PipelineConfig
+
+    return PipelineConfig(
         audio_dir=args.audio_dir,
         recording_starter=args.recording_starter,
         output_dir=args.output_dir,
@@ -75,10 +402,125 @@ def run_cli() -> None:
         bundle_only=args.bundle_only,
         bundle_path=args.bundle_path,
         asr_mode=args.asr_mode,
+        asr_strategy=args.asr_strategy,
         whisper_device=args.whisper_device,
         language=args.language,
         meeting_title=args.meeting_title,
+        asr_workers=args.asr_workers,
+        local_asr_workers=args.local_asr_workers,
+        cloud_asr_workers=args.cloud_asr_workers,
+        whisper_model=args.whisper_model,
+        whisper_backend=args.whisper_backend,
+        use_cache=not args.no_cache,
+        refresh_cache=args.refresh_cache,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        summary_cache_dir=args.summary_cache_dir,
+        summary_cache_max_bytes=args.summary_cache_max_mb * 1024 * 1024,
+        summary_cache_max_age_days=args.summary_cache_max_age_days,
+        vad=not args.no_vad,
+        chunk_seconds=args.chunk_seconds,
+        chunk_overlap_seconds=args.chunk_overlap,
+        chunk_workers=args.chunk_workers,
+        upload_format=args.upload_format,
+        summary_window_tokens=args.summary_window_tokens,
+        summary_concurrency=args.summary_concurrency,
+        stream_summary=args.stream_summary,
+        heuristic_summary=args.heuristic_summary,
+        heuristic_keywords=args.heuristic_keywords,
+        summary_stats=args.summary_stats,
+        compact_prompt=not args.no_prompt_compaction,
+        llm_max_concurrency=args.llm_max_concurrency,
+        llm_tokens_per_minute=args.llm_tokens_per_minute,
+        resume=args.resume,
+        run_report=not args.no_run_report,
+        trace_file=args.trace_file,
+    )
+
+
+def _parse_pipeline_args(parser: argparse.ArgumentParser, argv: list[str]) -> argparse.Namespace:
+    args = parser.parse_args(argv)
+    if args.chunk_seconds > 0 and not 0 <= args.chunk_overlap < args.chunk_seconds:
+        parser.error("--chunk-overlap must be non-negative and shorter than --chunk-seconds")
+    return args
+
+
+def _configure_logging(log_level: str) -> None:
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+    )
+
+
+def _run_watch(argv: list[str]) -> None:
+    from teamspeak_meeting_notes.watch import WatchSettings, watch_meetings
+
+    args = _parse_pipeline_args(_build_watch_parser(), argv)
+    _configure_logging(args.log_level)
+    settings = WatchSettings(
+        poll_interval=args.poll_interval,
+        settle_seconds=args.settle_seconds,
+        meeting_gap_seconds=args.meeting_gap,
+        meeting_workers=args.meeting_workers,
+        use_inotify=not args.no_inotify,
+        max_attempts=args.max_attempts,
+        retry_backoff_seconds=args.retry_backoff,
+    )
+    try:
+        watch_meetings(args.audio_dir, _config_from_args(args), settings)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+
+def _run_live(argv: list[str]) -> None:
+    from teamspeak_meeting_notes.live import LiveSettings, run_live
+
+    args = _parse_pipeline_args(_build_live_parser(), argv)
+    _configure_logging(args.log_level)
+    settings = LiveSettings(
+        poll_interval=args.poll_interval,
+        window_seconds=args.window_seconds,
+        max_window_seconds=max(args.max_window_seconds, args.window_seconds),
+        idle_seconds=args.idle_seconds,
     )
+    out = run_live(_config_from_args(args), settings)
+    print(f"Meeting note written to: {out}")
+
+
+def _run_batch(argv: list[str]) -> None:
+    from teamspeak_meeting_notes.pipeline import run_batch
+
+    parser = _build_batch_parser()
+    args = _parse_pipeline_args(parser, argv)
+    _configure_logging(args.log_level)
+    audio_dirs = _expand_meeting_dirs(args.meeting_dirs)
+    if not audio_dirs:
+        parser.error("no meeting directories matched")
+    if args.bundle_path is not None:
+        parser.error("--bundle-path names one file; batch writes one bundle per meeting")
+    results = run_batch(_config_from_args(args), audio_dirs, report_path=args.report)
+    for result in results:
+        status = f"ok -> {result.output_path}" if result.ok else f"FAILED: {result.error}"
+        print(f"{result.audio_dir}: {status}")
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+
+def run_cli() -> None:
+    argv = sys.argv[1:]
+    if argv[:1] == ["watch"]:
+        _run_watch(argv[1:])
+        return
+    if argv[:1] == ["live"]:
+        _run_live(argv[1:])
+        return
+    if argv[:1] == ["batch"]:
+        _run_batch(argv[1:])
+        return
+
+    args = _parse_pipeline_args(_build_parser(), argv)
+    _configure_logging(args.log_level)
+    from teamspeak_meeting_notes.pipeline import run_pipeline
 
-    out = run_pipeline(config)
+    out = run_pipeline(_config_from_args(args))
     print(f"Meeting note written to: {out}")
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+LLM_ENDPOINT = "ollama"
+DEFAULT_LLM_MAX_CONCURRENCY = 2
+
+_clients: dict[tuple[str, str | None], OpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_openai_client(api_key: str, base_url: str | None = None) -> OpenAI:
+    # One client per endpoint keeps its HTTP connection pool warm across tracks and meetings.
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # Importing openai costs most of the CLI's startup time; only pay it when needed.
+            from openai import OpenAI
+
+            # Retries happen in with_retries so they share one jittered backoff policy.
+            client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+            _clients[key] = client
+        return client
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 20.0
+
+    def delay(self, attempt: int) -> float:
+        # "Full jitter": parallel tracks that failed together do not retry in lockstep.
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt)
+        return random.uniform(0.0, ceiling)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    from openai import (
+        APIConnectionError,
+        APIStatusError,
+        InternalServerError,
+        RateLimitError,
+    )
+
+    if isinstance(exc, APIConnectionError | RateLimitError | InternalServerError):
+        return True
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in (408, 409) or exc.status_code >= 500
+    return isinstance(exc, ConnectionError | TimeoutError)
+
+
+def with_retries[R](
+    request: Callable[[], R],
+    what: str,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retryable: Callable[[BaseException], bool] = is_transient_error,
+    sleep: Callable[[float], None] = time.sleep,
+) -> R:
+    attempt = 0
+    while True:
+        try:
+            return request()
+        except Exception as exc:
+            attempt += 1
+            if attempt >= policy.max_attempts or not retryable(exc):
+                raise
+            delay = policy.delay(attempt - 1)
+            logger.warning(
+                "%s failed (attempt %d/%d), retrying in %.1fs: %s",
+                what,
+                attempt,
+                policy.max_attempts,
+                delay,
+                exc,
+            )
+            sleep(delay)
+
+
+class RequestLimiter:
+    def __init__(
+        self,
+        max_concurrency: int,
+        tokens_per_minute: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._available = float(tokens_per_minute)
+        self._refilled = clock()
+
+    def _take_tokens(self, tokens: int) -> None:
+        if self.tokens_per_minute <= 0 or tokens <= 0:
+            return
+        # A request larger than the whole bucket waits for a full bucket instead of forever.
+        tokens = min(tokens, self.tokens_per_minute)
+        rate = self.tokens_per_minute / 60.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._available = min(
+                    float(self.tokens_per_minute),
+                    self._available + (now - self._refilled) * rate,
+                )
+                self._refilled = now
+                if self._available >= tokens:
+                    self._available -= tokens
+                    return
+                wait = (tokens - self._available) / rate
+            self._sleep(wait)
+
+    @contextmanager
+    def slot(self, tokens: int = 0) -> Iterator[None]:
+        with self._slots:
+            self._take_tokens(tokens)
+            yield
+
+
+_limiters: dict[str, RequestLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_limiter(endpoint: str, max_concurrency: int, tokens_per_minute: int = 0) -> None:
+    # Concurrent meetings (watch, batch) configure the same limits; keep the live limiter
+    # so its in-flight slots stay accounted for.
+    with _limiters_lock:
+        current = _limiters.get(endpoint)
+        if (
+            current is None
+            or current.max_concurrency != max_concurrency
+            or current.tokens_per_minute != tokens_per_minute
+        ):
+            _limiters[endpoint] = RequestLimiter(max_concurrency, tokens_per_minute)
+
+
+def endpoint_limiter(endpoint: str) -> RequestLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(endpoint)
+        if limiter is None:
+            limiter = RequestLimiter(DEFAULT_LLM_MAX_CONCURRENCY)
+            _limiters[endpoint] = limiter
+        return limiter
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+
+from teamspeak_meeting_notes.models import TimelineUtterance
+
+# File layout: MAGIC, a little-endian u64 header length, a JSON header (count, speaker and
+# source tables, column offsets), then each column as raw little-endian data on an 8-byte
+# boundary. Loading maps the file and views the columns in place; only the header is parsed.
+MAGIC = b"TSTLINE\x00"
+FORMAT_VERSION = 1
+EPOCH = datetime(1970, 1, 1)
+MILLISECOND = timedelta(milliseconds=1)
+
+_HEADER_LENGTH = struct.Struct("<Q")
+_ALIGN = 8
+_COLUMNS = (
+    ("start_ms", "<i8"),
+    ("end_ms", "<i8"),
+    ("speaker", "<i4"),
+    ("source", "<i4"),
+    ("text_offsets", "<i8"),
+    ("text", "u1"),
+)
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+@dataclass(slots=True)
+class ColumnarTimeline:
+    start_ms: np.ndarray
+    end_ms: np.ndarray
+    speaker: np.ndarray
+    source: np.ndarray
+    # UTF-8 text of row i is text[text_offsets[i]:text_offsets[i + 1]].
+    text_offsets: np.ndarray
+    text: np.ndarray
+    speakers: list[str]
+    sources: list[Path]
+
+    def __len__(self) -> int:
+        return len(self.start_ms)
+
+    def text_at(self, index: int) -> str:
+        begin, end = self.text_offsets[index], self.text_offsets[index + 1]
+        return self.text[begin:end].tobytes().decode("utf-8")
+
+    @classmethod
+    def from_utterances(cls, utterances: Iterable[TimelineUtterance]) -> ColumnarTimeline:
+        if not isinstance(utterances, list):
+            utterances = list(utterances)
+        speakers: dict[str, int] = {}
+        sources: dict[Path, int] = {}
+        texts = [row.text.encode("utf-8") for row in utterances]
+        return cls(
+            # Timeline datetimes are naive wall-clock times from the recording filenames.
+            start_ms=np.array([(row.start_at - EPOCH) // MILLISECOND for row in utterances], "<i8"),
+            end_ms=np.array([(row.end_at - EPOCH) // MILLISECOND for row in utterances], "<i8"),
+            speaker=np.array(
+                [speakers.setdefault(row.speaker_name, len(speakers)) for row in utterances], "<i4"
+            ),
+            source=np.array(
+                [sources.setdefault(row.source_file, len(sources)) for row in utterances], "<i4"
+            ),
+            text_offsets=np.fromiter(
+                accumulate((len(text) for text in texts), initial=0),
+                dtype="<i8",
+                count=len(texts) + 1,
+            ),
+            text=np.frombuffer(b"".join(texts), dtype="u1"),
+            speakers=list(speakers),
+            sources=list(sources),
+        )
+
+    def to_utterances(self) -> list[TimelineUtterance]:
+        blob = self.text.tobytes()
+        offsets = self.text_offsets.tolist()
+        speakers = [self.speakers[code] for code in self.speaker.tolist()]
+        sources = [self.sources[code] for code in self.source.tolist()]
+        # NumPy builds the datetime objects in C, far faster than EPOCH + timedelta per row.
+        starts = self.start_ms.astype("datetime64[ms]").tolist()
+        ends = self.end_ms.astype("datetime64[ms]").tolist()
+        return [
+            TimelineUtterance(
+                speaker_name=speakers[index],
+                start_at=starts[index],
+                end_at=ends[index],
+                text=blob[offsets[index] : offsets[index + 1]].decode("utf-8"),
+                source_file=sources[index],
+            )
+            for index in range(len(starts))
+        ]
+
+    def save(self, path: Path) -> None:
+        columns: list[list[object]] = []
+        offset = 0
+        for name, dtype in _COLUMNS:
+            data = getattr(self, name)
+            columns.append([name, dtype, offset, len(data)])
+            offset = _aligned(offset + len(data) * np.dtype(dtype).itemsize)
+        header = json.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "count": len(self),
+                "speakers": self.speakers,
+                "sources": [str(source) for source in self.sources],
+                "columns": columns,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        data_start = _aligned(len(MAGIC) + _HEADER_LENGTH.size + len(header))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".tmp_", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(MAGIC)
+                handle.write(_HEADER_LENGTH.pack(len(header)))
+                handle.write(header)
+                for name, dtype, column_offset, _ in columns:
+                    handle.write(b"\x00" * (data_start + column_offset - handle.tell()))
+                    handle.write(np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> ColumnarTimeline:
+        with path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a columnar timeline file: {path}")
+        (header_length,) = _HEADER_LENGTH.unpack_from(mapped, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(mapped[header_start : header_start + header_length])
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar timeline version in {path}")
+        data_start = _aligned(header_start + header_length)
+        # The arrays are read-only views into the mapping, which stays open while they live.
+        columns = {
+            name: np.frombuffer(mapped, dtype=dtype, count=length, offset=data_start + offset)
+            for name, dtype, offset, length in header["columns"]
+        }
+        return cls(
+            **columns,
+            speakers=list(header["speakers"]),
+            sources=[Path(source) for source in header["sources"]],
+        )
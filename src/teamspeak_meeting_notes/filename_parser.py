@@ -50,10 +50,12 @@ def parse_track_filename(path: Path, recording_starter: str | None) -> ParsedTra
     raise ValueError(f"Unsupported wav filename, expected playback_* or capture_*: {path.name}")
 
 
+def parse_track_files(paths: list[Path], recording_starter: str | None) -> list[ParsedTrack]:
+    return [parse_track_filename(path, recording_starter=recording_starter) for path in paths]
+
+
 def parse_tracks(audio_dir: Path, recording_starter: str | None) -> list[ParsedTrack]:
-    parsed: list[ParsedTrack] = []
-    for path in sorted(audio_dir.glob("*.wav")):
-        parsed.append(parse_track_filename(path, recording_starter=recording_starter))
+    parsed = parse_track_files(sorted(audio_dir.glob("*.wav")), recording_starter)
     if not parsed:
         raise FileNotFoundError(f"No wav files found under {audio_dir}")
     return parsed
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows has no resource module
+    resource = None  # type: ignore[assignment]
+
+
+def _children_cpu_seconds() -> float:
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+def peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    span_id: str
+    parent_id: str | None
+    start_unix: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int | None = None
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def real_time_factor(self) -> float | None:
+        audio_seconds = self.attributes.get("audio_seconds")
+        if not audio_seconds:
+            return None
+        return self.wall_seconds / audio_seconds
+
+
+@dataclass(slots=True)
+class RunRecorder:
+    trace_id: str = field(default_factory=lambda: secrets.token_hex(16))
+    started_unix: float = field(default_factory=time.time)
+    spans: list[Span] = field(default_factory=list)
+    _started: float = field(default_factory=time.perf_counter, init=False, repr=False)
+    _cpu_started: float = field(default_factory=time.process_time, init=False, repr=False)
+    _children_started: float = field(default_factory=_children_cpu_seconds, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def report(self, **extra: Any) -> dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        by_name: dict[str, dict[str, float]] = {}
+        for span in spans:
+            totals = by_name.setdefault(
+                span.name,
+                {
+                    "count": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "audio_seconds": 0.0,
+                    "bytes_uploaded": 0,
+                },
+            )
+            totals["count"] += 1
+            totals["wall_seconds"] += span.wall_seconds
+            totals["cpu_seconds"] += span.cpu_seconds
+            totals["audio_seconds"] += span.attributes.get("audio_seconds", 0.0)
+            totals["bytes_uploaded"] += span.attributes.get("bytes_uploaded", 0)
+        for totals in by_name.values():
+            if totals["audio_seconds"]:
+                totals["real_time_factor"] = totals["wall_seconds"] / totals["audio_seconds"]
+
+        wall = time.perf_counter() - self._started
+        # Audio is counted at the ASR call that produced the transcript, not at failed attempts.
+        audio_seconds = sum(
+            span.attributes.get("audio_seconds", 0.0)
+            for span in spans
+            if span.name == "asr" and span.error is None
+        )
+        return {
+            "trace_id": self.trace_id,
+            "started_at": self.started_unix,
+            "wall_seconds": wall,
+            "cpu_seconds": time.process_time() - self._cpu_started,
+            "children_cpu_seconds": _children_cpu_seconds() - self._children_started,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "audio_seconds": audio_seconds,
+            "real_time_factor": wall / audio_seconds if audio_seconds else None,
+            "bytes_uploaded": sum(span.attributes.get("bytes_uploaded", 0) for span in spans),
+            **extra,
+            "by_name": by_name,
+            "spans": [_span_to_json(span) for span in spans],
+        }
+
+    def write_report(self, path: Path, **extra: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(self.report(**extra), ensure_ascii=False, indent=2, default=str),
+            encoding="utf-8",
+        )
+
+    def export_spans(self, path: Path, service_name: str = "teamspeak-meeting-notes") -> None:
+        # One OTLP/JSON ExportTraceServiceRequest per line, like the OpenTelemetry file exporter.
+        with self._lock:
+            spans = [_span_to_otlp(self.trace_id, span) for span in self.spans]
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                    "scopeSpans": [{"scope": {"name": "teamspeak_meeting_notes"}, "spans": spans}],
+                }
+            ]
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+
+
+_recorder: contextvars.ContextVar[RunRecorder | None] = contextvars.ContextVar(
+    "run_recorder", default=None
+)
+_parent: contextvars.ContextVar[Span | None] = contextvars.ContextVar("parent_span", default=None)
+
+
+def _span_to_json(span: Span) -> dict[str, Any]:
+    return {
+        "name": span.name,
+        "span_id": span.span_id,
+        "parent_id": span.parent_id,
+        "start": span.start_unix,
+        "wall_seconds": span.wall_seconds,
+        "cpu_seconds": span.cpu_seconds,
+        "peak_rss_bytes": span.peak_rss_bytes,
+        "real_time_factor": span.real_time_factor,
+        "error": span.error,
+        "attributes": span.attributes,
+    }
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def _span_to_otlp(trace_id: str, span: Span) -> dict[str, Any]:
+    start_ns = int(span.start_unix * 1e9)
+    attributes = {
+        **span.attributes,
+        "cpu_seconds": span.cpu_seconds,
+        "peak_rss_bytes": span.peak_rss_bytes,
+        "real_time_factor": span.real_time_factor,
+    }
+    otlp: dict[str, Any] = {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(start_ns + int(span.wall_seconds * 1e9)),
+        "attributes": _otlp_attributes(attributes),
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id is not None:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+@contextmanager
+def recording() -> Iterator[RunRecorder]:
+    recorder = RunRecorder()
+    recorder_token = _recorder.set(recorder)
+    parent_token = _parent.set(None)
+    try:
+        yield recorder
+    finally:
+        _parent.reset(parent_token)
+        _recorder.reset(recorder_token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    recorder = _recorder.get()
+    parent = _parent.get()
+    current = Span(
+        name=name,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent is not None else None,
+        start_unix=time.time(),
+        attributes=dict(attributes),
+    )
+    if recorder is None:
+        # Nothing is recording; hand out a throwaway span so callers need no branches.
+        yield current
+        return
+
+    token = _parent.set(current)
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        current.wall_seconds = time.perf_counter() - started
+        current.cpu_seconds = time.thread_time() - cpu_started
+        current.peak_rss_bytes = peak_rss_bytes()
+        _parent.reset(token)
+        recorder.add(current)
+
+
+def in_current_context[**P, R](fn: Callable[P, R]) -> Callable[P, R]:
+    # Pool threads start with an empty context; carry the caller's run and parent span over.
+    recorder = _recorder.get()
+    parent = _parent.get()
+    if recorder is None:
+        return fn
+
+    def run(*args: P.args, **kwargs: P.kwargs) -> R:
+        recorder_token = _recorder.set(recorder)
+        parent_token = _parent.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _parent.reset(parent_token)
+            _recorder.reset(recorder_token)
+
+    return run
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_root(name: str) -> Path:
+    base = os.getenv("XDG_CACHE_HOME")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "teamspeak-meeting-notes" / name
+
+
+@dataclass(slots=True)
+class JsonEntryCache:
+    # One JSON file per key under root/<key[:2]>/, evicted least recently used first once the
+    # total passes max_bytes. A hit refreshes the entry's mtime; max_age_seconds=0 never expires.
+    root: Path
+    max_bytes: int
+    max_age_seconds: float = 0.0
+    refresh: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    label: ClassVar[str] = "cache"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _expired(self, mtime: float) -> bool:
+        return self.max_age_seconds > 0 and time.time() - mtime > self.max_age_seconds
+
+    def read_entry(self, key: str) -> dict[str, Any] | None:
+        if self.refresh:
+            return None
+        entry = self._entry_path(key)
+        try:
+            if self._expired(entry.stat().st_mtime):
+                entry.unlink(missing_ok=True)
+                return None
+            data = json.loads(entry.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable %s cache entry %s: %s", self.label, entry, exc)
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return data if isinstance(data, dict) else None
+
+    def write_entry(self, key: str, payload: dict[str, Any]) -> None:
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".tmp_", dir=entry.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False)
+            os.replace(tmp_name, entry)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            total = 0
+            for entry in self.root.glob("*/*.json"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if self._expired(stat.st_mtime):
+                    entry.unlink(missing_ok=True)
+                    logger.debug("Evicted expired %s cache entry %s", self.label, entry.name)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+                total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
+                logger.debug("Evicted %s cache entry %s", self.label, entry.name)
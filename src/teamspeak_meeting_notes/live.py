@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import numpy as np
+
+from teamspeak_meeting_notes.audio_probe import WAVE_FORMAT_PCM, WavLayout, read_wav_layout
+from teamspeak_meeting_notes.checkpoint import segments_from_json, segments_to_json
+from teamspeak_meeting_notes.filename_parser import parse_track_filename
+from teamspeak_meeting_notes.models import ParsedTrack, TranscriptSegment, has_asr_placeholder
+from teamspeak_meeting_notes.pipeline import PipelineConfig, run_pipeline, seed_track_segments
+from teamspeak_meeting_notes.transcribe import (
+    build_asr_limits,
+    transcribe_audio,
+    warm_up_whisper,
+)
+from teamspeak_meeting_notes.vad import (
+    FRAME_SECONDS,
+    VadSettings,
+    frame_levels,
+    pcm_to_mono,
+    speech_frames,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class LiveSettings:
+    poll_interval: float = 2.0
+    window_seconds: float = 20.0
+    max_window_seconds: float = 60.0
+    min_silence_seconds: float = 0.8
+    idle_seconds: float = 60.0
+
+
+@dataclass(slots=True)
+class TrackTail:
+    track: ParsedTrack
+    committed_bytes: int = 0
+    segments: list[TranscriptSegment] = field(default_factory=list)
+    complete: bool = True
+    last_change: tuple[int, int] | None = None
+    unsupported: bool = False
+
+
+@dataclass(slots=True)
+class LiveWindow:
+    end_byte: int
+    has_speech: bool
+
+
+def read_pcm(path: Path, layout: WavLayout, start_byte: int, end_byte: int) -> bytes:
+    with path.open("rb") as handle:
+        handle.seek(layout.data_offset + start_byte)
+        return handle.read(end_byte - start_byte)
+
+
+def find_silence_cut(
+    speech: np.ndarray,
+    min_silence_frames: int,
+    earliest_frame: int = 0,
+) -> int | None:
+    padded = np.concatenate(([True], speech, [True]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    for start, end in reversed(list(zip(edges[::2], edges[1::2], strict=True))):
+        cut = int(start + end) // 2
+        if cut < earliest_frame:
+            return None
+        if end - start >= min_silence_frames:
+            return cut
+    return None
+
+
+def next_window(
+    raw: bytes,
+    layout: WavLayout,
+    settings: LiveSettings,
+    vad: VadSettings,
+    flush: bool,
+) -> LiveWindow | None:
+    frame_bytes = layout.block_align
+    pending_seconds = len(raw) / frame_bytes / layout.sample_rate
+    if not raw or (not flush and pending_seconds < settings.window_seconds):
+        return None
+
+    samples = pcm_to_mono(raw, layout.bits_per_sample // 8, layout.channels)
+    frame_len = max(1, int(layout.sample_rate * FRAME_SECONDS))
+    if len(samples) < frame_len:
+        return LiveWindow(end_byte=len(raw), has_speech=False) if flush else None
+    rms_db, zcr = frame_levels(samples, frame_len)
+    speech = speech_frames(rms_db, zcr, vad)
+
+    if flush:
+        cut_frame = len(speech)
+        end_byte = len(raw)
+    else:
+        min_silence_frames = math.ceil(settings.min_silence_seconds / FRAME_SECONDS)
+        # Cutting at an early pause would only leave a sliver to transcribe now.
+        earliest_frame = int(settings.window_seconds / 2 / FRAME_SECONDS)
+        cut_frame = find_silence_cut(speech, min_silence_frames, earliest_frame)
+        if cut_frame is None:
+            if pending_seconds < settings.max_window_seconds:
+                return None
+            # Nobody paused for a whole window; cut mid-speech rather than fall behind.
+            cut_frame = len(speech)
+        end_byte = cut_frame * frame_len * frame_bytes
+    return LiveWindow(end_byte=end_byte, has_speech=bool(speech[:cut_frame].any()))
+
+
+def _write_pcm_wav(raw: bytes, layout: WavLayout, output_path: Path) -> None:
+    with wave.open(str(output_path), "wb") as writer:
+        writer.setnchannels(layout.channels)
+        writer.setsampwidth(layout.bits_per_sample // 8)
+        writer.setframerate(layout.sample_rate)
+        writer.writeframes(raw)
+
+
+@dataclass(slots=True)
+class LiveJournal:
+    path: Path
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def append(self, tail: TrackTail, start_byte: int, segments: list[TranscriptSegment]) -> None:
+        row = {
+            "track": tail.track.path.name,
+            "start_byte": start_byte,
+            "end_byte": tail.committed_bytes,
+            "segments": segments_to_json(segments),
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def restore(self, tail: TrackTail) -> None:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                # A crash mid-write leaves at most one torn line at the end.
+                continue
+            if row["track"] != tail.track.path.name or row["start_byte"] != tail.committed_bytes:
+                continue
+            segments = segments_from_json(row["segments"])
+            tail.segments.extend(segments)
+            tail.complete = tail.complete and not has_asr_placeholder(segments)
+            tail.committed_bytes = row["end_byte"]
+        if tail.committed_bytes:
+            logger.info("Resumed %s from the live journal", tail.track.path.name)
+
+
+class LiveSession:
+    def __init__(self, config: PipelineConfig, settings: LiveSettings) -> None:
+        self.config = config
+        self.settings = settings
+        self.vad = VadSettings()
+        self.tails: dict[Path, TrackTail] = {}
+        self.limits = build_asr_limits(
+            local_workers=config.local_asr_workers,
+            cloud_workers=config.cloud_asr_workers,
+        )
+        self.journal: LiveJournal | None = None
+
+    def discover(self) -> None:
+        added: list[TrackTail] = []
+        for path in sorted(self.config.audio_dir.glob("*.wav")):
+            if path in self.tails:
+                continue
+            try:
+                track = parse_track_filename(path, recording_starter=self.config.recording_starter)
+            except ValueError as exc:
+                logger.debug("Skipping %s: %s", path.name, exc)
+                continue
+            self.tails[path] = TrackTail(track=track)
+            added.append(self.tails[path])
+            logger.info("Tailing %s (%s)", path.name, track.speaker_name)
+        if not added:
+            return
+        if self.journal is None:
+            started_at = min(tail.track.started_at for tail in added)
+            slug = started_at.strftime("%Y%m%d_%H%M%S")
+            self.journal = LiveJournal(self.config.output_dir / ".live" / f"live_{slug}.jsonl")
+        for tail in added:
+            self.journal.restore(tail)
+
+    def _transcribe_window(self, raw: bytes, layout: WavLayout) -> list[TranscriptSegment]:
+        with tempfile.TemporaryDirectory(prefix="ts_live_") as tmp_dir:
+            window_path = Path(tmp_dir) / "window.wav"
+            _write_pcm_wav(raw, layout, window_path)
+            return transcribe_audio(
+                window_path,
+                asr_mode=self.config.asr_mode,
+                whisper_device=self.config.whisper_device,
+                language=self.config.language,
+                limits=self.limits,
+                whisper_model=self.config.whisper_model,
+                whisper_backend=self.config.whisper_backend,
+                vad=self.vad if self.config.vad else None,
+                upload_format=self.config.upload_format,
+            )
+
+    def advance(self, tail: TrackTail, final: bool = False) -> bool:
+        if tail.unsupported:
+            return False
+        layout = read_wav_layout(tail.track.path)
+        if layout is None or layout.block_align <= 0:
+            return False
+        if layout.audio_format != WAVE_FORMAT_PCM:
+            logger.info(
+                "Live mode only tails PCM wav; %s is left for the final run", tail.track.path.name
+            )
+            tail.unsupported = True
+            return False
+
+        available = layout.data_size - layout.data_size % layout.block_align
+        max_window_bytes = (
+            int(self.settings.max_window_seconds * layout.sample_rate) * layout.block_align
+        )
+        progressed = False
+        while True:
+            end = min(available, tail.committed_bytes + max_window_bytes)
+            raw = read_pcm(tail.track.path, layout, tail.committed_bytes, end)
+            window = next_window(
+                raw, layout, self.settings, self.vad, flush=final and end == available
+            )
+            if window is None or window.end_byte <= 0:
+                return progressed
+            start_byte = tail.committed_bytes
+            offset = start_byte / layout.block_align / layout.sample_rate
+            segments: list[TranscriptSegment] = []
+            if window.has_speech:
+                segments = [
+                    TranscriptSegment(
+                        start_seconds=offset + seg.start_seconds,
+                        end_seconds=offset + seg.end_seconds,
+                        text=seg.text,
+                    )
+                    for seg in self._transcribe_window(raw[: window.end_byte], layout)
+                ]
+            tail.segments.extend(segments)
+            tail.complete = tail.complete and not has_asr_placeholder(segments)
+            tail.committed_bytes = start_byte + window.end_byte
+            if self.journal is not None:
+                self.journal.append(tail, start_byte, segments)
+            logger.info(
+                "Live %s: transcribed up to %.1fs (%d new segment(s))",
+                tail.track.path.name,
+                tail.committed_bytes / layout.block_align / layout.sample_rate,
+                len(segments),
+            )
+            progressed = True
+
+    def poll(self, final: bool = False) -> None:
+        tails = list(self.tails.values())
+        workers = max(1, min(self.config.asr_workers, len(tails)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="live-asr") as executor:
+            list(executor.map(lambda tail: self.advance(tail, final=final), tails))
+
+    def idle_for(self, now: float, changed_at: dict[Path, float]) -> float:
+        for path, tail in self.tails.items():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            marker = (stat.st_size, stat.st_mtime_ns)
+            if marker != tail.last_change:
+                tail.last_change = marker
+                changed_at[path] = now
+        if not changed_at:
+            return 0.0
+        return now - max(changed_at.values())
+
+    def hand_off(self) -> Path:
+        # Tracks that could not be tailed cleanly are left for the pipeline to transcribe whole;
+        # the seeded checkpoints are per track, so the pipeline must not switch to a mixdown.
+        config = replace(
+            self.config,
+            resume=True,
+            track_paths=sorted(self.tails),
+            asr_strategy="per-track",
+        )
+        seed_track_segments(
+            config,
+            [
+                (path, tail.segments)
+                for path, tail in self.tails.items()
+                if tail.complete and not tail.unsupported
+            ],
+        )
+        return run_pipeline(config)
+
+
+def run_live(
+    config: PipelineConfig,
+    settings: LiveSettings,
+    stop: threading.Event | None = None,
+) -> Path:
+    stop = stop or threading.Event()
+    session = LiveSession(config, settings)
+    if config.asr_mode in ("local", "hybrid"):
+        warm_up_whisper(
+            config.whisper_device,
+            whisper_model=config.whisper_model,
+            whisper_backend=config.whisper_backend,
+        )
+    logger.info(
+        "Live mode on %s; meeting ends after %.0fs idle", config.audio_dir, settings.idle_seconds
+    )
+
+    changed_at: dict[Path, float] = {}
+    while not stop.is_set():
+        session.discover()
+        session.poll()
+        if (
+            session.tails
+            and session.idle_for(time.monotonic(), changed_at) >= settings.idle_seconds
+        ):
+            break
+        stop.wait(settings.poll_interval)
+
+    session.discover()
+    if not session.tails:
+        raise FileNotFoundError(f"No TeamSpeak wav files found in {config.audio_dir}")
+    logger.info(
+        "Meeting ended; transcribing the remaining audio of %d track(s)", len(session.tails)
+    )
+    session.poll(final=True)
+    return session.hand_off()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import subprocess
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from teamspeak_meeting_notes.instrument import span
+from teamspeak_meeting_notes.models import ParsedTrack, TranscriptSegment
+from teamspeak_meeting_notes.vad import FRAME_SECONDS, frame_features
+
+MIX_SAMPLE_RATE = 16000
+SILENT_DB = -120.0
+
+
+@dataclass(slots=True)
+class TrackLevels:
+    # Per-track RMS in dB on a shared FRAME_SECONDS grid starting at the meeting start.
+    meeting_start: datetime
+    frame_seconds: float
+    levels_db: np.ndarray
+    track_seconds: float
+
+
+def _offset_seconds(track: ParsedTrack, meeting_start: datetime) -> float:
+    return (track.started_at - meeting_start).total_seconds()
+
+
+def build_mix_command(
+    tracks: list[ParsedTrack],
+    output_path: Path,
+    meeting_start: datetime | None = None,
+) -> list[str]:
+    if not tracks:
+        raise ValueError("Cannot mix empty track list")
+    meeting_start = meeting_start or min(track.started_at for track in tracks)
+
+    cmd: list[str] = ["ffmpeg", "-y", "-v", "error"]
+    for track in tracks:
+        cmd.extend(["-i", str(track.path)])
+
+    filters: list[str] = []
+    for index, track in enumerate(tracks):
+        delay_ms = round(_offset_seconds(track, meeting_start) * 1000)
+        filters.append(
+            f"[{index}:a]aformat=channel_layouts=mono,aresample={MIX_SAMPLE_RATE},"
+            f"adelay={delay_ms}:all=1[a{index}]"
+        )
+    inputs = "".join(f"[a{index}]" for index in range(len(tracks)))
+    # normalize=0 sums the tracks; each speaker keeps their own level in the mix.
+    filters.append(f"{inputs}amix=inputs={len(tracks)}:duration=longest:normalize=0[mix]")
+
+    cmd.extend(["-filter_complex", ";".join(filters), "-map", "[mix]"])
+    cmd.extend(["-ac", "1", "-ar", str(MIX_SAMPLE_RATE), "-c:a", "pcm_s16le", str(output_path)])
+    return cmd
+
+
+def track_levels(tracks: list[ParsedTrack]) -> TrackLevels:
+    meeting_start = min(track.started_at for track in tracks)
+    per_track: list[tuple[float, np.ndarray, float]] = []
+    track_seconds = 0.0
+    end = 0.0
+    for track in tracks:
+        rms_db, _, frame_seconds, duration = frame_features(track.path)
+        offset = _offset_seconds(track, meeting_start)
+        per_track.append((offset, rms_db, frame_seconds))
+        track_seconds += duration
+        end = max(end, offset + duration)
+
+    frames = int(np.ceil(end / FRAME_SECONDS))
+    centers = (np.arange(frames) + 0.5) * FRAME_SECONDS
+    levels = np.full((len(tracks), frames), SILENT_DB, dtype=np.float32)
+    for row, (offset, rms_db, frame_seconds) in enumerate(per_track):
+        # Tracks at other sample rates have slightly different frame lengths; resample by index.
+        index = np.floor((centers - offset) / frame_seconds).astype(np.int64)
+        valid = (index >= 0) & (index < len(rms_db))
+        levels[row, valid] = rms_db[index[valid]]
+    return TrackLevels(
+        meeting_start=meeting_start,
+        frame_seconds=FRAME_SECONDS,
+        levels_db=levels,
+        track_seconds=track_seconds,
+    )
+
+
+def attribute_segments(
+    segments: list[TranscriptSegment],
+    tracks: list[ParsedTrack],
+    levels: TrackLevels,
+) -> list[tuple[ParsedTrack, list[TranscriptSegment]]]:
+    power = np.power(10.0, levels.levels_db / 10.0)
+    frames = power.shape[1]
+    by_track: list[list[TranscriptSegment]] = [[] for _ in tracks]
+    for segment in segments:
+        first = min(frames - 1, max(0, int(segment.start_seconds / levels.frame_seconds)))
+        last = min(frames, max(first + 1, int(np.ceil(segment.end_seconds / levels.frame_seconds))))
+        # The loudest track over the segment is taken to be the speaker.
+        speaker = int(np.argmax(power[:, first:last].mean(axis=1)))
+        offset = _offset_seconds(tracks[speaker], levels.meeting_start)
+        by_track[speaker].append(
+            TranscriptSegment(
+                start_seconds=max(0.0, segment.start_seconds - offset),
+                end_seconds=max(0.0, segment.end_seconds - offset),
+                text=segment.text,
+            )
+        )
+    return list(zip(tracks, by_track, strict=True))
+
+
+@contextmanager
+def mixed_audio(tracks: list[ParsedTrack]) -> Iterator[Path]:
+    with tempfile.TemporaryDirectory(prefix="ts_mix_") as tmp_dir:
+        output_path = Path(tmp_dir) / "mixdown.wav"
+        cmd = build_mix_command(tracks, output_path)
+        with span("mixdown.render", tracks=len(tracks)):
+            proc = subprocess.run(cmd, check=False, capture_output=True, text=True)
+        if proc.returncode != 0 or not output_path.exists():
+            stderr = proc.stderr.strip()
+            tail = stderr[-1200:] if stderr else "<no stderr>"
+            raise RuntimeError(f"Failed to render mixdown: {tail}")
+        yield output_path
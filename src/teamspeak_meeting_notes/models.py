@@ -31,6 +31,14 @@ class TranscriptSegment:
     text: str
 
 
+# Stands in for the text of audio that could not be transcribed; such results are never cached.
+ASR_PLACEHOLDER_PREFIX = "[ASR unavailable for "
+
+
+def has_asr_placeholder(segments: list[TranscriptSegment]) -> bool:
+    return any(segment.text.startswith(ASR_PLACEHOLDER_PREFIX) for segment in segments)
+
+
 @dataclass(slots=True)
 class TimelineUtterance:
     speaker_name: str
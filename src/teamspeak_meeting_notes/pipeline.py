@@ -1,17 +1,85 @@
 from __future__ import annotations
 
+import json
 import logging
-from dataclasses import dataclass
+import os
+import sys
+import time
+import wave
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Literal
 
+from teamspeak_meeting_notes.audio_encode import UploadFormat
 from teamspeak_meeting_notes.audio_probe import ensure_ffmpeg_tools, probe_audio
 from teamspeak_meeting_notes.bundler import bundle_tracks
-from teamspeak_meeting_notes.filename_parser import parse_tracks
-from teamspeak_meeting_notes.models import ParsedTrack, TimelineUtterance, TranscriptSegment
-from teamspeak_meeting_notes.summarize import summarize_heuristic, summarize_with_openai
+from teamspeak_meeting_notes.checkpoint import (
+    CheckpointStore,
+    file_fingerprint,
+    fingerprint,
+    infos_from_json,
+    infos_to_json,
+    open_checkpoints,
+    segments_from_json,
+    segments_to_json,
+    tracks_from_json,
+    tracks_to_json,
+)
+from teamspeak_meeting_notes.chunking import ChunkSettings, chunk_variant
+from teamspeak_meeting_notes.clients import (
+    DEFAULT_LLM_MAX_CONCURRENCY,
+    LLM_ENDPOINT,
+    configure_limiter,
+)
+from teamspeak_meeting_notes.filename_parser import parse_track_files, parse_tracks
+from teamspeak_meeting_notes.instrument import RunRecorder, in_current_context, recording, span
+from teamspeak_meeting_notes.mixdown import attribute_segments, mixed_audio, track_levels
+from teamspeak_meeting_notes.models import (
+    AudioInfo,
+    ParsedTrack,
+    TimelineUtterance,
+    TranscriptSegment,
+    has_asr_placeholder,
+)
+from teamspeak_meeting_notes.stages import Stage, StageReport, run_stages
+from teamspeak_meeting_notes.summarize import (
+    DEFAULT_SUMMARY_CONCURRENCY,
+    DEFAULT_WINDOW_TOKENS,
+    OLLAMA_BASE_URL,
+    OLLAMA_MODEL,
+    load_heuristic_keywords,
+    summarize_heuristic,
+    summarize_hierarchical,
+)
+from teamspeak_meeting_notes.summary_cache import (
+    DEFAULT_SUMMARY_CACHE_MAX_AGE_DAYS,
+    DEFAULT_SUMMARY_CACHE_MAX_BYTES,
+    SummaryCache,
+    default_summary_cache_dir,
+)
 from teamspeak_meeting_notes.timeline import merge_timeline
-from teamspeak_meeting_notes.transcribe import AsrMode, WhisperDevice, transcribe_audio
+from teamspeak_meeting_notes.transcribe import (
+    DEFAULT_WHISPER_MODEL,
+    AsrLimits,
+    AsrMode,
+    WhisperBackend,
+    WhisperDevice,
+    build_asr_limits,
+    transcribe_audio,
+    warm_up_whisper,
+)
+from teamspeak_meeting_notes.transcript_cache import (
+    DEFAULT_CACHE_MAX_BYTES,
+    TranscriptCache,
+    default_cache_dir,
+)
+from teamspeak_meeting_notes.vad import VadSettings
+
+StageRunner = Callable[[dict[str, Any]], Any]
+AsrStrategy = Literal["per-track", "mixdown"]
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +96,37 @@ class PipelineConfig:
     whisper_device: WhisperDevice
     language: str | None
     meeting_title: str | None
+    asr_workers: int = 4
+    local_asr_workers: int = 2
+    cloud_asr_workers: int = 4
+    whisper_model: str = DEFAULT_WHISPER_MODEL
+    whisper_backend: WhisperBackend = "auto"
+    use_cache: bool = True
+    refresh_cache: bool = False
+    cache_dir: Path | None = None
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    summary_cache_dir: Path | None = None
+    summary_cache_max_bytes: int = DEFAULT_SUMMARY_CACHE_MAX_BYTES
+    summary_cache_max_age_days: float = DEFAULT_SUMMARY_CACHE_MAX_AGE_DAYS
+    vad: bool = True
+    chunk_seconds: float = 600.0
+    chunk_overlap_seconds: float = 5.0
+    chunk_workers: int = 2
+    upload_format: UploadFormat = "flac"
+    summary_window_tokens: int = DEFAULT_WINDOW_TOKENS
+    summary_concurrency: int = DEFAULT_SUMMARY_CONCURRENCY
+    stream_summary: bool = False
+    heuristic_summary: bool = False
+    heuristic_keywords: Path | None = None
+    summary_stats: bool = False
+    compact_prompt: bool = True
+    asr_strategy: AsrStrategy = "per-track"
+    llm_max_concurrency: int = DEFAULT_LLM_MAX_CONCURRENCY
+    llm_tokens_per_minute: int = 0
+    resume: bool = False
+    track_paths: list[Path] | None = None
+    run_report: bool = True
+    trace_file: Path | None = None
 
 
 def _build_track_segments(
@@ -35,28 +134,165 @@ def _build_track_segments(
     asr_mode: AsrMode,
     whisper_device: WhisperDevice,
     language: str | None,
+    asr_workers: int = 1,
+    limits: AsrLimits | None = None,
+    whisper_model: str = DEFAULT_WHISPER_MODEL,
+    whisper_backend: WhisperBackend = "auto",
+    cache: TranscriptCache | None = None,
+    vad: VadSettings | None = None,
+    chunking: ChunkSettings | None = None,
+    upload_format: UploadFormat = "flac",
+    infos: dict[Path, AudioInfo] | None = None,
+    checkpoints: CheckpointStore | None = None,
+    asr_fingerprint: str = "",
 ) -> list[tuple[ParsedTrack, list[TranscriptSegment]]]:
-    result: list[tuple[ParsedTrack, list[TranscriptSegment]]] = []
-    for track in tracks:
+    def transcribe_track(track: ParsedTrack) -> tuple[ParsedTrack, list[TranscriptSegment]]:
+        stage = f"segments:{track.path.name}"
+        stage_fingerprint = ""
+        if checkpoints is not None:
+            stage_fingerprint = fingerprint(file_fingerprint(track.path), asr_fingerprint)
+            saved = checkpoints.load(stage, stage_fingerprint)
+            if saved is not None:
+                return track, segments_from_json(saved)
+
         logger.info("Transcribing %s (%s)", track.path.name, track.speaker_name)
         segments = transcribe_audio(
             track.path,
             asr_mode=asr_mode,
             whisper_device=whisper_device,
             language=language,
+            limits=limits,
+            whisper_model=whisper_model,
+            whisper_backend=whisper_backend,
+            cache=cache,
+            vad=vad,
+            chunking=chunking,
+            upload_format=upload_format,
+            info=(infos or {}).get(track.path),
         )
         logger.info("Got %d segment(s) from %s", len(segments), track.path.name)
-        result.append((track, segments))
-    return result
+        if checkpoints is not None and not has_asr_placeholder(segments):
+            checkpoints.save_external(stage, stage_fingerprint, segments_to_json(segments))
+        return track, segments
+
+    workers = max(1, min(asr_workers, len(tracks)))
+    if workers == 1:
+        return [transcribe_track(track) for track in tracks]
 
+    logger.info("Transcribing %d track(s) with %d worker(s)", len(tracks), workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asr") as executor:
+        # executor.map yields in submission order, keeping merge_timeline deterministic.
+        return list(executor.map(in_current_context(transcribe_track), tracks))
+
+
+def _build_transcript_cache(config: PipelineConfig) -> TranscriptCache | None:
+    if not config.use_cache:
+        return None
+    return TranscriptCache(
+        root=config.cache_dir or default_cache_dir(),
+        max_bytes=config.cache_max_bytes,
+        refresh=config.refresh_cache,
+    )
 
-def _render_note(config: PipelineConfig, utterances: list[TimelineUtterance]) -> str:
+
+def _build_summary_cache(config: PipelineConfig) -> SummaryCache | None:
+    if not config.use_cache:
+        return None
+    return SummaryCache(
+        root=config.summary_cache_dir or default_summary_cache_dir(),
+        max_bytes=config.summary_cache_max_bytes,
+        max_age_seconds=config.summary_cache_max_age_days * 24 * 3600,
+        refresh=config.refresh_cache,
+    )
+
+
+def _build_chunk_settings(config: PipelineConfig) -> ChunkSettings | None:
+    if config.chunk_seconds <= 0:
+        return None
+    # Watch, batch and library callers skip the CLI's check; fail before any stage runs.
+    if not 0 <= config.chunk_overlap_seconds < config.chunk_seconds:
+        raise ValueError(
+            f"Chunk overlap ({config.chunk_overlap_seconds}s) must be non-negative and shorter "
+            f"than the chunk length ({config.chunk_seconds}s)"
+        )
+    return ChunkSettings(
+        chunk_seconds=config.chunk_seconds,
+        overlap_seconds=config.chunk_overlap_seconds,
+        workers=config.chunk_workers,
+    )
+
+
+def _heuristic_note(config: PipelineConfig, utterances: list[TimelineUtterance]) -> str:
+    keywords = (
+        load_heuristic_keywords(config.heuristic_keywords) if config.heuristic_keywords else None
+    )
+    return summarize_heuristic(
+        utterances=utterances, meeting_title=config.meeting_title, keywords=keywords
+    )
+
+
+def _render_note(config: PipelineConfig, utterances: list[TimelineUtterance]) -> tuple[str, bool]:
     try:
         logger.info("Generating summary with OpenAI")
-        return summarize_with_openai(utterances=utterances, meeting_title=config.meeting_title)
+        note = summarize_hierarchical(
+            utterances=utterances,
+            meeting_title=config.meeting_title,
+            window_tokens=config.summary_window_tokens,
+            concurrency=config.summary_concurrency,
+            with_stats=config.summary_stats,
+            compact=config.compact_prompt,
+            cache=_build_summary_cache(config),
+        )
+        return note, True
     except Exception as exc:
         logger.warning("OpenAI summary failed, fallback to heuristic summary: %s", exc)
-        return summarize_heuristic(utterances=utterances, meeting_title=config.meeting_title)
+        return _heuristic_note(config, utterances), False
+
+
+def _stream_note(
+    config: PipelineConfig,
+    utterances: list[TimelineUtterance],
+    output_path: Path,
+) -> tuple[str, bool]:
+    streamed: list[str] = []
+    with output_path.open("w", encoding="utf-8") as handle:
+
+        def emit(text: str) -> None:
+            handle.write(text)
+            handle.flush()
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        def on_delta(text: str) -> None:
+            streamed.append(text)
+            emit(text)
+
+        try:
+            logger.info("Streaming summary with OpenAI to %s", output_path)
+            note = summarize_hierarchical(
+                utterances=utterances,
+                meeting_title=config.meeting_title,
+                window_tokens=config.summary_window_tokens,
+                concurrency=config.summary_concurrency,
+                with_stats=config.summary_stats,
+                compact=config.compact_prompt,
+                cache=_build_summary_cache(config),
+                on_delta=on_delta,
+            )
+        except Exception as exc:
+            logger.warning(
+                "OpenAI summary stream failed after %d chunk(s), fallback to heuristic summary: %s",
+                len(streamed),
+                exc,
+            )
+            if streamed:
+                # Keep what the model already produced and close it off before the fallback.
+                emit("\n\n（模型输出中断，以下为启发式摘要）\n")
+            emit(_heuristic_note(config, utterances))
+            emit("\n")
+            return "", False
+        emit("\n")
+    return note, True
 
 
 def _meeting_slug(tracks: list[ParsedTrack]) -> str:
@@ -64,46 +300,522 @@ def _meeting_slug(tracks: list[ParsedTrack]) -> str:
     return meeting_start.strftime("%Y%m%d_%H%M%S")
 
 
+def _asr_fingerprint(config: PipelineConfig) -> str:
+    chunking = _build_chunk_settings(config)
+    return fingerprint(
+        config.asr_mode,
+        config.whisper_model,
+        config.language,
+        config.vad,
+        chunk_variant(chunking) if chunking is not None else None,
+    )
+
+
+def _summary_fingerprint(config: PipelineConfig, timeline_fingerprint: str) -> str:
+    return fingerprint(
+        timeline_fingerprint,
+        config.meeting_title,
+        os.getenv("OLLAMA_BASE_URL", OLLAMA_BASE_URL),
+        os.getenv("OLLAMA_MODEL", OLLAMA_MODEL),
+        config.summary_window_tokens,
+        config.summary_stats,
+        config.compact_prompt,
+    )
+
+
+def seed_track_segments(
+    config: PipelineConfig,
+    track_segments: list[tuple[Path, list[TranscriptSegment]]],
+) -> None:
+    checkpoints = open_checkpoints(
+        config.output_dir,
+        config.audio_dir,
+        resume=True,
+        track_paths=config.track_paths,
+    )
+    asr_fingerprint = _asr_fingerprint(config)
+    for path, segments in track_segments:
+        checkpoints.save_external(
+            f"segments:{path.name}",
+            fingerprint(file_fingerprint(path), asr_fingerprint),
+            segments_to_json(segments),
+        )
+
+
+def _load_tracks(config: PipelineConfig, checkpoints: CheckpointStore) -> list[ParsedTrack]:
+    paths = (
+        sorted(config.track_paths)
+        if config.track_paths is not None
+        else sorted(config.audio_dir.glob("*.wav"))
+    )
+    stage_fingerprint = fingerprint(
+        [file_fingerprint(path) for path in paths], config.recording_starter
+    )
+    saved = checkpoints.load("tracks", stage_fingerprint)
+    if saved is not None:
+        return tracks_from_json(saved)
+    if config.track_paths is not None:
+        tracks = parse_track_files(paths, recording_starter=config.recording_starter)
+        if not tracks:
+            raise FileNotFoundError(f"No wav files given for {config.audio_dir}")
+    else:
+        tracks = parse_tracks(
+            audio_dir=config.audio_dir, recording_starter=config.recording_starter
+        )
+    checkpoints.save("tracks", stage_fingerprint, tracks_to_json(tracks))
+    return tracks
+
+
+def _probe_track(track: ParsedTrack, checkpoints: CheckpointStore) -> AudioInfo:
+    stage = f"probe:{track.path.name}"
+    stage_fingerprint = fingerprint(file_fingerprint(track.path))
+    saved = checkpoints.load(stage, stage_fingerprint)
+    if saved is not None:
+        info = infos_from_json(saved)[0]
+    else:
+        with span("probe", file=track.path.name) as probe:
+            info = probe_audio(track.path)
+            probe.set(duration_seconds=info.duration_seconds)
+        checkpoints.save(stage, stage_fingerprint, infos_to_json([info]))
+    logger.info(
+        "Track %s: duration=%.2fs sample_rate=%s channels=%s speaker=%s",
+        track.path.name,
+        info.duration_seconds,
+        info.sample_rate,
+        info.channels,
+        track.speaker_name,
+    )
+    return info
+
+
+def _bundle(tracks: list[ParsedTrack], bundle_path: Path) -> Path:
+    logger.info("Bundling multitrack container to %s", bundle_path)
+    bundle_tracks(tracks=tracks, output_path=bundle_path)
+    logger.info("Multitrack bundle ready: %s", bundle_path)
+    return bundle_path
+
+
+def _log_stage_report(report: StageReport) -> None:
+    logger.info(
+        "Pipeline stages finished in %.2fs wall time (%.2fs if run sequentially, %.2fs saved)",
+        report.wall_seconds,
+        report.sequential_seconds,
+        report.saved_seconds,
+    )
+    logger.info(
+        "Critical path: %s",
+        " -> ".join(
+            f"{name} ({report.timings[name].seconds:.2f}s)" for name in report.critical_path
+        ),
+    )
+
+
+def _open_meeting(config: PipelineConfig) -> tuple[CheckpointStore, list[ParsedTrack]]:
+    checkpoints = open_checkpoints(
+        config.output_dir,
+        config.audio_dir,
+        resume=config.resume,
+        track_paths=config.track_paths,
+    )
+    tracks = _load_tracks(config, checkpoints)
+    logger.info("Parsed %d track(s)", len(tracks))
+    return checkpoints, tracks
+
+
+def _bundle_path(config: PipelineConfig, tracks: list[ParsedTrack]) -> Path:
+    if config.bundle_path is not None:
+        return config.bundle_path
+    return config.output_dir / f"multitrack_{_meeting_slug(tracks)}.mka"
+
+
+def _meeting_stages(
+    config: PipelineConfig,
+    tracks: list[ParsedTrack],
+    checkpoints: CheckpointStore,
+    limits: AsrLimits,
+    cache: TranscriptCache | None,
+    prefix: str = "",
+) -> list[Stage]:
+    vad = VadSettings() if config.vad else None
+    chunking = _build_chunk_settings(config)
+    asr_fingerprint = _asr_fingerprint(config)
+
+    def transcribe_tracks(
+        selected: list[ParsedTrack],
+        infos: dict[Path, AudioInfo],
+        asr_workers: int = 1,
+    ) -> list[tuple[ParsedTrack, list[TranscriptSegment]]]:
+        return _build_track_segments(
+            selected,
+            asr_mode=config.asr_mode,
+            whisper_device=config.whisper_device,
+            language=config.language,
+            asr_workers=asr_workers,
+            limits=limits,
+            whisper_model=config.whisper_model,
+            whisper_backend=config.whisper_backend,
+            cache=cache,
+            vad=vad,
+            chunking=chunking,
+            upload_format=config.upload_format,
+            infos=infos,
+            checkpoints=checkpoints,
+            asr_fingerprint=asr_fingerprint,
+        )
+
+    def transcribe_stage(track: ParsedTrack, probe_stage: str) -> StageRunner:
+        def run(inputs: dict[str, Any]) -> tuple[ParsedTrack, list[TranscriptSegment]]:
+            return transcribe_tracks([track], {track.path: inputs[probe_stage]})[0]
+
+        return run
+
+    def mixdown_stage(inputs: dict[str, Any]) -> list[tuple[ParsedTrack, list[TranscriptSegment]]]:
+        infos = {track.path: inputs[f"{prefix}probe:{track.path.name}"] for track in tracks}
+        stage_fingerprint = fingerprint(
+            [(track.path.name, file_fingerprint(track.path), track.started_at) for track in tracks],
+            asr_fingerprint,
+        )
+        saved = checkpoints.load("segments:mixdown", stage_fingerprint)
+        if saved is not None:
+            return [(track, segments_from_json(saved[track.path.name])) for track in tracks]
+        try:
+            levels = track_levels(tracks)
+        except (wave.Error, EOFError, ValueError) as exc:
+            logger.warning("Mixdown needs PCM wav tracks (%s); transcribing per track", exc)
+            return transcribe_tracks(tracks, infos, asr_workers=config.asr_workers)
+
+        mix_seconds = levels.levels_db.shape[1] * levels.frame_seconds
+        with (
+            span("mixdown", tracks=len(tracks), track_audio_seconds=levels.track_seconds) as mix,
+            mixed_audio(tracks) as mix_path,
+        ):
+            logger.info("Transcribing %d track(s) as one %.0fs mixdown", len(tracks), mix_seconds)
+            started = time.perf_counter()
+            segments = transcribe_audio(
+                mix_path,
+                asr_mode=config.asr_mode,
+                whisper_device=config.whisper_device,
+                language=config.language,
+                limits=limits,
+                whisper_model=config.whisper_model,
+                whisper_backend=config.whisper_backend,
+                cache=cache,
+                vad=vad,
+                chunking=chunking,
+                upload_format=config.upload_format,
+            )
+            asr_seconds = time.perf_counter() - started
+            # Per-track ASR would have run over every track's full length at this throughput.
+            saved_seconds = (
+                asr_seconds * levels.track_seconds / max(mix_seconds, 1e-6) - asr_seconds
+            )
+            mix.set(
+                mix_audio_seconds=mix_seconds,
+                asr_seconds=asr_seconds,
+                estimated_saved_seconds=saved_seconds,
+            )
+        logger.info(
+            "Mixdown ASR took %.1fs for %.0fs of mixed audio instead of %d passes over %.0fs; "
+            "~%.1fs of ASR time saved",
+            asr_seconds,
+            mix_seconds,
+            len(tracks),
+            levels.track_seconds,
+            saved_seconds,
+        )
+        track_segments = attribute_segments(segments, tracks, levels)
+        if not has_asr_placeholder(segments):
+            checkpoints.save_external(
+                "segments:mixdown",
+                stage_fingerprint,
+                {track.path.name: segments_to_json(found) for track, found in track_segments},
+            )
+        return track_segments
+
+    def merge_stage(inputs: dict[str, Any]) -> tuple[str, list[TimelineUtterance]]:
+        if config.asr_strategy == "mixdown":
+            track_segments = inputs[f"{prefix}asr:mixdown"]
+        else:
+            track_segments = [inputs[f"{prefix}asr:{track.path.name}"] for track in tracks]
+        timeline_fingerprint = fingerprint(
+            [(track.path.name, segments_to_json(segments)) for track, segments in track_segments]
+        )
+        utterances = checkpoints.load_timeline("timeline", timeline_fingerprint)
+        if utterances is None:
+            utterances = merge_timeline(track_segments)
+            checkpoints.save_timeline("timeline", timeline_fingerprint, utterances)
+        logger.info("Merged %d utterance(s) into timeline", len(utterances))
+        return timeline_fingerprint, utterances
+
+    def summary_stage(inputs: dict[str, Any]) -> Path:
+        timeline_fingerprint, utterances = inputs[f"{prefix}merge"]
+        config.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = config.output_dir / f"meeting_notes_{_meeting_slug(tracks)}_{stamp}.md"
+        summary_fingerprint = _summary_fingerprint(config, timeline_fingerprint)
+        saved_note = checkpoints.load("summary", summary_fingerprint)
+        if saved_note is not None:
+            output_path.write_text(saved_note, encoding="utf-8")
+        elif config.heuristic_summary:
+            note = _heuristic_note(config, utterances)
+            output_path.write_text(note, encoding="utf-8")
+        elif config.stream_summary:
+            note, complete = _stream_note(config, utterances, output_path)
+            if complete:
+                checkpoints.save("summary", summary_fingerprint, note)
+        else:
+            note, complete = _render_note(config, utterances)
+            output_path.write_text(note, encoding="utf-8")
+            if complete:
+                checkpoints.save("summary", summary_fingerprint, note)
+        logger.info("Wrote meeting note to %s", output_path)
+        return output_path
+
+    stages: list[Stage] = []
+    if config.bundle_multitrack:
+        bundle_path = _bundle_path(config, tracks)
+        stages.append(Stage(name=f"{prefix}bundle", run=lambda _: _bundle(tracks, bundle_path)))
+    probe_stages: list[str] = []
+    asr_stages: list[str] = []
+    for track in tracks:
+        probe_stage = f"{prefix}probe:{track.path.name}"
+        stages.append(
+            Stage(name=probe_stage, run=lambda _, track=track: _probe_track(track, checkpoints))
+        )
+        probe_stages.append(probe_stage)
+        if config.asr_strategy == "per-track":
+            asr_stage = f"{prefix}asr:{track.path.name}"
+            stages.append(
+                Stage(
+                    name=asr_stage,
+                    run=transcribe_stage(track, probe_stage),
+                    depends_on=(probe_stage,),
+                    group="asr",
+                )
+            )
+            asr_stages.append(asr_stage)
+    if config.asr_strategy == "mixdown":
+        asr_stages.append(f"{prefix}asr:mixdown")
+        stages.append(
+            Stage(
+                name=asr_stages[0],
+                run=mixdown_stage,
+                depends_on=tuple(probe_stages),
+                group="asr",
+            )
+        )
+    stages.append(Stage(name=f"{prefix}merge", run=merge_stage, depends_on=tuple(asr_stages)))
+    stages.append(Stage(name=f"{prefix}summary", run=summary_stage, depends_on=(f"{prefix}merge",)))
+    return stages
+
+
+def _write_run_report(
+    config: PipelineConfig,
+    recorder: RunRecorder,
+    report: StageReport | None,
+    output_path: Path,
+    error: BaseException | None = None,
+    **extra: Any,
+) -> None:
+    # Also runs when a stage raised, which is the run that most needs the report and trace;
+    # a failure to write them must not hide that error.
+    if error is not None:
+        status = "failed"
+    elif report is not None and report.errors:
+        status = "partial"
+    else:
+        status = "ok"
+    try:
+        if config.run_report:
+            report_path = output_path.with_suffix(".run.json")
+            recorder.write_report(
+                report_path,
+                **extra,
+                status=status,
+                error=f"{type(error).__name__}: {error}" if error is not None else None,
+                stages=(
+                    {name: timing.seconds for name, timing in report.timings.items()}
+                    if report is not None
+                    else {}
+                ),
+                critical_path=report.critical_path if report is not None else [],
+                parallel_saved_seconds=report.saved_seconds if report is not None else 0.0,
+            )
+            logger.info("Wrote run report to %s", report_path)
+        if config.trace_file is not None:
+            recorder.export_spans(config.trace_file)
+            logger.info("Appended %d span(s) to %s", len(recorder.spans), config.trace_file)
+    except OSError as exc:
+        logger.warning("Failed to write run report or trace: %s", exc)
+
+
 def run_pipeline(config: PipelineConfig) -> Path:
     logger.info("Starting pipeline, audio_dir=%s", config.audio_dir)
     ensure_ffmpeg_tools()
-    tracks = parse_tracks(audio_dir=config.audio_dir, recording_starter=config.recording_starter)
-    logger.info("Parsed %d track(s)", len(tracks))
+    checkpoints, tracks = _open_meeting(config)
+    if config.bundle_only:
+        return _bundle(tracks, _bundle_path(config, tracks))
+    configure_limiter(LLM_ENDPOINT, config.llm_max_concurrency, config.llm_tokens_per_minute)
 
-    if config.bundle_multitrack or config.bundle_only:
-        bundle_path = config.bundle_path
-        if bundle_path is None:
-            bundle_path = config.output_dir / f"multitrack_{_meeting_slug(tracks)}.mka"
-        logger.info("Bundling multitrack container to %s", bundle_path)
-        bundle_tracks(tracks=tracks, output_path=bundle_path)
-        logger.info("Multitrack bundle ready: %s", bundle_path)
-        if config.bundle_only:
-            return bundle_path
+    limits = build_asr_limits(
+        local_workers=config.local_asr_workers,
+        cloud_workers=config.cloud_asr_workers,
+    )
+    stages = _meeting_stages(
+        config, tracks, checkpoints, limits, cache=_build_transcript_cache(config)
+    )
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Where the report goes when no note was written.
+    fallback_path = config.output_dir / f"meeting_notes_{_meeting_slug(tracks)}_{stamp}.md"
+    report: StageReport | None = None
+    error: BaseException | None = None
+    with recording() as recorder:
+        try:
+            report = run_stages(
+                stages,
+                max_workers=config.asr_workers + 2,
+                group_limits={"asr": config.asr_workers},
+            )
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            _write_run_report(
+                config,
+                recorder,
+                report,
+                report.results["summary"] if report is not None else fallback_path,
+                error=error,
+                audio_dir=str(config.audio_dir),
+            )
+    _log_stage_report(report)
+    return report.results["summary"]
 
-    for track in tracks:
-        info = probe_audio(track.path)
-        logger.info(
-            "Track %s: duration=%.2fs sample_rate=%s channels=%s speaker=%s",
-            track.path.name,
-            info.duration_seconds,
-            info.sample_rate,
-            info.channels,
-            track.speaker_name,
+
+@dataclass(slots=True)
+class MeetingResult:
+    audio_dir: Path
+    output_path: Path | None = None
+    error: str | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def write_batch_report(results: list[MeetingResult], report_path: Path) -> None:
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [
+        {
+            "audio_dir": str(result.audio_dir),
+            "status": "ok" if result.ok else "failed",
+            "output": str(result.output_path) if result.output_path else None,
+            "error": result.error,
+            "seconds": round(result.seconds, 3),
+        }
+        for result in results
+    ]
+    payload = {
+        "meetings": rows,
+        "succeeded": sum(result.ok for result in results),
+        "failed": sum(not result.ok for result in results),
+    }
+    report_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def run_batch(
+    config: PipelineConfig,
+    audio_dirs: list[Path],
+    report_path: Path | None = None,
+) -> list[MeetingResult]:
+    if config.bundle_path is not None:
+        # Every meeting would write (and race on) the same file.
+        raise ValueError("bundle_path is per meeting and cannot be set for a batch")
+    logger.info("Starting batch of %d meeting directories", len(audio_dirs))
+    started = time.perf_counter()
+    ensure_ffmpeg_tools()
+    if config.asr_mode in ("local", "hybrid") and not config.bundle_only:
+        warm_up_whisper(
+            config.whisper_device,
+            whisper_model=config.whisper_model,
+            whisper_backend=config.whisper_backend,
         )
+    # Shared across meetings: ASR slots, the transcript cache and (via clients) HTTP pools
+    # and the LLM request limiter.
+    configure_limiter(LLM_ENDPOINT, config.llm_max_concurrency, config.llm_tokens_per_minute)
+    limits = build_asr_limits(
+        local_workers=config.local_asr_workers,
+        cloud_workers=config.cloud_asr_workers,
+    )
+    cache = _build_transcript_cache(config)
 
-    track_segments = _build_track_segments(
-        tracks,
-        asr_mode=config.asr_mode,
-        whisper_device=config.whisper_device,
-        language=config.language,
+    results = [MeetingResult(audio_dir=audio_dir) for audio_dir in audio_dirs]
+    final_stages: dict[str, MeetingResult] = {}
+    meeting_stages: dict[str, list[str]] = {}
+    stages: list[Stage] = []
+    for index, result in enumerate(results):
+        meeting_config = replace(config, audio_dir=result.audio_dir, track_paths=None)
+        prefix = f"{index}:{result.audio_dir.name}/"
+        try:
+            checkpoints, tracks = _open_meeting(meeting_config)
+        except Exception as exc:
+            logger.error("Skipping %s: %s", result.audio_dir, exc)
+            result.error = str(exc)
+            continue
+        if config.bundle_only:
+            bundle_path = _bundle_path(meeting_config, tracks)
+            own = [
+                Stage(
+                    name=f"{prefix}bundle",
+                    run=lambda _, tracks=tracks, bundle_path=bundle_path: _bundle(
+                        tracks, bundle_path
+                    ),
+                )
+            ]
+        else:
+            own = _meeting_stages(meeting_config, tracks, checkpoints, limits, cache, prefix)
+        stages.extend(own)
+        final_stages[own[-1].name] = result
+        meeting_stages[own[-1].name] = [stage.name for stage in own]
+
+    logger.info(
+        "Processing %d meeting(s) with %d ASR worker(s) shared across all tracks",
+        len(final_stages),
+        config.asr_workers,
     )
-    utterances = merge_timeline(track_segments)
-    logger.info("Merged %d utterance(s) into timeline", len(utterances))
-    note = _render_note(config, utterances)
+    # One graph for every meeting: the "asr" group is the global track queue, in meeting order.
+    with recording() as recorder:
+        report = run_stages(
+            stages,
+            max_workers=config.asr_workers + 2,
+            group_limits={"asr": config.asr_workers},
+            fail_fast=False,
+        )
+    _log_stage_report(report)
 
-    config.output_dir.mkdir(parents=True, exist_ok=True)
-    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_path = config.output_dir / f"meeting_notes_{_meeting_slug(tracks)}_{stamp}.md"
-    output_path.write_text(note, encoding="utf-8")
-    logger.info("Wrote meeting note to %s", output_path)
-    return output_path
+    for final_stage, result in final_stages.items():
+        names = meeting_stages[final_stage]
+        timed = [report.timings[name] for name in names if name in report.timings]
+        if timed:
+            result.seconds = max(t.finished for t in timed) - min(t.started for t in timed)
+        if final_stage in report.results:
+            result.output_path = report.results[final_stage]
+            continue
+        failed = [name for name in names if name in report.errors]
+        result.error = "; ".join(f"{name}: {report.errors[name]}" for name in failed)
+
+    succeeded = sum(result.ok for result in results)
+    logger.info(
+        "Batch finished in %.2fs: %d succeeded, %d failed",
+        time.perf_counter() - started,
+        succeeded,
+        len(results) - succeeded,
+    )
+    if report_path is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = config.output_dir / f"batch_report_{stamp}.json"
+    write_batch_report(results, report_path)
+    logger.info("Wrote batch report to %s", report_path)
+    _write_run_report(config, recorder, report, report_path, meetings=len(results))
+    return results
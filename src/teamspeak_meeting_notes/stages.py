@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from teamspeak_meeting_notes.instrument import in_current_context, span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Stage:
+    name: str
+    run: Callable[[dict[str, Any]], Any]
+    depends_on: tuple[str, ...] = ()
+    group: str | None = None
+
+
+@dataclass(slots=True)
+class StageTiming:
+    name: str
+    started: float
+    finished: float
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass(slots=True)
+class StageReport:
+    results: dict[str, Any]
+    timings: dict[str, StageTiming]
+    wall_seconds: float
+    critical_path: list[str] = field(default_factory=list)
+    errors: dict[str, Exception] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+
+    @property
+    def sequential_seconds(self) -> float:
+        return sum(timing.seconds for timing in self.timings.values())
+
+    @property
+    def saved_seconds(self) -> float:
+        return max(0.0, self.sequential_seconds - self.wall_seconds)
+
+
+def _run_stage(stage: Stage, inputs: dict[str, Any]) -> Any:
+    with span("stage", stage=stage.name, group=stage.group):
+        return stage.run(inputs)
+
+
+def _validate(stages: list[Stage]) -> dict[str, Stage]:
+    by_name: dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        missing = [dep for dep in stage.depends_on if dep not in by_name]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stage(s): {missing}")
+    return by_name
+
+
+def critical_path(stages: list[Stage], timings: dict[str, StageTiming]) -> list[str]:
+    by_name = _validate(stages)
+    longest: dict[str, float] = {}
+    previous: dict[str, str | None] = {}
+
+    def visit(name: str) -> float:
+        if name in longest:
+            return longest[name]
+        best_dep: str | None = None
+        best = 0.0
+        for dep in by_name[name].depends_on:
+            value = visit(dep)
+            if best_dep is None or value > best:
+                best_dep, best = dep, value
+        longest[name] = best + timings[name].seconds
+        previous[name] = best_dep
+        return longest[name]
+
+    if not timings:
+        return []
+    tail = max(timings, key=visit)
+    path: list[str] = []
+    node: str | None = tail
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return path[::-1]
+
+
+def run_stages(
+    stages: list[Stage],
+    max_workers: int = 4,
+    group_limits: dict[str, int] | None = None,
+    fail_fast: bool = True,
+) -> StageReport:
+    by_name = _validate(stages)
+    limits = group_limits or {}
+    results: dict[str, Any] = {}
+    timings: dict[str, StageTiming] = {}
+    errors: dict[str, Exception] = {}
+    skipped: list[str] = []
+    pending = list(stages)
+    running: dict[Future[Any], Stage] = {}
+    group_running: dict[str, int] = {}
+    started_at: dict[str, float] = {}
+    origin = time.perf_counter()
+
+    def skip_dependents() -> None:
+        blocked = set(errors) | set(skipped)
+        changed = True
+        while changed:
+            changed = False
+            for stage in list(pending):
+                if any(dep in blocked for dep in stage.depends_on):
+                    pending.remove(stage)
+                    skipped.append(stage.name)
+                    blocked.add(stage.name)
+                    changed = True
+
+    def ready(stage: Stage) -> bool:
+        if any(dep not in results for dep in stage.depends_on):
+            return False
+        if stage.group is None or stage.group not in limits:
+            return True
+        return group_running.get(stage.group, 0) < limits[stage.group]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="stage") as pool:
+        while pending or running:
+            for stage in [stage for stage in pending if ready(stage)]:
+                if stage.group is not None and stage.group in limits:
+                    if group_running.get(stage.group, 0) >= limits[stage.group]:
+                        continue
+                    group_running[stage.group] = group_running.get(stage.group, 0) + 1
+                pending.remove(stage)
+                inputs = {dep: results[dep] for dep in stage.depends_on}
+                started_at[stage.name] = time.perf_counter()
+                running[pool.submit(in_current_context(_run_stage), stage, inputs)] = stage
+
+            if not running:
+                blocked = ", ".join(stage.name for stage in pending)
+                raise RuntimeError(f"Stage graph cannot make progress; blocked: {blocked}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                if stage.group is not None and stage.group in group_running:
+                    group_running[stage.group] -= 1
+                try:
+                    results[stage.name] = future.result()
+                except Exception as exc:
+                    if fail_fast:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    logger.warning("Stage %s failed: %s", stage.name, exc)
+                    errors[stage.name] = exc
+                    skip_dependents()
+                    continue
+                except BaseException:
+                    for other in running:
+                        other.cancel()
+                    raise
+                timings[stage.name] = StageTiming(
+                    name=stage.name,
+                    started=started_at[stage.name] - origin,
+                    finished=time.perf_counter() - origin,
+                )
+
+    report = StageReport(
+        results=results,
+        timings=timings,
+        wall_seconds=time.perf_counter() - origin,
+        errors=errors,
+        skipped=skipped,
+    )
+    report.critical_path = critical_path(list(by_name.values()), timings)
+    return report
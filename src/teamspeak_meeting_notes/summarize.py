@@ -1,116 +1,627 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
 import re
-from collections import Counter
-from datetime import datetime
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from openai import OpenAI
+import numpy as np
 
-from teamspeak_meeting_notes.models import TimelineUtterance
+from teamspeak_meeting_notes.analytics import (
+    DEFAULT_PEAK_WINDOW_SECONDS,
+    LONG_GAP_SECONDS,
+    TimelineStats,
+    timeline_stats,
+)
+from teamspeak_meeting_notes.clients import (
+    LLM_ENDPOINT,
+    endpoint_limiter,
+    is_transient_error,
+    shared_openai_client,
+    with_retries,
+)
+from teamspeak_meeting_notes.instrument import in_current_context, span
+from teamspeak_meeting_notes.models import ASR_PLACEHOLDER_PREFIX, TimelineUtterance
+from teamspeak_meeting_notes.summary_cache import SummaryCache
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 OLLAMA_BASE_URL = "http://192.168.10.60:11434/v1"
 OLLAMA_MODEL = "glm-4.7-flash:q4_K_M"
 
+logger = logging.getLogger(__name__)
+
+
+SUMMARY_SYSTEM_PROMPT = (
+    "你是会议分析助手。请输出‘会议助手+时间戳+分析段落’风格纪要。"
+    "语气客观、简洁，重点指出：是否偏题、沟通是否顺畅、是否出现结论或行动项。"
+    "严格使用以下格式，不要使用Markdown标题："
+    "会议助手HH:MM <分析段落>\n"
+    "会议助手HH:MM <分析段落>\n"
+    "综合观察 <总评段落>"
+    "每个分析段落2-4句，允许写‘待确认’，禁止编造。"
+)
+WINDOW_SYSTEM_PROMPT = (
+    "你是会议分析助手。下面是一场长会议中某个时间片段的转写。"
+    "请只输出该片段的阶段性观察，重点指出：是否偏题、沟通是否顺畅、是否出现结论或行动项。"
+    "严格使用以下格式，不要使用Markdown标题，不要输出综合观察："
+    "会议助手HH:MM <分析段落>\n"
+    "输出1-3条，每个分析段落2-4句，允许写‘待确认’，禁止编造。"
+)
+
+DEFAULT_WINDOW_TOKENS = 6000
+DEFAULT_SUMMARY_CONCURRENCY = 2
+PEAK_WINDOW_SECONDS = DEFAULT_PEAK_WINDOW_SECONDS
+# A peak window with at least this share of cross-talk reads as crowded.
+CROWDED_OVERLAP_RATIO = 0.1
+
+# Same-speaker segments closer than this are merged into one prompt line, up to a size that
+# still lets a long monologue spread over several summary windows.
+MERGE_GAP = timedelta(seconds=15)
+MAX_MERGED_TOKENS = 400
+
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+# Lines made only of hesitation sounds and punctuation (also matches empty lines).
+_FILLER = re.compile(r"[\W_]*(?:(?:嗯|啊|呃|额|哦|噢|唔|哈|um+|uh+|hm+|er+|ah+)[\W_]*)*", re.I)
+
+
+def _timeline_to_text(
+    utterances: Iterable[TimelineUtterance], aliases: dict[str, str] | None = None
+) -> str:
+    return "\n".join(_utterance_line(row, aliases) for row in utterances)
+
+
+def _utterance_line(row: TimelineUtterance, aliases: dict[str, str] | None = None) -> str:
+    if aliases is not None:
+        return f"[{row.start_at.strftime('%H:%M')}] {aliases[row.speaker_name]}: {row.text}"
+    return f"[{row.start_at.strftime('%H:%M:%S')}] {row.speaker_name}: {row.text}"
+
+
+def estimate_tokens(text: str) -> int:
+    # CJK characters are roughly one token each; other text averages about four chars per token.
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
 
-def _timeline_to_text(utterances: list[TimelineUtterance]) -> str:
-    lines = []
+
+def split_windows(
+    utterances: Iterable[TimelineUtterance],
+    max_tokens: int = DEFAULT_WINDOW_TOKENS,
+    aliases: dict[str, str] | None = None,
+) -> list[list[TimelineUtterance]]:
+    windows: list[list[TimelineUtterance]] = []
+    current: list[TimelineUtterance] = []
+    used = 0
     for row in utterances:
-        stamp = row.start_at.strftime("%H:%M:%S")
-        lines.append(f"[{stamp}] {row.speaker_name}: {row.text}")
-    return "\n".join(lines)
+        cost = estimate_tokens(_utterance_line(row, aliases)) + 1
+        if current and used + cost > max_tokens:
+            windows.append(current)
+            current = []
+            used = 0
+        current.append(row)
+        used += cost
+    if current:
+        windows.append(current)
+    return windows
+
+
+@dataclass(slots=True)
+class CompactTranscript:
+    utterances: list[TimelineUtterance]
+    # Real speaker name -> short alias used in the prompt lines.
+    aliases: dict[str, str]
+    dropped: int
+    tokens_before: int
+    tokens_after: int
+
+
+def _speaker_legend(aliases: dict[str, str], rows: Iterable[TimelineUtterance]) -> str:
+    names = dict.fromkeys(row.speaker_name for row in rows)
+    pairs = "，".join(f"{aliases[name]}={name}" for name in names)
+    return f"发言人代号：{pairs}（纪要中请使用真实姓名）\n"
+
+
+def compact_transcript(utterances: Iterable[TimelineUtterance]) -> CompactTranscript:
+    rows: list[TimelineUtterance] = []
+    aliases: dict[str, str] = {}
+    dropped = 0
+    tokens_before = 0
+    run_tokens = 0
+    for row in utterances:
+        tokens_before += estimate_tokens(_utterance_line(row)) + 1
+        text = row.text.strip()
+        if text.startswith(ASR_PLACEHOLDER_PREFIX) or _FILLER.fullmatch(text):
+            dropped += 1
+            continue
+        aliases.setdefault(row.speaker_name, f"S{len(aliases) + 1}")
+        cost = estimate_tokens(text)
+        last = rows[-1] if rows else None
+        if (
+            last is not None
+            and last.speaker_name == row.speaker_name
+            and row.start_at - last.end_at <= MERGE_GAP
+            and run_tokens + cost <= MAX_MERGED_TOKENS
+        ):
+            last.text = f"{last.text} {text}"
+            last.end_at = max(last.end_at, row.end_at)
+            run_tokens += cost
+            continue
+        rows.append(
+            TimelineUtterance(
+                speaker_name=row.speaker_name,
+                start_at=row.start_at,
+                end_at=row.end_at,
+                text=text,
+                source_file=row.source_file,
+            )
+        )
+        run_tokens = cost
+    tokens_after = estimate_tokens(_speaker_legend(aliases, rows)) + sum(
+        estimate_tokens(_utterance_line(row, aliases)) + 1 for row in rows
+    )
+    return CompactTranscript(
+        utterances=rows,
+        aliases=aliases,
+        dropped=dropped,
+        tokens_before=tokens_before,
+        tokens_after=tokens_after,
+    )
 
 
-def summarize_with_openai(utterances: list[TimelineUtterance], meeting_title: str | None) -> str:
-    base_url = os.getenv("OLLAMA_BASE_URL", OLLAMA_BASE_URL)
-    model = os.getenv("OLLAMA_MODEL", OLLAMA_MODEL)
+def _ollama_settings() -> tuple[str, str]:
+    return os.getenv("OLLAMA_BASE_URL", OLLAMA_BASE_URL), os.getenv("OLLAMA_MODEL", OLLAMA_MODEL)
+
+
+def _ollama_client() -> tuple[OpenAI, str]:
+    base_url, model = _ollama_settings()
     api_key = os.getenv("OLLAMA_API_KEY", "ollama")
+    return shared_openai_client(api_key, base_url=base_url), model
+
+
+def _complete(
+    client: OpenAI,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    on_delta: Callable[[str], None] | None = None,
+) -> str:
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+    limiter = endpoint_limiter(LLM_ENDPOINT)
+    parts: list[str] = []
+
+    def request() -> str:
+        # Taken per attempt: a request backing off between retries holds no slot, and every
+        # retry actually sent is charged against the token budget.
+        with limiter.slot(tokens):
+            if on_delta is None:
+                response = client.responses.create(model=model, input=messages)
+                return response.output_text.strip()
+            stream = client.responses.create(model=model, input=messages, stream=True)
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    parts.append(event.delta)
+                    on_delta(event.delta)
+                elif event.type == "response.failed":
+                    error = getattr(event.response, "error", None)
+                    raise RuntimeError(f"Summary stream failed: {getattr(error, 'message', error)}")
+                elif event.type == "error":
+                    raise RuntimeError(f"Summary stream failed: {getattr(event, 'message', event)}")
+            return "".join(parts).strip()
+
+    def retryable(exc: BaseException) -> bool:
+        # Once tokens reached the note file a retry would duplicate them.
+        return not parts and is_transient_error(exc)
 
-    transcript_text = _timeline_to_text(utterances)
-    system_prompt = (
-        "你是会议分析助手。请输出‘会议助手+时间戳+分析段落’风格纪要。"
-        "语气客观、简洁，重点指出：是否偏题、沟通是否顺畅、是否出现结论或行动项。"
-        "严格使用以下格式，不要使用Markdown标题："
-        "会议助手HH:MM <分析段落>\n"
-        "会议助手HH:MM <分析段落>\n"
-        "综合观察 <总评段落>"
-        "每个分析段落2-4句，允许写‘待确认’，禁止编造。"
+    with span(
+        "llm",
+        model=model,
+        prompt_chars=len(user_prompt),
+        prompt_tokens=tokens,
+        stream=on_delta is not None,
+    ) as llm:
+        text = with_retries(request, f"Summary request to {model}", retryable=retryable)
+        llm.set(output_chars=len(text))
+        return text
+
+
+def _timeline_note(utterances: list[TimelineUtterance]) -> str:
+    # Computed from the whole timeline, so the final summary sees numbers no window could.
+    stats = timeline_stats(utterances, window_seconds=PEAK_WINDOW_SECONDS)
+    peaks = "、".join(
+        f"{peak.start_at.strftime('%H:%M')}-{peak.end_at.strftime('%H:%M')}" for peak in stats.peaks
     )
+    return (
+        f"会议统计（由时间轴计算，可直接引用）：{describe_timeline_stats(stats)}"
+        f"发言最密集时段：{peaks}。\n"
+    )
+
+
+def summarize_with_openai(
+    utterances: Iterable[TimelineUtterance],
+    meeting_title: str | None,
+    on_delta: Callable[[str], None] | None = None,
+    timeline_note: str = "",
+    aliases: dict[str, str] | None = None,
+) -> str:
+    if not isinstance(utterances, list):
+        utterances = list(utterances)
+    transcript_text = _timeline_to_text(utterances, aliases)
+    if aliases is not None:
+        transcript_text = _speaker_legend(aliases, utterances) + transcript_text
     title = meeting_title or "TeamSpeak 会议"
     user_prompt = (
         f"会议主题：{title}\n"
+        f"{timeline_note}"
         "请按照示例风格输出，突出阶段性观察，不要做逐句转写。\n\n"
         f"Transcript:\n{transcript_text}"
     )
 
-    client = OpenAI(api_key=api_key, base_url=base_url)
-    response = client.responses.create(
-        model=model,
-        input=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
+    client, model = _ollama_client()
+    return _complete(client, model, SUMMARY_SYSTEM_PROMPT, user_prompt, on_delta=on_delta)
+
+
+def _summarize_window(
+    client: OpenAI,
+    model: str,
+    title: str,
+    rows: list[TimelineUtterance],
+    position: int,
+    total: int,
+    cache: SummaryCache | None = None,
+    aliases: dict[str, str] | None = None,
+) -> str:
+    start = rows[0].start_at.strftime("%H:%M")
+    end = rows[-1].end_at.strftime("%H:%M")
+    transcript_text = _timeline_to_text(rows, aliases)
+    if aliases is not None:
+        transcript_text = _speaker_legend(aliases, rows) + transcript_text
+    user_prompt = (
+        f"会议主题：{title}\n"
+        f"片段时间：{start}-{end}（第{position}/{total}段）\n"
+        "请按照示例风格输出，突出阶段性观察，不要做逐句转写。\n\n"
+        f"Transcript:\n{transcript_text}"
+    )
+    if cache is None:
+        return _complete(client, model, WINDOW_SYSTEM_PROMPT, user_prompt)
+    # The window's position is left out of the key: when a transcript grows, its earlier
+    # windows keep their text but not their "n/total" label, and should still be reused.
+    key = cache.key_for(
+        "window", transcript_text, WINDOW_SYSTEM_PROMPT, model, _ollama_settings()[0], title
+    )
+    partial = cache.get(key)
+    if partial is None:
+        partial = _complete(client, model, WINDOW_SYSTEM_PROMPT, user_prompt)
+        cache.put(key, partial)
+    else:
+        logger.info("Reusing cached summary for window %d/%d", position, total)
+    return partial
+
+
+def _reduce_partials(
+    client: OpenAI,
+    model: str,
+    title: str,
+    partials: list[str],
+    max_tokens: int,
+    concurrency: int,
+    on_delta: Callable[[str], None] | None = None,
+    timeline_note: str = "",
+) -> str:
+    groups: list[list[str]] = [[]]
+    used = 0
+    for partial in partials:
+        cost = estimate_tokens(partial) + 2
+        if groups[-1] and used + cost > max_tokens:
+            groups.append([])
+            used = 0
+        groups[-1].append(partial)
+        used += cost
+
+    def reduce_group(group: list[str], final: bool) -> str:
+        instruction = (
+            "以下是按时间顺序排列的各时间片段分析，请合并为完整纪要："
+            "保留关键阶段的‘会议助手HH:MM’条目并沿用片段中的时间戳，去除重复内容，"
+            + ("最后给出‘综合观察’。" if final else "不要输出综合观察。")
+        )
+        note = timeline_note if final else ""
+        user_prompt = f"会议主题：{title}\n{note}{instruction}\n\n" + "\n\n".join(group)
+        if final:
+            return _complete(client, model, SUMMARY_SYSTEM_PROMPT, user_prompt, on_delta=on_delta)
+        return _complete(client, model, WINDOW_SYSTEM_PROMPT, user_prompt)
+
+    if len(groups) == 1 or len(groups) == len(partials):
+        # Either everything fits, or no grouping can shrink the input any further.
+        return reduce_group(partials, final=True)
+
+    # Still too large for one prompt: reduce each group, then reduce the reductions.
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(groups)))) as executor:
+        merged = list(
+            executor.map(in_current_context(lambda group: reduce_group(group, final=False)), groups)
+        )
+    return _reduce_partials(
+        client, model, title, merged, max_tokens, concurrency, on_delta, timeline_note
+    )
+
+
+def summarize_hierarchical(
+    utterances: Iterable[TimelineUtterance],
+    meeting_title: str | None,
+    window_tokens: int = DEFAULT_WINDOW_TOKENS,
+    concurrency: int = DEFAULT_SUMMARY_CONCURRENCY,
+    on_delta: Callable[[str], None] | None = None,
+    with_stats: bool = False,
+    cache: SummaryCache | None = None,
+    compact: bool = False,
+) -> str:
+    if not isinstance(utterances, list):
+        utterances = list(utterances)
+    timeline_note = _timeline_note(utterances) if with_stats and utterances else ""
+    if cache is None:
+        return _summarize_windows(
+            utterances, meeting_title, window_tokens, concurrency, on_delta, timeline_note, compact
+        )
+
+    base_url, model = _ollama_settings()
+    key = cache.key_for(
+        "summary",
+        _timeline_to_text(utterances),
+        SUMMARY_SYSTEM_PROMPT,
+        model,
+        base_url,
+        json.dumps([meeting_title, window_tokens, timeline_note, compact], ensure_ascii=False),
+    )
+    note = cache.get(key)
+    if note is not None:
+        logger.info("Reusing cached summary for an unchanged transcript")
+        if on_delta is not None:
+            on_delta(note)
+        return note
+    note = _summarize_windows(
+        utterances,
+        meeting_title,
+        window_tokens,
+        concurrency,
+        on_delta,
+        timeline_note,
+        compact,
+        cache,
     )
-    return response.output_text.strip()
+    cache.put(key, note)
+    return note
 
 
-def summarize_heuristic(utterances: list[TimelineUtterance], meeting_title: str | None) -> str:
+def _summarize_windows(
+    utterances: list[TimelineUtterance],
+    meeting_title: str | None,
+    window_tokens: int,
+    concurrency: int,
+    on_delta: Callable[[str], None] | None,
+    timeline_note: str,
+    compact: bool,
+    cache: SummaryCache | None = None,
+) -> str:
+    aliases: dict[str, str] | None = None
+    if compact:
+        with span("prompt.compact", utterances=len(utterances)) as compact_span:
+            compacted = compact_transcript(utterances)
+            compact_span.set(
+                tokens_before=compacted.tokens_before,
+                tokens_after=compacted.tokens_after,
+                dropped=compacted.dropped,
+            )
+        logger.info(
+            "Compacted transcript for the prompt: %d -> %d tokens "
+            "(%d -> %d lines, %d empty/filler/placeholder lines dropped)",
+            compacted.tokens_before,
+            compacted.tokens_after,
+            len(utterances),
+            len(compacted.utterances),
+            compacted.dropped,
+        )
+        utterances, aliases = compacted.utterances, compacted.aliases
+
+    windows = split_windows(utterances, max_tokens=window_tokens, aliases=aliases)
+    if len(windows) <= 1:
+        return summarize_with_openai(
+            windows[0] if windows else [], meeting_title, on_delta, timeline_note, aliases
+        )
+
     title = meeting_title or "TeamSpeak 会议"
-    if not utterances:
-        return (
-            "会议助手00:00 当前没有可分析的发言数据。\n综合观察 暂无会议内容，待确认录音是否有效。"
+    client, model = _ollama_client()
+    logger.info(
+        "Summarizing %d window(s) of <=%d tokens with concurrency %d",
+        len(windows),
+        window_tokens,
+        concurrency,
+    )
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(windows)))) as executor:
+        partials = list(
+            executor.map(
+                in_current_context(
+                    lambda item: _summarize_window(
+                        client, model, title, item[1], item[0] + 1, len(windows), cache, aliases
+                    )
+                ),
+                enumerate(windows),
+            )
         )
+    return _reduce_partials(
+        client,
+        model,
+        title,
+        partials,
+        window_tokens,
+        concurrency,
+        on_delta=on_delta,
+        timeline_note=timeline_note,
+    )
 
-    action_pattern = re.compile(
-        r"\b(todo|action|follow up|deadline|需要|请|安排|下周)\b", re.IGNORECASE
+
+@dataclass(frozen=True, slots=True)
+class HeuristicKeywords:
+    action: tuple[str, ...] = (
+        "todo",
+        "action",
+        "follow up",
+        "deadline",
+        "需要",
+        "请",
+        "安排",
+        "下周",
     )
-    off_topic_pattern = re.compile(
-        r"\b(电视剧|解说|吐槽|玩笑|哈哈|外观|皮肤|游戏|装备|冲锋枪|弹匣|收割机|涡轮机)\b",
-        re.IGNORECASE,
+    off_topic: tuple[str, ...] = (
+        "电视剧",
+        "解说",
+        "吐槽",
+        "玩笑",
+        "哈哈",
+        "外观",
+        "皮肤",
+        "游戏",
+        "装备",
+        "冲锋枪",
+        "弹匣",
+        "收割机",
+        "涡轮机",
     )
 
-    start = utterances[0].start_at
 
-    def window_key(ts: datetime) -> int:
-        delta = ts - start
-        return int(delta.total_seconds() // 180)
+def load_heuristic_keywords(path: Path) -> HeuristicKeywords:
+    # {"action": [...], "off_topic": [...]}; a missing list keeps the built-in default.
+    data = json.loads(path.read_text(encoding="utf-8"))
+    defaults = HeuristicKeywords()
+    return HeuristicKeywords(
+        action=tuple(data.get("action", defaults.action)),
+        off_topic=tuple(data.get("off_topic", defaults.off_topic)),
+    )
 
-    buckets: dict[int, list[TimelineUtterance]] = {}
-    for row in utterances:
-        key = window_key(row.start_at)
-        buckets.setdefault(key, []).append(row)
 
-    top_windows = sorted(buckets.items(), key=lambda item: len(item[1]), reverse=True)[:2]
-    top_windows.sort(key=lambda item: item[0])
+def _is_ascii_word_char(char: str) -> bool:
+    return char.isascii() and (char.isalnum() or char == "_")
 
-    lines: list[str] = []
-    for _, rows in top_windows:
-        stamp = rows[0].start_at.strftime("%H:%M")
-        speaker_counter = Counter(item.speaker_name for item in rows)
-        speakers = "和".join(name for name, _ in speaker_counter.most_common(2))
 
-        off_topic_hits = sum(1 for item in rows if off_topic_pattern.search(item.text))
-        action_hits = sum(1 for item in rows if action_pattern.search(item.text))
+def _bounded(word: str) -> str:
+    # Python counts CJK characters as \w and Chinese has no spaces, so \b next to a CJK
+    # character never matches mid-sentence. ASCII word edges get an ASCII-only boundary
+    # instead: "release" stays out of "prerelease" but still matches in "发布release版本",
+    # and "需要" matches inside "我们需要跟进".
+    prefix = "(?<![0-9A-Za-z_])" if _is_ascii_word_char(word[0]) else ""
+    suffix = "(?![0-9A-Za-z_])" if _is_ascii_word_char(word[-1]) else ""
+    return f"{prefix}{re.escape(word)}{suffix}"
+
+
+@lru_cache(maxsize=32)
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern[str]:
+    words = sorted({word for word in keywords if word}, key=len, reverse=True)
+    if not words:
+        return re.compile(r"(?!)")
+    # The leading first-character class lets the regex engine skip ahead to candidate
+    # positions instead of trying every keyword at every character. Longest keywords go first
+    # so one never loses to its own prefix, and the trailing [^\n]* consumes the rest of the
+    # utterance so a scan yields at most one match per row.
+    first_chars = "".join(sorted({re.escape(word[0]) for word in words}))
+    alternatives = "|".join(_bounded(word) for word in words)
+    return re.compile(rf"(?=[{first_chars}])(?:{alternatives})[^\n]*", re.IGNORECASE)
+
+
+def _hit_rows(pattern: re.Pattern[str], text: str, starts: list[int]) -> list[int]:
+    # Rows are joined with "\n", which no keyword match can span, so each match maps to one row;
+    # a row with its own line breaks can still match more than once, hence the de-duplication.
+    rows = (bisect_right(starts, match.start()) - 1 for match in pattern.finditer(text))
+    return list(dict.fromkeys(rows))
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, rest = divmod(round(seconds), 60)
+    return f"{minutes}分{rest:02d}秒" if minutes else f"{rest}秒"
+
+
+def describe_timeline_stats(stats: TimelineStats) -> str:
+    total_talk = sum(speaker.talk_seconds for speaker in stats.speakers)
+    shares = "、".join(
+        f"{speaker.name} {speaker.talk_seconds / total_talk:.0%}"
+        for speaker in stats.speakers[:5]
+        if total_talk > 0
+    )
+    coverage = stats.speech_seconds / stats.duration_seconds if stats.duration_seconds else 0.0
+    silence = f"发言间最长停顿{_format_seconds(stats.longest_gap_seconds)}"
+    if stats.long_gaps:
+        silence += f"，超过{LONG_GAP_SECONDS:.0f}秒的冷场{stats.long_gaps}次"
+    return (
+        (f"发言时长占比：{shares}。" if shares else "")
+        + f"有效发言共{_format_seconds(stats.speech_seconds)}（占会议时长{coverage:.0%}），"
+        f"多人同时发言{_format_seconds(stats.overlap_seconds)}，插话{stats.interruptions}次，"
+        f"{silence}。"
+    )
+
 
-        if off_topic_hits >= max(2, len(rows) // 4):
+def summarize_heuristic(
+    utterances: Iterable[TimelineUtterance],
+    meeting_title: str | None,
+    keywords: HeuristicKeywords | None = None,
+) -> str:
+    title = meeting_title or "TeamSpeak 会议"
+    keywords = keywords or HeuristicKeywords()
+    if not isinstance(utterances, list):
+        utterances = list(utterances)
+    if not utterances:
+        return (
+            "会议助手00:00 当前没有可分析的发言数据。\n综合观察 暂无会议内容，待确认录音是否有效。"
+        )
+
+    # Each keyword pattern scans the joined transcript once instead of once per row.
+    texts = [row.text for row in utterances]
+    starts = list(accumulate((len(text) + 1 for text in texts[:-1]), initial=0))
+    text = "\n".join(texts)
+    action_hits = np.zeros(len(utterances), dtype=bool)
+    action_hits[_hit_rows(_keyword_pattern(keywords.action), text, starts)] = True
+    off_topic_hits = np.zeros(len(utterances), dtype=bool)
+    off_topic_hits[_hit_rows(_keyword_pattern(keywords.off_topic), text, starts)] = True
+
+    stats = timeline_stats(utterances, window_seconds=PEAK_WINDOW_SECONDS)
+    lines: list[str] = []
+    for peak in stats.peaks:
+        stamp = peak.start_at.strftime("%H:%M")
+        speakers = "和".join(name for name, _ in peak.speakers[:2])
+        count = len(peak.rows)
+
+        if off_topic_hits[peak.rows].sum() >= max(2, count // 4):
             topic_desc = "讨论明显偏离主题，夹杂较多无关内容"
         else:
             topic_desc = "讨论基本围绕同一议题推进"
 
-        if action_hits > 0:
+        if peak.overlap_seconds >= CROWDED_OVERLAP_RATIO * PEAK_WINDOW_SECONDS:
+            flow_desc = f"多人同时发言约{_format_seconds(peak.overlap_seconds)}，存在抢话现象"
+        else:
+            flow_desc = "发言衔接较为顺畅"
+
+        if action_hits[peak.rows].any():
             action_desc = "出现了可执行导向的表达，但需要进一步明确负责人和截止时间"
         else:
             action_desc = "未形成明确行动项，更多停留在观点交换"
 
         lines.append(
-            f"会议助手{stamp} {speakers or '参会者'}在该时段发言较为集中，{topic_desc}。"
+            f"会议助手{stamp} {speakers or '参会者'}在该时段发言较为集中"
+            f"（有效发言约{_format_seconds(peak.talk_seconds)}），{topic_desc}，{flow_desc}。"
             f"{action_desc}。"
         )
 
-    all_speakers = Counter(item.speaker_name for item in utterances)
-    active = "、".join(name for name, _ in all_speakers.most_common(3))
-    all_actions = sum(1 for item in utterances if action_pattern.search(item.text))
-    all_offtopic = sum(1 for item in utterances if off_topic_pattern.search(item.text))
+    active = "、".join(speaker.name for speaker in stats.speakers[:3])
+    all_actions = int(action_hits.sum())
+    all_offtopic = int(off_topic_hits.sum())
 
     if all_offtopic >= max(3, len(utterances) // 5):
         discipline = "整体注意力存在分散迹象，会议纪律偏松散"
@@ -124,6 +635,6 @@ def summarize_heuristic(utterances: list[TimelineUtterance], meeting_title: str
 
     lines.append(
         f"综合观察 会议主题《{title}》中，活跃参与者主要为{active or '待确认'}。"
-        f"{discipline}。{closure}"
+        f"{describe_timeline_stats(stats)}{discipline}。{closure}"
     )
     return "\n".join(lines)
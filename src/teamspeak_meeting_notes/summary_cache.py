@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar
+
+from teamspeak_meeting_notes.json_cache import JsonEntryCache, default_cache_root
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_SUMMARY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SUMMARY_CACHE_MAX_AGE_DAYS = 30
+
+
+def default_summary_cache_dir() -> Path:
+    return default_cache_root("summaries")
+
+
+@dataclass(slots=True)
+class SummaryCache(JsonEntryCache):
+    max_bytes: int = DEFAULT_SUMMARY_CACHE_MAX_BYTES
+    max_age_seconds: float = DEFAULT_SUMMARY_CACHE_MAX_AGE_DAYS * 24 * 3600
+
+    label: ClassVar[str] = "summary"
+
+    def key_for(
+        self,
+        kind: str,
+        transcript: str,
+        system_prompt: str,
+        model: str,
+        base_url: str,
+        variant: str = "",
+    ) -> str:
+        payload = {
+            "version": CACHE_FORMAT_VERSION,
+            "kind": kind,
+            "transcript": hashlib.sha256(transcript.encode("utf-8")).hexdigest(),
+            "system_prompt": system_prompt,
+            "model": model,
+            "base_url": base_url,
+            "variant": variant,
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        data = self.read_entry(key)
+        return str(data["summary"]) if data is not None and "summary" in data else None
+
+    def put(self, key: str, summary: str) -> None:
+        self.write_entry(key, {"summary": summary})
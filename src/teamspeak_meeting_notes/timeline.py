@@ -1,26 +1,45 @@
 from __future__ import annotations
 
-from datetime import timedelta
+import heapq
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
 
 from teamspeak_meeting_notes.models import ParsedTrack, TimelineUtterance, TranscriptSegment
 
 
+def _utterance_key(item: TimelineUtterance) -> tuple[datetime, datetime, str]:
+    return (item.start_at, item.end_at, item.speaker_name)
+
+
+def _track_utterances(
+    track: ParsedTrack,
+    segments: list[TranscriptSegment],
+) -> Iterator[TimelineUtterance]:
+    ordered = all(
+        (prev.start_seconds, prev.end_seconds) <= (cur.start_seconds, cur.end_seconds)
+        for prev, cur in zip(segments, segments[1:], strict=False)
+    )
+    if not ordered:
+        segments = sorted(segments, key=lambda seg: (seg.start_seconds, seg.end_seconds))
+    for segment in segments:
+        yield TimelineUtterance(
+            speaker_name=track.speaker_name,
+            start_at=track.started_at + timedelta(seconds=segment.start_seconds),
+            end_at=track.started_at + timedelta(seconds=segment.end_seconds),
+            text=segment.text,
+            source_file=track.path,
+        )
+
+
+def iter_timeline(
+    track_segments: Iterable[tuple[ParsedTrack, list[TranscriptSegment]]],
+) -> Iterator[TimelineUtterance]:
+    # heapq.merge breaks key ties by input position, matching a stable sort of all utterances.
+    streams = [_track_utterances(track, segments) for track, segments in track_segments]
+    return heapq.merge(*streams, key=_utterance_key)
+
+
 def merge_timeline(
     track_segments: list[tuple[ParsedTrack, list[TranscriptSegment]]],
 ) -> list[TimelineUtterance]:
-    utterances: list[TimelineUtterance] = []
-    for track, segments in track_segments:
-        for segment in segments:
-            start_at = track.started_at + timedelta(seconds=segment.start_seconds)
-            end_at = track.started_at + timedelta(seconds=segment.end_seconds)
-            utterances.append(
-                TimelineUtterance(
-                    speaker_name=track.speaker_name,
-                    start_at=start_at,
-                    end_at=end_at,
-                    text=segment.text,
-                    source_file=track.path,
-                )
-            )
-    utterances.sort(key=lambda item: (item.start_at, item.end_at, item.speaker_name))
-    return utterances
+    return list(iter_timeline(track_segments))
@@ -1,24 +1,76 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import logging
 import os
 import shutil
+import struct
 import subprocess
 import tempfile
+import threading
+import time
+import wave
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
-from openai import OpenAI
-
-from teamspeak_meeting_notes.models import TranscriptSegment
+from teamspeak_meeting_notes.audio_encode import UploadFormat, encoded_for_upload
+from teamspeak_meeting_notes.audio_probe import probe_wav_header
+from teamspeak_meeting_notes.chunking import (
+    AudioChunk,
+    ChunkSettings,
+    chunk_variant,
+    plan_chunks,
+    transcribe_chunked,
+    wav_duration,
+)
+from teamspeak_meeting_notes.clients import shared_openai_client, with_retries
+from teamspeak_meeting_notes.instrument import span
+from teamspeak_meeting_notes.models import (
+    ASR_PLACEHOLDER_PREFIX,
+    AudioInfo,
+    TranscriptSegment,
+)
+from teamspeak_meeting_notes.transcript_cache import TranscriptCache
+from teamspeak_meeting_notes.vad import (
+    SpeechAudio,
+    VadSettings,
+    remap_segments,
+    speech_only_audio,
+)
 
 AsrMode = Literal["local", "cloud", "hybrid"]
 WhisperDevice = Literal["auto", "cpu", "mps", "cuda"]
+WhisperBackend = Literal["auto", "inprocess", "cli"]
+
+DEFAULT_WHISPER_MODEL = "turbo"
+CLOUD_ASR_MODEL = "gpt-4o-mini-transcribe"
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class AsrLimits:
+    local: threading.BoundedSemaphore
+    cloud: threading.BoundedSemaphore
+
+
+def build_asr_limits(local_workers: int, cloud_workers: int) -> AsrLimits:
+    if local_workers < 1 or cloud_workers < 1:
+        raise ValueError("ASR worker limits must be at least 1")
+    return AsrLimits(
+        local=threading.BoundedSemaphore(local_workers),
+        cloud=threading.BoundedSemaphore(cloud_workers),
+    )
+
+
+def _slot(semaphore: threading.BoundedSemaphore | None) -> AbstractContextManager[object]:
+    return semaphore if semaphore is not None else nullcontext()
+
+
 def resolve_whisper_device(device: WhisperDevice) -> str:
     if device != "auto":
         return device
@@ -36,10 +88,114 @@ def resolve_whisper_device(device: WhisperDevice) -> str:
     return "cpu"
 
 
-def transcribe_with_local_whisper(
+def _segments_from_whisper(segments: list[dict[str, Any]]) -> list[TranscriptSegment]:
+    return [
+        TranscriptSegment(
+            start_seconds=float(seg["start"]),
+            end_seconds=float(seg["end"]),
+            text=str(seg.get("text", "")).strip(),
+        )
+        for seg in segments
+        if str(seg.get("text", "")).strip()
+    ]
+
+
+@dataclass(slots=True)
+class _LoadedWhisperModel:
+    model: Any
+    lock: threading.Lock
+
+
+_whisper_models: dict[tuple[str, str], _LoadedWhisperModel] = {}
+_whisper_models_lock = threading.Lock()
+
+
+def _load_whisper_model(model_name: str, device: str) -> _LoadedWhisperModel:
+    key = (model_name, device)
+    with _whisper_models_lock:
+        loaded = _whisper_models.get(key)
+        if loaded is None:
+            import whisper
+
+            logger.info("Loading Whisper model %s on %s", model_name, device)
+            with span("whisper.load", model=model_name, device=device):
+                loaded = _LoadedWhisperModel(
+                    model=whisper.load_model(model_name, device=device),
+                    lock=threading.Lock(),
+                )
+            _whisper_models[key] = loaded
+        return loaded
+
+
+def warm_up_whisper(
+    whisper_device: WhisperDevice,
+    whisper_model: str = DEFAULT_WHISPER_MODEL,
+    whisper_backend: WhisperBackend = "auto",
+) -> bool:
+    if whisper_backend == "cli" or not _whisper_module_available():
+        return False
+    try:
+        _load_whisper_model(whisper_model, resolve_whisper_device(whisper_device))
+    except Exception as exc:
+        logger.warning("Failed to preload Whisper model %s: %s", whisper_model, exc)
+        return False
+    return True
+
+
+def _with_mps_fallback(
+    path: Path,
+    resolved_device: str,
+    run_once: Callable[[str], list[TranscriptSegment]],
+) -> list[TranscriptSegment]:
+    try:
+        return run_once(resolved_device)
+    except Exception as exc:
+        if resolved_device == "mps":
+            logger.warning(
+                "Whisper failed on mps for %s, retrying on cpu: %s",
+                path.name,
+                exc,
+            )
+            return run_once("cpu")
+        raise
+
+
+def transcribe_with_whisper_inprocess(
     path: Path,
     language: str | None,
     whisper_device: WhisperDevice,
+    whisper_model: str = DEFAULT_WHISPER_MODEL,
+) -> list[TranscriptSegment]:
+    resolved_device = resolve_whisper_device(whisper_device)
+    logger.info(
+        "Running in-process Whisper for %s with model=%s device=%s (requested=%s)",
+        path.name,
+        whisper_model,
+        resolved_device,
+        whisper_device,
+    )
+
+    def run_once(device_name: str) -> list[TranscriptSegment]:
+        loaded = _load_whisper_model(whisper_model, device_name)
+        # One decode at a time per model: whisper installs kv-cache hooks on the shared module.
+        with loaded.lock:
+            result = loaded.model.transcribe(
+                str(path),
+                language=language,
+                task="transcribe",
+                fp16=False,
+                verbose=None,
+            )
+        return _segments_from_whisper(result.get("segments", []))
+
+    return _with_mps_fallback(path, resolved_device, run_once)
+
+
+def transcribe_with_whisper_cli(
+    path: Path,
+    language: str | None,
+    whisper_device: WhisperDevice,
+    whisper_model: str = DEFAULT_WHISPER_MODEL,
 ) -> list[TranscriptSegment]:
     if shutil.which("whisper") is None:
         raise RuntimeError("Local ASR unavailable: whisper CLI is not installed.")
@@ -57,6 +213,8 @@ def transcribe_with_local_whisper(
             cmd = [
                 "whisper",
                 str(path),
+                "--model",
+                whisper_model,
                 "--device",
                 device_name,
                 "--output_format",
@@ -80,43 +238,82 @@ def transcribe_with_local_whisper(
 
             json_path = Path(tmp_dir) / f"{path.stem}.json"
             data = json.loads(json_path.read_text(encoding="utf-8"))
-            segments = data.get("segments", [])
-            return [
-                TranscriptSegment(
-                    start_seconds=float(seg["start"]),
-                    end_seconds=float(seg["end"]),
-                    text=str(seg.get("text", "")).strip(),
-                )
-                for seg in segments
-                if str(seg.get("text", "")).strip()
-            ]
+            return _segments_from_whisper(data.get("segments", []))
+
+    return _with_mps_fallback(path, resolved_device, run_once)
+
+
+def _whisper_module_available() -> bool:
+    return importlib.util.find_spec("whisper") is not None
 
-    try:
-        return run_once(resolved_device)
-    except Exception as exc:
-        if resolved_device == "mps":
-            logger.warning(
-                "Whisper failed on mps for %s, retrying on cpu: %s",
-                path.name,
-                exc,
-            )
-            return run_once("cpu")
-        raise
+
+def transcribe_with_local_whisper(
+    path: Path,
+    language: str | None,
+    whisper_device: WhisperDevice,
+    whisper_model: str = DEFAULT_WHISPER_MODEL,
+    whisper_backend: WhisperBackend = "auto",
+) -> list[TranscriptSegment]:
+    use_inprocess = whisper_backend == "inprocess" or (
+        whisper_backend == "auto" and _whisper_module_available()
+    )
+    if use_inprocess:
+        return transcribe_with_whisper_inprocess(
+            path=path,
+            language=language,
+            whisper_device=whisper_device,
+            whisper_model=whisper_model,
+        )
+    if whisper_backend == "auto":
+        logger.info("whisper module not importable; falling back to whisper CLI")
+    return transcribe_with_whisper_cli(
+        path=path,
+        language=language,
+        whisper_device=whisper_device,
+        whisper_model=whisper_model,
+    )
 
 
-def transcribe_with_openai(path: Path, language: str | None) -> list[TranscriptSegment]:
+def transcribe_with_openai(
+    path: Path,
+    language: str | None,
+    upload_format: UploadFormat = "flac",
+    info: AudioInfo | None = None,
+    slot: threading.BoundedSemaphore | None = None,
+) -> list[TranscriptSegment]:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("Cloud ASR unavailable: OPENAI_API_KEY is not set.")
 
-    client = OpenAI(api_key=api_key)
-    with path.open("rb") as audio_file:
-        transcript = client.audio.transcriptions.create(
-            model="gpt-4o-mini-transcribe",
-            file=audio_file,
-            response_format="verbose_json",
-            language=language,
-            timestamp_granularities=["segment"],
+    client = shared_openai_client(api_key)
+    with encoded_for_upload(path, upload_format, info=info) as upload:
+
+        def request() -> Any:
+            # The slot is held per attempt, so a request backing off leaves it to other tracks.
+            with (
+                _slot(slot),
+                span("cloud_asr.request", file=path.name, bytes_uploaded=upload.encoded_bytes),
+                upload.path.open("rb") as audio_file,
+            ):
+                return client.audio.transcriptions.create(
+                    model=CLOUD_ASR_MODEL,
+                    file=audio_file,
+                    response_format="verbose_json",
+                    language=language,
+                    timestamp_granularities=["segment"],
+                )
+
+        started = time.perf_counter()
+        transcript = with_retries(request, f"Cloud ASR request for {path.name}")
+        elapsed = time.perf_counter() - started
+    if upload.encoded_bytes < upload.original_bytes:
+        logger.info(
+            "Cloud ASR request for %s took %.2fs after a %.2fs encode; uploaded %d of %d bytes",
+            path.name,
+            elapsed,
+            upload.encode_seconds,
+            upload.encoded_bytes,
+            upload.original_bytes,
         )
 
     segments = getattr(transcript, "segments", None) or []
@@ -137,59 +334,198 @@ def transcribe_with_openai(path: Path, language: str | None) -> list[TranscriptS
     ]
 
 
-def transcribe_audio(
+class AsrUnavailableError(RuntimeError):
+    pass
+
+
+def _placeholder(path: Path, reason: str) -> list[TranscriptSegment]:
+    return [
+        TranscriptSegment(
+            start_seconds=0.0,
+            end_seconds=0.0,
+            text=f"{ASR_PLACEHOLDER_PREFIX}{path.name}: {reason}]",
+        )
+    ]
+
+
+def _audio_seconds(path: Path) -> float:
+    try:
+        info = probe_wav_header(path)
+    except (OSError, struct.error):
+        return 0.0
+    return info.duration_seconds if info is not None else 0.0
+
+
+def _run_backend(
     path: Path,
-    asr_mode: AsrMode,
-    whisper_device: WhisperDevice,
-    language: str | None,
+    audio_path: Path,
+    backend: str,
+    run: Callable[[], list[TranscriptSegment]],
 ) -> list[TranscriptSegment]:
+    # audio_seconds is what this call transcribed (a chunk or the speech-only audio), so the
+    # report's totals do not count a chunked track once per chunk.
+    with span(
+        "asr", backend=backend, file=path.name, audio_seconds=_audio_seconds(audio_path)
+    ) as asr:
+        segments = run()
+        asr.set(segments=len(segments))
+        return segments
+
+
+def _attempt_backends(
+    path: Path,
+    audio_path: Path,
+    asr_mode: AsrMode,
+    run_local: Callable[[], list[TranscriptSegment]],
+    run_cloud: Callable[[], list[TranscriptSegment]],
+) -> tuple[str, list[TranscriptSegment]]:
     if asr_mode == "local":
         try:
-            return transcribe_with_local_whisper(
-                path=path,
-                language=language,
-                whisper_device=whisper_device,
-            )
+            return "whisper", _run_backend(path, audio_path, "whisper", run_local)
         except Exception as exc:
             logger.warning("Local ASR failed for %s: %s", path.name, exc)
-            return [
-                TranscriptSegment(
-                    start_seconds=0.0,
-                    end_seconds=0.0,
-                    text=f"[ASR unavailable for {path.name}: {exc}]",
-                )
-            ]
+            raise AsrUnavailableError(str(exc)) from exc
     if asr_mode == "cloud":
         try:
-            return transcribe_with_openai(path=path, language=language)
+            return "openai", _run_backend(path, audio_path, "openai", run_cloud)
         except Exception as exc:
             logger.warning("Cloud ASR failed for %s: %s", path.name, exc)
-            return [
-                TranscriptSegment(
-                    start_seconds=0.0,
-                    end_seconds=0.0,
-                    text=f"[ASR unavailable for {path.name}: {exc}]",
-                )
-            ]
+            raise AsrUnavailableError(str(exc)) from exc
 
     try:
-        return transcribe_with_local_whisper(
-            path=path,
-            language=language,
-            whisper_device=whisper_device,
-        )
+        return "whisper", _run_backend(path, audio_path, "whisper", run_local)
     except Exception as local_exc:
         logger.warning("Hybrid ASR local step failed for %s: %s", path.name, local_exc)
         try:
-            return transcribe_with_openai(path=path, language=language)
+            return "openai", _run_backend(path, audio_path, "openai", run_cloud)
         except Exception as cloud_exc:
             logger.warning("Hybrid ASR cloud step failed for %s: %s", path.name, cloud_exc)
-            return [
-                TranscriptSegment(
-                    start_seconds=0.0,
-                    end_seconds=0.0,
-                    text=(
-                        f"[ASR unavailable for {path.name}: local={local_exc}; cloud={cloud_exc}]"
-                    ),
+            raise AsrUnavailableError(f"local={local_exc}; cloud={cloud_exc}") from cloud_exc
+
+
+def transcribe_audio(
+    path: Path,
+    asr_mode: AsrMode,
+    whisper_device: WhisperDevice,
+    language: str | None,
+    limits: AsrLimits | None = None,
+    whisper_model: str = DEFAULT_WHISPER_MODEL,
+    whisper_backend: WhisperBackend = "auto",
+    cache: TranscriptCache | None = None,
+    vad: VadSettings | None = None,
+    chunking: ChunkSettings | None = None,
+    upload_format: UploadFormat = "flac",
+    info: AudioInfo | None = None,
+) -> list[TranscriptSegment]:
+    local_slot = limits.local if limits is not None else None
+    cloud_slot = limits.cloud if limits is not None else None
+    backends = {"local": [("whisper", whisper_model)], "cloud": [("openai", CLOUD_ASR_MODEL)]}
+    backends["hybrid"] = backends["local"] + backends["cloud"]
+    variant = "|".join(
+        item
+        for item in (
+            repr(vad) if vad is not None else None,
+            chunk_variant(chunking) if chunking is not None else None,
+        )
+        if item is not None
+    )
+
+    cache_keys: dict[str, str] = {}
+    if cache is not None:
+        try:
+            for backend, model in backends[asr_mode]:
+                key = cache.key_for(
+                    path, backend=backend, model=model, language=language, variant=variant
                 )
-            ]
+                cache_keys[backend] = key
+                cached = cache.get(key)
+                if cached is not None:
+                    logger.info("Transcript cache hit for %s (%s/%s)", path.name, backend, model)
+                    return cached
+        except OSError as exc:
+            logger.warning("Transcript cache unavailable for %s: %s", path.name, exc)
+            cache_keys.clear()
+
+    def store(backend: str, segments: list[TranscriptSegment]) -> list[TranscriptSegment]:
+        key = cache_keys.get(backend)
+        if cache is not None and key is not None:
+            try:
+                cache.put(key, segments)
+            except OSError as exc:
+                logger.warning("Failed to write transcript cache for %s: %s", path.name, exc)
+        return segments
+
+    def attempt(audio_path: Path) -> tuple[str, list[TranscriptSegment]]:
+        def run_local() -> list[TranscriptSegment]:
+            with _slot(local_slot):
+                return transcribe_with_local_whisper(
+                    path=audio_path,
+                    language=language,
+                    whisper_device=whisper_device,
+                    whisper_model=whisper_model,
+                    whisper_backend=whisper_backend,
+                )
+
+        def run_cloud() -> list[TranscriptSegment]:
+            return transcribe_with_openai(
+                path=audio_path,
+                language=language,
+                upload_format=upload_format,
+                info=info if audio_path == path else None,
+                slot=cloud_slot,
+            )
+
+        return _attempt_backends(path, audio_path, asr_mode, run_local, run_cloud)
+
+    audio_context: AbstractContextManager[SpeechAudio] = (
+        speech_only_audio(path, vad)
+        if vad is not None
+        else nullcontext(SpeechAudio(path=path, spans=None))
+    )
+    with audio_context as audio:
+        primary_backend = backends[asr_mode][0][0]
+        if audio.spans == []:
+            return store(primary_backend, [])
+
+        chunks = _plan_track_chunks(audio.path, chunking)
+        if len(chunks) > 1 and chunking is not None:
+            chunk_backends: set[str] = set()
+
+            def transcribe_chunk(chunk_path: Path) -> list[TranscriptSegment]:
+                backend, segments = attempt(chunk_path)
+                chunk_backends.add(backend)
+                return segments
+
+            # Cloud requests already went through with_retries, and hybrid only fails once the
+            # cloud did too, so only local-only chunks get another attempt. A failing chunk
+            # costs at most max_attempts Whisper runs, or one Whisper run plus one retried cloud
+            # request in hybrid mode.
+            segments, complete = transcribe_chunked(
+                audio.path,
+                chunks,
+                transcribe_chunk=transcribe_chunk,
+                settings=chunking,
+                retryable=lambda _: asr_mode == "local",
+            )
+            segments = remap_segments(segments, audio.spans)
+            # A hybrid run that fell back to the cloud for some chunks matches no single backend.
+            if complete and len(chunk_backends) == 1:
+                return store(chunk_backends.pop(), segments)
+            return segments
+
+        try:
+            backend, segments = attempt(audio.path)
+        except AsrUnavailableError as exc:
+            return _placeholder(path, str(exc))
+        return store(backend, remap_segments(segments, audio.spans))
+
+
+def _plan_track_chunks(path: Path, chunking: ChunkSettings | None) -> list[AudioChunk]:
+    if chunking is None:
+        return []
+    try:
+        duration = wav_duration(path)
+    except (wave.Error, EOFError, OSError) as exc:
+        logger.info("Chunking skipped for %s: %s", path.name, exc)
+        return []
+    return plan_chunks(duration, chunking.chunk_seconds, chunking.overlap_seconds)
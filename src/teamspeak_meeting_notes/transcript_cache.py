@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar
+
+from teamspeak_meeting_notes.json_cache import JsonEntryCache, default_cache_root
+from teamspeak_meeting_notes.models import TranscriptSegment
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    return default_cache_root("transcripts")
+
+
+def file_digest(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class TranscriptCache(JsonEntryCache):
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    _digests: dict[tuple[str, int, int], str] = field(default_factory=dict, init=False, repr=False)
+
+    label: ClassVar[str] = "transcript"
+
+    def audio_digest(self, path: Path) -> str:
+        stat = path.stat()
+        stat_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._digests.get(stat_key)
+        if cached is not None:
+            return cached
+        digest = file_digest(path)
+        with self._lock:
+            self._digests[stat_key] = digest
+        return digest
+
+    def key_for(
+        self,
+        path: Path,
+        backend: str,
+        model: str,
+        language: str | None,
+        variant: str = "",
+    ) -> str:
+        payload = {
+            "version": CACHE_FORMAT_VERSION,
+            "audio": self.audio_digest(path),
+            "backend": backend,
+            "model": model,
+            "language": language or "",
+            "variant": variant,
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> list[TranscriptSegment] | None:
+        data = self.read_entry(key)
+        if data is None:
+            return None
+        return [
+            TranscriptSegment(
+                start_seconds=float(seg["start"]),
+                end_seconds=float(seg["end"]),
+                text=str(seg["text"]),
+            )
+            for seg in data.get("segments", [])
+        ]
+
+    def put(self, key: str, segments: list[TranscriptSegment]) -> None:
+        payload = {
+            "segments": [
+                {"start": seg.start_seconds, "end": seg.end_seconds, "text": seg.text}
+                for seg in segments
+            ]
+        }
+        self.write_entry(key, payload)
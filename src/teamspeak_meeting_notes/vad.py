@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import logging
+import tempfile
+import wave
+from bisect import bisect_right
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from teamspeak_meeting_notes.instrument import span
+from teamspeak_meeting_notes.models import TranscriptSegment
+
+FRAME_SECONDS = 0.03
+BLOCK_FRAMES = 2048
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class VadSettings:
+    threshold_db: float = 12.0
+    min_threshold_db: float = -55.0
+    max_threshold_db: float = -35.0
+    min_speech_seconds: float = 0.25
+    min_silence_seconds: float = 0.6
+    padding_seconds: float = 0.3
+    gap_seconds: float = 0.3
+    max_speech_ratio: float = 0.9
+
+
+@dataclass(slots=True)
+class SpeechRegion:
+    start_seconds: float
+    end_seconds: float
+
+
+@dataclass(slots=True)
+class SpeechSpan:
+    compact_start: float
+    original_start: float
+    duration: float
+
+
+@dataclass(slots=True)
+class SpeechAudio:
+    path: Path
+    spans: list[SpeechSpan] | None
+
+
+def pcm_to_mono(raw: bytes, sample_width: int, channels: int) -> np.ndarray:
+    if sample_width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = packed[:, 0] | (packed[:, 1] << 8) | (packed[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / 8388608.0
+    elif sample_width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported PCM sample width: {sample_width}")
+    if channels > 1:
+        data = data.reshape(-1, channels).mean(axis=1)
+    return data
+
+
+def frame_levels(samples: np.ndarray, frame_len: int) -> tuple[np.ndarray, np.ndarray]:
+    usable = len(samples) - len(samples) % frame_len
+    frames = samples[:usable].reshape(-1, frame_len)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return 20.0 * np.log10(np.maximum(rms, 1e-6)), zcr
+
+
+def speech_frames(rms_db: np.ndarray, zcr: np.ndarray, settings: VadSettings) -> np.ndarray:
+    noise_floor = float(np.percentile(rms_db, 10))
+    threshold = min(
+        max(noise_floor + settings.threshold_db, settings.min_threshold_db),
+        settings.max_threshold_db,
+    )
+    voiced = rms_db >= threshold
+    # Fricatives are quiet but noisy; let them through slightly below the energy threshold.
+    unvoiced = (rms_db >= threshold - 6.0) & (zcr >= 0.15) & (zcr <= 0.5)
+    return voiced | unvoiced
+
+
+def frame_features(path: Path) -> tuple[np.ndarray, np.ndarray, float, float]:
+    with wave.open(str(path), "rb") as reader:
+        sample_rate = reader.getframerate()
+        channels = reader.getnchannels()
+        sample_width = reader.getsampwidth()
+        total_frames = reader.getnframes()
+        frame_len = max(1, int(sample_rate * FRAME_SECONDS))
+        rms_parts: list[np.ndarray] = []
+        zcr_parts: list[np.ndarray] = []
+        while True:
+            raw = reader.readframes(frame_len * BLOCK_FRAMES)
+            if not raw:
+                break
+            samples = pcm_to_mono(raw, sample_width, channels)
+            if len(samples) < frame_len:
+                break
+            rms_db, zcr = frame_levels(samples, frame_len)
+            rms_parts.append(rms_db)
+            zcr_parts.append(zcr)
+
+    rms_db = np.concatenate(rms_parts) if rms_parts else np.zeros(0, dtype=np.float32)
+    zcr = np.concatenate(zcr_parts) if zcr_parts else np.zeros(0, dtype=np.float32)
+    return rms_db, zcr, frame_len / sample_rate, total_frames / sample_rate
+
+
+def _runs(mask: np.ndarray) -> list[tuple[int, int]]:
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(0, len(edges), 2)]
+
+
+def detect_speech_regions(path: Path, settings: VadSettings | None = None) -> list[SpeechRegion]:
+    settings = settings or VadSettings()
+    rms_db, zcr, frame_seconds, duration = frame_features(path)
+    if len(rms_db) == 0:
+        return []
+
+    regions: list[SpeechRegion] = []
+    for start, end in _runs(speech_frames(rms_db, zcr, settings)):
+        start_s = start * frame_seconds
+        end_s = end * frame_seconds
+        if regions and start_s - regions[-1].end_seconds < settings.min_silence_seconds:
+            regions[-1].end_seconds = end_s
+        else:
+            regions.append(SpeechRegion(start_seconds=start_s, end_seconds=end_s))
+
+    padded: list[SpeechRegion] = []
+    for region in regions:
+        if region.end_seconds - region.start_seconds < settings.min_speech_seconds:
+            continue
+        start_s = max(0.0, region.start_seconds - settings.padding_seconds)
+        end_s = min(duration, region.end_seconds + settings.padding_seconds)
+        if padded and start_s <= padded[-1].end_seconds:
+            padded[-1].end_seconds = end_s
+        else:
+            padded.append(SpeechRegion(start_seconds=start_s, end_seconds=end_s))
+    return padded
+
+
+def write_speech_only_wav(
+    path: Path,
+    regions: list[SpeechRegion],
+    output_path: Path,
+    gap_seconds: float = 0.3,
+) -> list[SpeechSpan]:
+    spans: list[SpeechSpan] = []
+    with wave.open(str(path), "rb") as reader, wave.open(str(output_path), "wb") as writer:
+        sample_rate = reader.getframerate()
+        frame_bytes = reader.getsampwidth() * reader.getnchannels()
+        writer.setnchannels(reader.getnchannels())
+        writer.setsampwidth(reader.getsampwidth())
+        writer.setframerate(sample_rate)
+        silence_byte = b"\x80" if reader.getsampwidth() == 1 else b"\x00"
+        gap = silence_byte * (int(gap_seconds * sample_rate) * frame_bytes)
+
+        written = 0
+        for index, region in enumerate(regions):
+            if index:
+                writer.writeframes(gap)
+                written += len(gap) // frame_bytes
+            start_frame = int(region.start_seconds * sample_rate)
+            end_frame = min(int(region.end_seconds * sample_rate), reader.getnframes())
+            reader.setpos(start_frame)
+            spans.append(
+                SpeechSpan(
+                    compact_start=written / sample_rate,
+                    original_start=start_frame / sample_rate,
+                    duration=(end_frame - start_frame) / sample_rate,
+                )
+            )
+            remaining = end_frame - start_frame
+            while remaining > 0:
+                raw = reader.readframes(min(remaining, sample_rate * 10))
+                if not raw:
+                    break
+                writer.writeframes(raw)
+                count = len(raw) // frame_bytes
+                written += count
+                remaining -= count
+    return spans
+
+
+def _to_original(seconds: float, spans: list[SpeechSpan], starts: list[float]) -> float:
+    index = max(0, bisect_right(starts, seconds) - 1)
+    span = spans[index]
+    offset = min(max(seconds - span.compact_start, 0.0), span.duration)
+    return span.original_start + offset
+
+
+def remap_segments(
+    segments: list[TranscriptSegment],
+    spans: list[SpeechSpan] | None,
+) -> list[TranscriptSegment]:
+    if not spans:
+        return segments
+    starts = [span.compact_start for span in spans]
+    remapped: list[TranscriptSegment] = []
+    for segment in segments:
+        start = _to_original(segment.start_seconds, spans, starts)
+        end = _to_original(segment.end_seconds, spans, starts)
+        remapped.append(
+            TranscriptSegment(start_seconds=start, end_seconds=max(start, end), text=segment.text)
+        )
+    return remapped
+
+
+@contextmanager
+def speech_only_audio(path: Path, settings: VadSettings | None = None) -> Iterator[SpeechAudio]:
+    settings = settings or VadSettings()
+    try:
+        with span("vad", file=path.name) as vad:
+            regions = detect_speech_regions(path, settings)
+            with wave.open(str(path), "rb") as reader:
+                duration = reader.getnframes() / reader.getframerate()
+            vad.set(audio_seconds=duration, regions=len(regions))
+    except (wave.Error, EOFError, ValueError) as exc:
+        logger.info("VAD skipped for %s: %s", path.name, exc)
+        yield SpeechAudio(path=path, spans=None)
+        return
+
+    speech = sum(region.end_seconds - region.start_seconds for region in regions)
+    if not regions:
+        logger.info("VAD found no speech in %s (%.1fs)", path.name, duration)
+        yield SpeechAudio(path=path, spans=[])
+        return
+    if duration <= 0 or speech / duration >= settings.max_speech_ratio:
+        logger.info("VAD kept %.1fs of %.1fs in %s; using full track", speech, duration, path.name)
+        yield SpeechAudio(path=path, spans=None)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="ts_vad_") as tmp_dir:
+        compact_path = Path(tmp_dir) / path.name
+        spans = write_speech_only_wav(path, regions, compact_path, settings.gap_seconds)
+        logger.info(
+            "VAD kept %.1fs of %.1fs in %s (%d region(s))",
+            speech,
+            duration,
+            path.name,
+            len(regions),
+        )
+        yield SpeechAudio(path=compact_path, spans=spans)
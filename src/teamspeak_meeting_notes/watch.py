@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from pathlib import Path
+
+from teamspeak_meeting_notes.audio_probe import probe_wav_header
+from teamspeak_meeting_notes.checkpoint import file_fingerprint, fingerprint
+from teamspeak_meeting_notes.filename_parser import parse_track_filename
+from teamspeak_meeting_notes.models import ParsedTrack
+from teamspeak_meeting_notes.pipeline import PipelineConfig, run_pipeline
+from teamspeak_meeting_notes.transcribe import warm_up_whisper
+
+WATCH_STATE_FILE = ".watch_state.json"
+MAX_RETRY_BACKOFF_SECONDS = 3600.0
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class WatchSettings:
+    poll_interval: float = 5.0
+    settle_seconds: float = 60.0
+    meeting_gap_seconds: float = 600.0
+    meeting_workers: int = 1
+    use_inotify: bool = True
+    # A meeting that keeps failing is retried with doubling delays, then given up on until
+    # one of its tracks changes.
+    max_attempts: int = 3
+    retry_backoff_seconds: float = 300.0
+
+
+@dataclass(slots=True)
+class MeetingGroup:
+    directory: Path
+    tracks: list[ParsedTrack]
+
+    @property
+    def key(self) -> str:
+        start = min(track.started_at for track in self.tracks)
+        return f"{self.directory}@{start.isoformat()}"
+
+
+@dataclass(slots=True)
+class _FileState:
+    size: int
+    mtime_ns: int
+    stable_since: float
+
+
+@dataclass(slots=True)
+class _Failure:
+    fingerprint: str
+    attempts: int
+    retry_at: float
+
+
+@dataclass(slots=True)
+class WatchState:
+    path: Path
+    processed: dict[str, str] = field(default_factory=dict)
+    failures: dict[str, _Failure] = field(default_factory=dict)
+    # Meetings finish on the worker pool, so updates and saves are serialized.
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def is_due(self, key: str, group_fingerprint: str, now: float, max_attempts: int) -> bool:
+        with self._lock:
+            if self.processed.get(key) == group_fingerprint:
+                return False
+            failure = self.failures.get(key)
+            if failure is None or failure.fingerprint != group_fingerprint:
+                return True
+            return failure.attempts < max_attempts and now >= failure.retry_at
+
+    def mark_processed(self, key: str, group_fingerprint: str) -> None:
+        with self._lock:
+            self.processed[key] = group_fingerprint
+            self.failures.pop(key, None)
+            self._write()
+
+    def mark_failed(
+        self, key: str, group_fingerprint: str, now: float, backoff_seconds: float
+    ) -> int:
+        with self._lock:
+            previous = self.failures.get(key)
+            attempts = 1
+            if previous is not None and previous.fingerprint == group_fingerprint:
+                attempts = previous.attempts + 1
+            delay = min(MAX_RETRY_BACKOFF_SECONDS, backoff_seconds * 2 ** (attempts - 1))
+            self.failures[key] = _Failure(group_fingerprint, attempts, retry_at=now + delay)
+            self._write()
+            return attempts
+
+    def save(self) -> None:
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        payload = {
+            "processed": self.processed,
+            "failures": {
+                key: {
+                    "fingerprint": failure.fingerprint,
+                    "attempts": failure.attempts,
+                    "retry_at": failure.retry_at,
+                }
+                for key, failure in self.failures.items()
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".tmp_", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, ensure_ascii=False)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+def load_watch_state(output_dir: Path) -> WatchState:
+    path = output_dir / WATCH_STATE_FILE
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        failures = {
+            key: _Failure(
+                fingerprint=str(item["fingerprint"]),
+                attempts=int(item["attempts"]),
+                retry_at=float(item["retry_at"]),
+            )
+            for key, item in data.get("failures", {}).items()
+        }
+    except FileNotFoundError:
+        return WatchState(path=path)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Ignoring unreadable watch state %s: %s", path, exc)
+        return WatchState(path=path)
+    return WatchState(path=path, processed=dict(data.get("processed", {})), failures=failures)
+
+
+class _Inotify:
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watched: set[Path] = set()
+
+    def add(self, directory: Path) -> None:
+        if directory in self._watched:
+            return
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            logger.debug("inotify_add_watch failed for %s: %s", directory, os.strerror(errno))
+            return
+        self._watched.add(directory)
+
+    def wait(self, timeout: float) -> None:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _open_inotify(enabled: bool) -> _Inotify | None:
+    if not enabled or not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError) as exc:
+        logger.info("inotify unavailable, falling back to polling: %s", exc)
+        return None
+
+
+def scan_recordings(root: Path, recording_starter: str | None) -> list[ParsedTrack]:
+    tracks: list[ParsedTrack] = []
+    for path in sorted(root.rglob("*.wav")):
+        if not path.name.startswith(("playback_", "capture_")):
+            continue
+        try:
+            tracks.append(parse_track_filename(path, recording_starter=recording_starter))
+        except ValueError as exc:
+            logger.debug("Skipping %s: %s", path.name, exc)
+    return tracks
+
+
+def _track_end(track: ParsedTrack) -> float:
+    try:
+        info = probe_wav_header(track.path)
+    except OSError:
+        info = None
+    duration = info.duration_seconds if info is not None else 0.0
+    return (track.started_at + timedelta(seconds=duration)).timestamp()
+
+
+def group_meetings(tracks: list[ParsedTrack], gap_seconds: float) -> list[MeetingGroup]:
+    by_directory: dict[Path, list[ParsedTrack]] = {}
+    for track in tracks:
+        by_directory.setdefault(track.path.parent, []).append(track)
+
+    groups: list[MeetingGroup] = []
+    for directory, members in sorted(by_directory.items()):
+        members.sort(key=lambda track: track.started_at)
+        current: list[ParsedTrack] = []
+        current_end = 0.0
+        for track in members:
+            start = track.started_at.timestamp()
+            # Late joiners start mid-meeting, so compare against where the meeting has reached.
+            if current and start - current_end > gap_seconds:
+                groups.append(MeetingGroup(directory=directory, tracks=current))
+                current = []
+            if not current:
+                current_end = start
+            current.append(track)
+            current_end = max(current_end, _track_end(track))
+        if current:
+            groups.append(MeetingGroup(directory=directory, tracks=current))
+    return groups
+
+
+def _group_fingerprint(group: MeetingGroup) -> str:
+    return fingerprint(sorted(file_fingerprint(track.path) for track in group.tracks))
+
+
+def _update_file_states(
+    tracks: list[ParsedTrack],
+    states: dict[Path, _FileState],
+    now: float,
+) -> None:
+    seen: set[Path] = set()
+    for track in tracks:
+        seen.add(track.path)
+        try:
+            stat = track.path.stat()
+        except FileNotFoundError:
+            continue
+        previous = states.get(track.path)
+        if previous is None or (previous.size, previous.mtime_ns) != (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            states[track.path] = _FileState(stat.st_size, stat.st_mtime_ns, stable_since=now)
+    for path in set(states) - seen:
+        del states[path]
+
+
+def _is_settled(
+    group: MeetingGroup,
+    states: dict[Path, _FileState],
+    now: float,
+    settle_seconds: float,
+) -> bool:
+    for track in group.tracks:
+        state = states.get(track.path)
+        if state is None or now - state.stable_since < settle_seconds:
+            return False
+    return True
+
+
+def watch_meetings(
+    root: Path,
+    base_config: PipelineConfig,
+    settings: WatchSettings,
+    stop: threading.Event | None = None,
+) -> None:
+    stop = stop or threading.Event()
+    state = load_watch_state(base_config.output_dir)
+    file_states: dict[Path, _FileState] = {}
+    in_flight: dict[str, Future[Path]] = {}
+    inotify = _open_inotify(settings.use_inotify)
+    logger.info(
+        "Watching %s for TeamSpeak recordings (%s)",
+        root,
+        "inotify" if inotify is not None else f"polling every {settings.poll_interval:.0f}s",
+    )
+    if base_config.asr_mode in ("local", "hybrid"):
+        warm_up_whisper(
+            base_config.whisper_device,
+            whisper_model=base_config.whisper_model,
+            whisper_backend=base_config.whisper_backend,
+        )
+
+    def process(group: MeetingGroup, group_fingerprint: str) -> Path:
+        config = replace(
+            base_config,
+            audio_dir=group.directory,
+            track_paths=[track.path for track in group.tracks],
+        )
+        logger.info("Processing meeting %s (%d track(s))", group.key, len(group.tracks))
+        try:
+            output_path = run_pipeline(config)
+        except Exception:
+            attempts = state.mark_failed(
+                group.key, group_fingerprint, time.time(), settings.retry_backoff_seconds
+            )
+            if attempts >= settings.max_attempts:
+                logger.error(
+                    "Giving up on meeting %s after %d attempt(s) until its tracks change",
+                    group.key,
+                    attempts,
+                )
+            raise
+        state.mark_processed(group.key, group_fingerprint)
+        return output_path
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, settings.meeting_workers), thread_name_prefix="meeting"
+    ) as executor:
+        try:
+            while not stop.is_set():
+                if inotify is not None:
+                    inotify.add(root)
+                    for directory in root.rglob("*"):
+                        if directory.is_dir():
+                            inotify.add(directory)
+
+                for key, future in list(in_flight.items()):
+                    if future.done():
+                        del in_flight[key]
+                        if future.exception() is not None:
+                            logger.error("Meeting %s failed: %s", key, future.exception())
+                        else:
+                            logger.info("Meeting %s written to %s", key, future.result())
+
+                now = time.monotonic()
+                tracks = scan_recordings(root, base_config.recording_starter)
+                _update_file_states(tracks, file_states, now)
+                for group in group_meetings(tracks, settings.meeting_gap_seconds):
+                    if group.key in in_flight:
+                        continue
+                    if not _is_settled(group, file_states, now, settings.settle_seconds):
+                        continue
+                    group_fingerprint = _group_fingerprint(group)
+                    if not state.is_due(
+                        group.key, group_fingerprint, time.time(), settings.max_attempts
+                    ):
+                        continue
+                    in_flight[group.key] = executor.submit(process, group, group_fingerprint)
+
+                if inotify is not None:
+                    # Events only wake us early; settling still needs periodic rescans.
+                    inotify.wait(settings.poll_interval)
+                else:
+                    stop.wait(settings.poll_interval)
+        finally:
+            if inotify is not None:
+                inotify.close()
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from teamspeak_meeting_notes.analytics import timeline_stats
+from teamspeak_meeting_notes.models import TimelineUtterance
+
+BASE = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+
+
+def _row(speaker: str, start: float, end: float) -> TimelineUtterance:
+    return TimelineUtterance(
+        speaker_name=speaker,
+        start_at=BASE + timedelta(seconds=start),
+        end_at=BASE + timedelta(seconds=end),
+        text="",
+        source_file=Path(f"{speaker}.wav"),
+    )
+
+
+def test_timeline_stats_measures_talk_overlap_interruptions_and_gaps() -> None:
+    rows = [
+        _row("A", 0.0, 10.0),
+        # A's own overlapping segment counts once.
+        _row("A", 5.0, 12.0),
+        # B starts while A is still talking: 4s of overlap and one interruption.
+        _row("B", 8.0, 20.0),
+        # Back-to-back with B is neither overlap nor an interruption.
+        _row("C", 20.0, 25.0),
+        _row("A", 100.0, 110.0),
+    ]
+
+    stats = timeline_stats(rows, window_seconds=30.0)
+
+    assert [(s.name, s.talk_seconds, s.utterances) for s in stats.speakers] == [
+        ("A", 22.0, 3),
+        ("B", 12.0, 1),
+        ("C", 5.0, 1),
+    ]
+    assert stats.overlap_seconds == pytest.approx(4.0)
+    assert [s.overlap_seconds for s in stats.speakers] == pytest.approx([4.0, 4.0, 0.0])
+    assert [s.interruptions for s in stats.speakers] == [0, 1, 0]
+    assert stats.speech_seconds == pytest.approx(35.0)
+    assert stats.duration_seconds == pytest.approx(110.0)
+    assert (stats.gaps, stats.longest_gap_seconds, stats.long_gaps) == (1, 75.0, 1)
+
+    first, second = stats.peaks
+    assert first.start_at == BASE
+    assert first.talk_seconds == pytest.approx(29.0)
+    assert first.speakers == [("A", 12.0), ("B", 12.0), ("C", 5.0)]
+    assert first.rows.tolist() == [0, 1, 2, 3]
+    assert second.talk_seconds == pytest.approx(10.0)
+    assert second.rows.tolist() == [4]
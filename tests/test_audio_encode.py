@@ -0,0 +1,53 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from teamspeak_meeting_notes import audio_encode
+from teamspeak_meeting_notes.audio_encode import build_encode_command, encoded_for_upload
+from teamspeak_meeting_notes.models import AudioInfo
+
+
+def test_build_encode_command_downmixes_to_mono_16k() -> None:
+    cmd = build_encode_command(Path("in.wav"), Path("out.flac"), "flac")
+
+    assert cmd[:2] == ["ffmpeg", "-y"]
+    assert cmd[cmd.index("-ac") + 1] == "1"
+    assert cmd[cmd.index("-ar") + 1] == "16000"
+    assert cmd[cmd.index("-c:a") + 1] == "flac"
+    assert cmd[-1] == "out.flac"
+
+
+def test_encoded_for_upload_skips_small_inputs(tmp_path: Path) -> None:
+    path = tmp_path / "short.wav"
+    path.write_bytes(b"\x00" * 2048)
+
+    with encoded_for_upload(path, "flac") as upload:
+        assert upload.path == path
+        assert upload.encoded_bytes == upload.original_bytes == 2048
+
+    path.write_bytes(b"\x00" * 300_000)
+    pcm = AudioInfo(duration_seconds=9.4, sample_rate=16000, channels=1)
+    with encoded_for_upload(path, "flac", info=pcm, min_bytes=200_000) as upload:
+        assert upload.path == path
+
+
+def test_encoded_for_upload_encodes_short_but_large_inputs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "chunk.wav"
+    path.write_bytes(b"\x00" * 300_000)
+    commands: list[list[str]] = []
+
+    def fake_ffmpeg(cmd: list[str], **_: object) -> subprocess.CompletedProcess[str]:
+        commands.append(cmd)
+        Path(cmd[-1]).write_bytes(b"\x00" * 2000)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(audio_encode.subprocess, "run", fake_ffmpeg)
+    # A few seconds of 48 kHz stereo: short, but far bigger than its opus encode.
+    short = AudioInfo(duration_seconds=5.0, sample_rate=48000, channels=2)
+    with encoded_for_upload(path, "opus", info=short, min_bytes=200_000) as upload:
+        assert len(commands) == 1
+        assert upload.path != path
+        assert (upload.original_bytes, upload.encoded_bytes) == (300_000, 2000)
@@ -0,0 +1,87 @@
+import struct
+import wave
+from pathlib import Path
+
+from teamspeak_meeting_notes import audio_probe
+from teamspeak_meeting_notes.audio_probe import probe_audios, probe_wav_header
+from teamspeak_meeting_notes.models import AudioInfo
+
+
+def _chunk(chunk_id: bytes, body: bytes) -> bytes:
+    pad = b"\x00" if len(body) % 2 else b""
+    return chunk_id + struct.pack("<I", len(body)) + body + pad
+
+
+def _riff(*chunks: bytes) -> bytes:
+    payload = b"WAVE" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(payload)) + payload
+
+
+def test_probe_wav_header_reads_pcm_written_by_wave_module(tmp_path: Path) -> None:
+    path = tmp_path / "capture.wav"
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(2)
+        writer.setsampwidth(2)
+        writer.setframerate(48000)
+        writer.writeframes(b"\x00\x00\x00\x00" * 24000)
+
+    info = probe_wav_header(path)
+
+    assert info == AudioInfo(duration_seconds=0.5, sample_rate=48000, channels=2)
+
+
+def test_probe_wav_header_handles_extensible_and_odd_chunks(tmp_path: Path) -> None:
+    fmt = struct.pack("<HHIIHH", 0xFFFE, 1, 16000, 64000, 4, 32)
+    fmt += struct.pack("<HHI", 22, 32, 0x4) + struct.pack("<H", 3) + b"\x00" * 14
+    path = tmp_path / "float.wav"
+    path.write_bytes(
+        _riff(
+            _chunk(b"LIST", b"INFOodd"),
+            _chunk(b"fmt ", fmt),
+            _chunk(b"junk", b"x"),
+            _chunk(b"data", b"\x00" * 64000),
+        )
+    )
+
+    info = probe_wav_header(path)
+
+    assert info == AudioInfo(duration_seconds=1.0, sample_rate=16000, channels=1)
+
+
+def test_probe_wav_header_uses_file_size_for_unfinished_recordings(tmp_path: Path) -> None:
+    fmt = struct.pack("<HHIIHH", 1, 1, 8000, 16000, 2, 16)
+    path = tmp_path / "growing.wav"
+    path.write_bytes(
+        b"RIFF"
+        + struct.pack("<I", 0)
+        + b"WAVE"
+        + _chunk(b"fmt ", fmt)
+        + b"data"
+        + struct.pack("<I", 0)
+        + b"\x00" * 4000
+    )
+
+    assert probe_wav_header(path) == AudioInfo(duration_seconds=0.25, sample_rate=8000, channels=1)
+
+
+def test_probe_audios_falls_back_to_ffprobe_for_other_formats(monkeypatch, tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    with wave.open(str(wav), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(8000)
+        writer.writeframes(b"\x00\x00" * 8000)
+    other = tmp_path / "b.mka"
+    other.write_bytes(b"not a wav")
+    probed: list[str] = []
+
+    def fake_ffprobe(path: Path) -> AudioInfo:
+        probed.append(path.name)
+        return AudioInfo(duration_seconds=3.0, sample_rate=48000, channels=2)
+
+    monkeypatch.setattr(audio_probe, "probe_audio_ffprobe", fake_ffprobe)
+
+    infos = probe_audios([wav, other])
+
+    assert [info.duration_seconds for info in infos] == [1.0, 3.0]
+    assert probed == ["b.mka"]
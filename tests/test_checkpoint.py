@@ -0,0 +1,97 @@
+from datetime import datetime
+from pathlib import Path
+
+from teamspeak_meeting_notes import pipeline
+from teamspeak_meeting_notes.checkpoint import open_checkpoints, utterances_to_json
+from teamspeak_meeting_notes.models import ParsedTrack, TimelineUtterance, TranscriptSegment
+
+
+def test_checkpoints_round_trip_only_when_resuming(tmp_path: Path) -> None:
+    store = open_checkpoints(tmp_path / "out", tmp_path / "voice_record", resume=False)
+    store.save("summary", "fp-1", "会议助手00:18 已完成")
+
+    resumed = open_checkpoints(tmp_path / "out", tmp_path / "voice_record", resume=True)
+    assert resumed.load("summary", "fp-1") == "会议助手00:18 已完成"
+    assert resumed.load("summary", "fp-2") is None
+
+    fresh = open_checkpoints(tmp_path / "out", tmp_path / "voice_record", resume=False)
+    assert fresh.load("summary", "fp-1") is None
+
+
+def test_timeline_checkpoint_lives_in_a_columnar_side_file(tmp_path: Path) -> None:
+    base = datetime.strptime("2026-02-23_00-18-10.090000", "%Y-%m-%d_%H-%M-%S.%f")
+    rows = [
+        TimelineUtterance(
+            speaker_name="A",
+            start_at=base,
+            end_at=base.replace(second=12),
+            text="开始",
+            source_file=Path("a.wav"),
+        )
+    ]
+    store = open_checkpoints(tmp_path / "out", tmp_path / "voice_record", resume=False)
+    store.save_timeline("timeline", "fp-1", rows)
+
+    assert store.stages["timeline"]["data"] == {
+        "file": f"{store.path.stem}.timeline.columns",
+        "count": 1,
+    }
+    resumed = open_checkpoints(tmp_path / "out", tmp_path / "voice_record", resume=True)
+    assert resumed.load_timeline("timeline", "fp-1") == rows
+    assert resumed.load_timeline("timeline", "fp-2") is None
+
+    # Manifests from before the side file kept the timeline inline.
+    resumed.save("timeline", "fp-3", utterances_to_json(rows))
+    assert resumed.load_timeline("timeline", "fp-3") == rows
+
+
+def test_segment_checkpoints_keep_the_manifest_small(tmp_path: Path) -> None:
+    store = open_checkpoints(tmp_path / "out", tmp_path / "voice_record", resume=False)
+    rows = [{"start": 0.0, "end": 1.0, "text": "很长的一段话" * 100}]
+    for index in range(20):
+        store.save_external(f"segments:{index}.wav", f"fp-{index}", rows)
+
+    manifest = store.path.read_text(encoding="utf-8")
+    assert "很长的一段话" not in manifest
+    assert len(manifest) < 3000
+    resumed = open_checkpoints(tmp_path / "out", tmp_path / "voice_record", resume=True)
+    assert resumed.load("segments:7.wav", "fp-7") == rows
+    assert resumed.load("segments:7.wav", "fp-8") is None
+
+    store.path.with_name(resumed.stages["segments:7.wav"]["file"]).unlink()
+    assert resumed.load("segments:7.wav", "fp-7") is None
+
+
+def test_resume_skips_finished_tracks_and_redoes_failed_ones(monkeypatch, tmp_path: Path) -> None:
+    base = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+    tracks = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.wav"
+        path.write_bytes(name.encode())
+        tracks.append(
+            ParsedTrack(
+                path=path, kind="playback", speaker_name=name, speaker_id="1", started_at=base
+            )
+        )
+    calls: list[str] = []
+
+    def flaky_transcribe(path: Path, **_: object) -> list[TranscriptSegment]:
+        calls.append(path.name)
+        text = "[ASR unavailable for b.wav: timeout]" if len(calls) == 2 else path.stem
+        return [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text=text)]
+
+    monkeypatch.setattr(pipeline, "transcribe_audio", flaky_transcribe)
+
+    for resume in (False, True):
+        store = open_checkpoints(tmp_path / "out", tmp_path, resume=resume)
+        result = pipeline._build_track_segments(
+            tracks,
+            asr_mode="local",
+            whisper_device="cpu",
+            language=None,
+            checkpoints=store,
+            asr_fingerprint="local/turbo",
+        )
+
+    assert calls == ["a.wav", "b.wav", "b.wav"]
+    assert [segments[0].text for _, segments in result] == ["a", "b"]
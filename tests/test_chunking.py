@@ -0,0 +1,89 @@
+import wave
+from pathlib import Path
+
+from teamspeak_meeting_notes.chunking import (
+    AudioChunk,
+    ChunkSettings,
+    plan_chunks,
+    stitch_segments,
+    transcribe_chunked,
+)
+from teamspeak_meeting_notes.models import TranscriptSegment
+
+
+def test_plan_chunks_overlaps_and_covers_duration() -> None:
+    chunks = plan_chunks(250.0, chunk_seconds=100.0, overlap_seconds=10.0)
+
+    assert [(c.start_seconds, c.end_seconds) for c in chunks] == [
+        (0.0, 100.0),
+        (90.0, 190.0),
+        (180.0, 250.0),
+    ]
+    assert len(plan_chunks(80.0, chunk_seconds=100.0, overlap_seconds=10.0)) == 1
+
+
+def test_stitch_segments_drops_duplicates_in_overlap() -> None:
+    first = AudioChunk(index=0, start_seconds=0.0, end_seconds=100.0)
+    second = AudioChunk(index=1, start_seconds=90.0, end_seconds=190.0)
+
+    stitched = stitch_segments(
+        [
+            (
+                first,
+                [
+                    TranscriptSegment(start_seconds=10.0, end_seconds=12.0, text="hello"),
+                    TranscriptSegment(start_seconds=93.0, end_seconds=96.0, text="boundary"),
+                    TranscriptSegment(start_seconds=98.0, end_seconds=100.0, text="cut"),
+                ],
+            ),
+            (
+                second,
+                [
+                    TranscriptSegment(start_seconds=3.0, end_seconds=6.0, text="boundary"),
+                    TranscriptSegment(start_seconds=8.0, end_seconds=11.0, text="cut off, fixed"),
+                    TranscriptSegment(start_seconds=20.0, end_seconds=22.0, text="later"),
+                ],
+            ),
+        ]
+    )
+
+    assert [(s.start_seconds, s.text) for s in stitched] == [
+        (10.0, "hello"),
+        (93.0, "boundary"),
+        (98.0, "cut off, fixed"),
+        (110.0, "later"),
+    ]
+
+
+def test_transcribe_chunked_retries_only_failed_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "capture.wav"
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(1000)
+        writer.writeframes(b"\x00\x00" * 25_000)
+
+    calls: list[str] = []
+
+    def fake_transcribe(chunk_path: Path) -> list[TranscriptSegment]:
+        calls.append(chunk_path.name)
+        if chunk_path.name.endswith("chunk0001.wav") and calls.count(chunk_path.name) == 1:
+            raise RuntimeError("transient")
+        return [TranscriptSegment(start_seconds=1.0, end_seconds=2.0, text=chunk_path.stem)]
+
+    chunks = plan_chunks(25.0, chunk_seconds=10.0, overlap_seconds=1.0)
+    segments, complete = transcribe_chunked(
+        path,
+        chunks,
+        transcribe_chunk=fake_transcribe,
+        settings=ChunkSettings(chunk_seconds=10.0, overlap_seconds=1.0, workers=1),
+    )
+
+    assert complete
+    assert sorted(calls) == [
+        "capture.chunk0000.wav",
+        "capture.chunk0001.wav",
+        "capture.chunk0001.wav",
+        "capture.chunk0002.wav",
+    ]
+    assert [s.start_seconds for s in segments] == [1.0, 10.0, 19.0]
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import openai
+import pytest
+
+from teamspeak_meeting_notes.clients import RequestLimiter, RetryPolicy, with_retries
+
+
+def test_with_retries_backs_off_on_transient_errors_only() -> None:
+    failures = [openai.APIConnectionError(request=None), TimeoutError("read timed out")]
+    delays: list[float] = []
+
+    def flaky() -> str:
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    policy = RetryPolicy(max_attempts=4, base_delay_seconds=1.0, max_delay_seconds=1.5)
+    assert with_retries(flaky, "test", policy=policy, sleep=delays.append) == "ok"
+    assert len(delays) == 2
+    assert 0.0 <= delays[0] <= 1.0
+    assert 0.0 <= delays[1] <= 1.5
+
+    calls = 0
+
+    def broken() -> str:
+        nonlocal calls
+        calls += 1
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        with_retries(broken, "test", policy=policy, sleep=delays.append)
+    assert calls == 1
+
+
+def test_request_limiter_caps_concurrency_and_token_rate() -> None:
+    limiter = RequestLimiter(max_concurrency=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def call() -> None:
+        nonlocal active, peak
+        with limiter.slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+
+    now = 0.0
+    slept: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        nonlocal now
+        slept.append(seconds)
+        now += seconds
+
+    limiter = RequestLimiter(
+        max_concurrency=1, tokens_per_minute=600, clock=lambda: now, sleep=sleep
+    )
+    with limiter.slot(tokens=500):
+        pass
+    assert slept == []
+    # 100 tokens left; 300 more need 200 tokens refilled at 10 tokens/s.
+    with limiter.slot(tokens=300):
+        pass
+    assert slept == [pytest.approx(20.0)]
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from teamspeak_meeting_notes.columnar import ColumnarTimeline
+from teamspeak_meeting_notes.models import TimelineUtterance
+
+BASE = datetime.strptime("2026-02-23_00-18-10.090000", "%Y-%m-%d_%H-%M-%S.%f")
+
+
+def _rows() -> list[TimelineUtterance]:
+    return [
+        TimelineUtterance(
+            speaker_name=speaker,
+            start_at=BASE + timedelta(milliseconds=1500 * index),
+            end_at=BASE + timedelta(milliseconds=1500 * index + 1200),
+            text=text,
+            source_file=Path(f"playback_{speaker}.wav"),
+        )
+        for index, (speaker, text) in enumerate(
+            [("张三", "大家好"), ("Bob", "hello"), ("张三", ""), ("Bob", "下周 follow up")]
+        )
+    ]
+
+
+def test_columnar_timeline_round_trips_through_a_mapped_file(tmp_path: Path) -> None:
+    rows = _rows()
+    timeline = ColumnarTimeline.from_utterances(rows)
+
+    assert timeline.speakers == ["张三", "Bob"]
+    assert timeline.speaker.tolist() == [0, 1, 0, 1]
+    assert len(timeline.sources) == 2
+
+    path = tmp_path / "meeting.timeline"
+    timeline.save(path)
+    loaded = ColumnarTimeline.load(path)
+
+    assert len(loaded) == 4
+    assert loaded.text_at(3) == "下周 follow up"
+    assert np.array_equal(loaded.start_ms, timeline.start_ms)
+    # Columns are read-only views of the file, not parsed copies.
+    assert not loaded.start_ms.flags.writeable
+    assert loaded.to_utterances() == rows
+
+
+def test_columnar_timeline_rejects_foreign_files_and_handles_empty(tmp_path: Path) -> None:
+    path = tmp_path / "empty.timeline"
+    ColumnarTimeline.from_utterances([]).save(path)
+    assert ColumnarTimeline.load(path).to_utterances() == []
+
+    other = tmp_path / "other.timeline"
+    other.write_bytes(b"not a timeline")
+    with pytest.raises(ValueError):
+        ColumnarTimeline.load(other)
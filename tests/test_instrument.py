@@ -0,0 +1,51 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from teamspeak_meeting_notes.instrument import in_current_context, recording, span
+
+
+def test_spans_nest_across_thread_pools_and_roll_up_into_the_report(tmp_path: Path) -> None:
+    def transcribe(name: str) -> None:
+        with span("asr", file=name, audio_seconds=10.0):
+            with span("cloud_asr.request", bytes_uploaded=1000):
+                pass
+
+    with recording() as recorder:
+        with span("stage", stage="asr") as stage:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(in_current_context(transcribe), ["a.wav", "b.wav"]))
+        try:
+            with span("asr", audio_seconds=99.0):
+                raise RuntimeError("failed attempt")
+        except RuntimeError:
+            pass
+
+    by_id = {item.span_id: item for item in recorder.spans}
+    requests = [item for item in recorder.spans if item.name == "cloud_asr.request"]
+    assert len(requests) == 2
+    for request in requests:
+        parent = by_id[request.parent_id]
+        assert parent.name == "asr"
+        assert parent.parent_id == stage.span_id
+
+    report = recorder.report(meeting="m")
+    assert report["meeting"] == "m"
+    assert report["bytes_uploaded"] == 2000
+    assert report["audio_seconds"] == 20.0
+    assert report["by_name"]["asr"]["count"] == 3
+    assert report["peak_rss_bytes"] is None or report["peak_rss_bytes"] > 0
+
+    trace_path = tmp_path / "trace.jsonl"
+    recorder.export_spans(trace_path)
+    (line,) = trace_path.read_text(encoding="utf-8").splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert {item["traceId"] for item in spans} == {recorder.trace_id}
+    assert sum("parentSpanId" in item for item in spans) == 4
+
+
+def test_span_outside_a_recording_is_a_no_op() -> None:
+    with span("probe", file="a.wav") as probe:
+        probe.set(duration_seconds=1.0)
+
+    assert probe.wall_seconds == 0.0
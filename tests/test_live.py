@@ -0,0 +1,96 @@
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from teamspeak_meeting_notes import live
+from teamspeak_meeting_notes.live import LiveSession, LiveSettings
+from teamspeak_meeting_notes.models import TranscriptSegment
+from teamspeak_meeting_notes.pipeline import PipelineConfig
+
+SAMPLE_RATE = 8000
+TRACK_NAME = "playback_A_1_2026-02-23_10-00-00.000000.wav"
+
+
+def _pcm(speech: list[tuple[float, float]], duration: float) -> bytes:
+    samples = np.zeros(int(duration * SAMPLE_RATE), dtype=np.float32)
+    samples += np.random.default_rng(0).normal(0.0, 0.0005, size=samples.shape).astype(np.float32)
+    for start, end in speech:
+        t = np.arange(int((end - start) * SAMPLE_RATE)) / SAMPLE_RATE
+        begin = int(start * SAMPLE_RATE)
+        samples[begin : begin + len(t)] += 0.3 * np.sin(2 * np.pi * 220 * t)
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def _start_recording(path: Path) -> None:
+    # TeamSpeak-style header of a file that is still being written: sizes are not filled in yet.
+    fmt = struct.pack("<HHIIHH", 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+    header = b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+    header += b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    header += b"data" + struct.pack("<I", 0xFFFFFFFF)
+    path.write_bytes(header)
+
+
+def _config(tmp_path: Path) -> PipelineConfig:
+    return PipelineConfig(
+        audio_dir=tmp_path / "rec",
+        recording_starter=None,
+        output_dir=tmp_path / "out",
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="cloud",
+        whisper_device="auto",
+        language=None,
+        meeting_title=None,
+    )
+
+
+def test_live_session_transcribes_growing_track_at_pauses(monkeypatch, tmp_path: Path) -> None:
+    (tmp_path / "rec").mkdir()
+    path = tmp_path / "rec" / TRACK_NAME
+    _start_recording(path)
+    sent: list[float] = []
+
+    def fake_transcribe(window_path: Path, **_: object) -> list[TranscriptSegment]:
+        seconds = (window_path.stat().st_size - 44) / 2 / SAMPLE_RATE
+        sent.append(seconds)
+        return [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text=f"w{len(sent)}")]
+
+    monkeypatch.setattr(live, "transcribe_audio", fake_transcribe)
+    settings = LiveSettings(window_seconds=20.0, max_window_seconds=60.0)
+    # Speech until 12s, a 1.5s pause, then speech again until 30s.
+    audio = _pcm([(0.0, 12.0), (13.5, 30.0)], duration=30.0)
+
+    session = LiveSession(_config(tmp_path), settings)
+    session.discover()
+    (tail,) = session.tails.values()
+
+    with path.open("ab") as handle:
+        handle.write(audio[: 10 * SAMPLE_RATE * 2])
+    assert session.advance(tail) is False
+
+    with path.open("ab") as handle:
+        handle.write(audio[10 * SAMPLE_RATE * 2 :])
+    assert session.advance(tail) is True
+    assert len(sent) == 1
+    assert 12.0 < sent[0] < 13.5
+
+    session.advance(tail, final=True)
+    assert len(sent) == 2
+    assert sent[0] + sent[1] == 30.0
+    assert [seg.start_seconds for seg in tail.segments] == [0.0, sent[0]]
+
+    resumed = LiveSession(_config(tmp_path), settings)
+    resumed.discover()
+    (restored,) = resumed.tails.values()
+    assert restored.committed_bytes == tail.committed_bytes
+    assert [seg.text for seg in restored.segments] == ["w1", "w2"]
+
+
+def test_find_silence_cut_ignores_pauses_before_earliest_frame() -> None:
+    speech = np.array([True] * 5 + [False] * 4 + [True] * 20 + [False] * 2 + [True] * 3)
+
+    assert live.find_silence_cut(speech, min_silence_frames=3) == 7
+    assert live.find_silence_cut(speech, min_silence_frames=2) == 30
+    assert live.find_silence_cut(speech, min_silence_frames=3, earliest_frame=10) is None
@@ -0,0 +1,72 @@
+import wave
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from teamspeak_meeting_notes.mixdown import attribute_segments, build_mix_command, track_levels
+from teamspeak_meeting_notes.models import ParsedTrack, TranscriptSegment
+
+START = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+
+
+def _track(path: Path, name: str, offset_seconds: float) -> ParsedTrack:
+    return ParsedTrack(
+        path=path,
+        kind="playback",
+        speaker_name=name,
+        speaker_id="1",
+        started_at=START + timedelta(seconds=offset_seconds),
+    )
+
+
+def _write_tone(path: Path, sample_rate: int, seconds: float, loud: tuple[float, float]) -> None:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    level = np.where((t >= loud[0]) & (t < loud[1]), 0.3, 0.001)
+    samples = level * np.sin(2 * np.pi * 220.0 * t)
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes((samples * 32767).astype("<i2").tobytes())
+
+
+def test_build_mix_command_delays_each_track_by_its_start_offset() -> None:
+    tracks = [
+        _track(Path("a.wav"), "A", 0.0),
+        _track(Path("b.wav"), "B", 1.5),
+    ]
+
+    cmd = build_mix_command(tracks, Path("out/mix.wav"))
+
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "[0:a]aformat=channel_layouts=mono,aresample=16000,adelay=0:all=1[a0]" in graph
+    assert "adelay=1500:all=1[a1]" in graph
+    assert graph.endswith("[a0][a1]amix=inputs=2:duration=longest:normalize=0[mix]")
+    assert cmd[-1] == "out/mix.wav"
+
+
+def test_segments_go_to_the_loudest_track_in_track_relative_time(tmp_path: Path) -> None:
+    first = tmp_path / "a.wav"
+    second = tmp_path / "b.wav"
+    _write_tone(first, 16000, 5.0, loud=(0.0, 2.0))
+    # Different sample rate and a later start: loud from 3s to 5s of meeting time.
+    _write_tone(second, 48000, 4.0, loud=(2.0, 4.0))
+    tracks = [_track(first, "A", 0.0), _track(second, "B", 1.0)]
+
+    levels = track_levels(tracks)
+    result = attribute_segments(
+        [
+            TranscriptSegment(start_seconds=0.2, end_seconds=1.8, text="hello"),
+            TranscriptSegment(start_seconds=3.2, end_seconds=4.5, text="world"),
+        ],
+        tracks,
+        levels,
+    )
+
+    assert levels.track_seconds == 9.0
+    assert [segment.text for segment in result[0][1]] == ["hello"]
+    (moved,) = result[1][1]
+    assert moved.text == "world"
+    assert (moved.start_seconds, moved.end_seconds) == pytest.approx((2.2, 3.5))
@@ -0,0 +1,296 @@
+import contextlib
+import json
+import threading
+import time
+import wave
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from teamspeak_meeting_notes import cli, pipeline
+from teamspeak_meeting_notes.checkpoint import open_checkpoints
+from teamspeak_meeting_notes.models import ParsedTrack, TranscriptSegment
+
+
+def _track(name: str, started_at: datetime) -> ParsedTrack:
+    return ParsedTrack(
+        path=Path(f"{name}.wav"),
+        kind="playback",
+        speaker_name=name,
+        speaker_id="1",
+        started_at=started_at,
+    )
+
+
+def test_build_track_segments_keeps_input_order_when_concurrent(monkeypatch) -> None:
+    base = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+    tracks = [_track(name, base) for name in ("A", "B", "C", "D")]
+    delays = {"A.wav": 0.05, "B.wav": 0.0, "C.wav": 0.03, "D.wav": 0.01}
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_transcribe(path: Path, **_: object) -> list[TranscriptSegment]:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(delays[path.name])
+        with lock:
+            active -= 1
+        return [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text=path.stem)]
+
+    monkeypatch.setattr(pipeline, "transcribe_audio", fake_transcribe)
+
+    result = pipeline._build_track_segments(
+        tracks,
+        asr_mode="local",
+        whisper_device="cpu",
+        language=None,
+        asr_workers=2,
+    )
+
+    assert [track.speaker_name for track, _ in result] == ["A", "B", "C", "D"]
+    assert [segments[0].text for _, segments in result] == ["A", "B", "C", "D"]
+    assert peak <= 2
+
+
+def test_stream_note_finalises_partial_output_before_fallback(
+    monkeypatch, tmp_path: Path, capsys
+) -> None:
+    def broken_stream(**kwargs: object) -> str:
+        on_delta = kwargs["on_delta"]
+        on_delta("会议助手00:18 ")
+        on_delta("讨论")
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(pipeline, "summarize_hierarchical", broken_stream)
+    monkeypatch.setattr(pipeline, "summarize_heuristic", lambda **_: "综合观察 启发式")
+    config = pipeline.PipelineConfig(
+        audio_dir=tmp_path,
+        recording_starter=None,
+        output_dir=tmp_path,
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="local",
+        whisper_device="cpu",
+        language=None,
+        meeting_title=None,
+        stream_summary=True,
+    )
+    output_path = tmp_path / "note.md"
+
+    pipeline._stream_note(config, [], output_path)
+
+    note = output_path.read_text(encoding="utf-8")
+    assert note.startswith("会议助手00:18 讨论\n\n")
+    assert note.endswith("综合观察 启发式\n")
+    assert capsys.readouterr().out == note
+
+
+def test_run_batch_reports_each_meeting_and_shares_the_asr_queue(
+    monkeypatch, tmp_path: Path
+) -> None:
+    for meeting in ("good", "bad"):
+        path = tmp_path / meeting / "playback_A_1_2026-02-23_10-00-00.000000.wav"
+        path.parent.mkdir()
+        with wave.open(str(path), "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(8000)
+            writer.writeframes(b"\x00\x00" * 8000)
+    (tmp_path / "empty").mkdir()
+    limits_seen: set[int] = set()
+
+    def fake_transcribe(path: Path, **kwargs: object) -> list[TranscriptSegment]:
+        limits_seen.add(id(kwargs["limits"]))
+        if path.parent.name == "bad":
+            raise RuntimeError("decoder exploded")
+        return [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text="hi")]
+
+    monkeypatch.setattr(pipeline, "ensure_ffmpeg_tools", lambda: None)
+    monkeypatch.setattr(pipeline, "transcribe_audio", fake_transcribe)
+    monkeypatch.setattr(pipeline, "_render_note", lambda config, utterances: ("note", True))
+    config = pipeline.PipelineConfig(
+        audio_dir=tmp_path,
+        recording_starter=None,
+        output_dir=tmp_path / "out",
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="cloud",
+        whisper_device="cpu",
+        language=None,
+        meeting_title=None,
+        use_cache=False,
+    )
+    report_path = tmp_path / "report.json"
+
+    results = pipeline.run_batch(
+        config, [tmp_path / "good", tmp_path / "bad", tmp_path / "empty"], report_path
+    )
+
+    assert [result.ok for result in results] == [True, False, False]
+    assert results[0].output_path is not None and results[0].output_path.exists()
+    assert "decoder exploded" in (results[1].error or "")
+    assert len(limits_seen) == 1
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert [row["status"] for row in report["meetings"]] == ["ok", "failed", "failed"]
+    assert (report["succeeded"], report["failed"]) == (1, 2)
+
+    # One --bundle-path for every meeting would make their bundle stages overwrite each other.
+    with pytest.raises(ValueError, match="bundle_path"):
+        pipeline.run_batch(replace(config, bundle_path=tmp_path / "all.mka"), [tmp_path / "good"])
+    with pytest.raises(SystemExit):
+        cli._run_batch([str(tmp_path / "good"), "--bundle-path", str(tmp_path / "all.mka")])
+
+
+def test_chunk_overlap_is_rejected_before_any_stage_runs(monkeypatch, tmp_path: Path) -> None:
+    with pytest.raises(SystemExit):
+        cli._parse_pipeline_args(
+            cli._build_batch_parser(),
+            ["meetings", "--chunk-seconds", "10", "--chunk-overlap", "10"],
+        )
+    args = cli._parse_pipeline_args(cli._build_parser(), ["--chunk-seconds", "0"])
+    assert args.chunk_seconds == 0
+
+    path = tmp_path / "playback_A_1_2026-02-23_10-00-00.000000.wav"
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(8000)
+        writer.writeframes(b"\x00\x00" * 8000 * 30)
+    stages_run: list[object] = []
+    monkeypatch.setattr(pipeline, "ensure_ffmpeg_tools", lambda: None)
+    monkeypatch.setattr(pipeline, "run_stages", lambda *args, **kwargs: stages_run.append(args))
+    config = pipeline.PipelineConfig(
+        audio_dir=tmp_path,
+        recording_starter=None,
+        output_dir=tmp_path / "out",
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="cloud",
+        whisper_device="cpu",
+        language=None,
+        meeting_title=None,
+        use_cache=False,
+        chunk_seconds=10.0,
+        chunk_overlap_seconds=10.0,
+    )
+
+    with pytest.raises(ValueError, match="Chunk overlap"):
+        pipeline.run_pipeline(config)
+    assert stages_run == []
+
+
+def test_mixdown_strategy_transcribes_once_and_attributes_by_energy(
+    monkeypatch, tmp_path: Path
+) -> None:
+    audio_dir = tmp_path / "meeting"
+    audio_dir.mkdir()
+    for name, loud_frames in (
+        ("playback_A_1_2026-02-23_10-00-00.000000.wav", range(0, 8000)),
+        ("playback_B_2_2026-02-23_10-00-01.000000.wav", range(8000, 16000)),
+    ):
+        samples = bytearray(b"\x01\x00" * 16000)
+        for frame in loud_frames:
+            # A square wave well above the quiet floor.
+            samples[frame * 2 : frame * 2 + 2] = (8000 if frame % 20 < 10 else -8000).to_bytes(
+                2, "little", signed=True
+            )
+        with wave.open(str(audio_dir / name), "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(8000)
+            writer.writeframes(bytes(samples))
+    transcribed: list[str] = []
+
+    @contextlib.contextmanager
+    def fake_mix(tracks: list[ParsedTrack]):
+        yield tmp_path / "mixdown.wav"
+
+    def fake_transcribe(path: Path, **_: object) -> list[TranscriptSegment]:
+        transcribed.append(path.name)
+        return [
+            TranscriptSegment(start_seconds=0.1, end_seconds=0.9, text="from A"),
+            TranscriptSegment(start_seconds=2.1, end_seconds=2.9, text="from B"),
+        ]
+
+    monkeypatch.setattr(pipeline, "ensure_ffmpeg_tools", lambda: None)
+    monkeypatch.setattr(pipeline, "mixed_audio", fake_mix)
+    monkeypatch.setattr(pipeline, "transcribe_audio", fake_transcribe)
+    monkeypatch.setattr(pipeline, "_render_note", lambda config, utterances: ("note", True))
+    config = pipeline.PipelineConfig(
+        audio_dir=audio_dir,
+        recording_starter=None,
+        output_dir=tmp_path / "out",
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="cloud",
+        whisper_device="cpu",
+        language=None,
+        meeting_title=None,
+        use_cache=False,
+        asr_strategy="mixdown",
+    )
+
+    output_path = pipeline.run_pipeline(config)
+
+    assert transcribed == ["mixdown.wav"]
+    store = open_checkpoints(tmp_path / "out", audio_dir, resume=True)
+    entry = store.stages["segments:mixdown"]
+    saved = store.load("segments:mixdown", entry["fingerprint"])
+    assert [row["text"] for row in saved["playback_A_1_2026-02-23_10-00-00.000000.wav"]] == [
+        "from A"
+    ]
+    (from_b,) = saved["playback_B_2_2026-02-23_10-00-01.000000.wav"]
+    assert from_b["text"] == "from B"
+    assert from_b["start"] == pytest.approx(1.1)
+    report = json.loads(output_path.with_suffix(".run.json").read_text(encoding="utf-8"))
+    assert report["by_name"]["mixdown"]["count"] == 1
+    assert report["status"] == "ok"
+
+
+def test_failed_run_still_writes_its_report_and_trace(monkeypatch, tmp_path: Path) -> None:
+    path = tmp_path / "meeting" / "playback_A_1_2026-02-23_10-00-00.000000.wav"
+    path.parent.mkdir()
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(8000)
+        writer.writeframes(b"\x00\x00" * 8000)
+
+    def broken_transcribe(path: Path, **_: object) -> list[TranscriptSegment]:
+        raise RuntimeError("decoder exploded")
+
+    monkeypatch.setattr(pipeline, "ensure_ffmpeg_tools", lambda: None)
+    monkeypatch.setattr(pipeline, "transcribe_audio", broken_transcribe)
+    config = pipeline.PipelineConfig(
+        audio_dir=path.parent,
+        recording_starter=None,
+        output_dir=tmp_path / "out",
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="cloud",
+        whisper_device="cpu",
+        language=None,
+        meeting_title=None,
+        use_cache=False,
+        trace_file=tmp_path / "trace.jsonl",
+    )
+
+    with pytest.raises(RuntimeError, match="decoder exploded"):
+        pipeline.run_pipeline(config)
+
+    (report_path,) = (tmp_path / "out").glob("meeting_notes_20260223_100000_*.run.json")
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["status"] == "failed"
+    assert report["error"] == "RuntimeError: decoder exploded"
+    assert report["audio_dir"] == str(path.parent)
+    assert (tmp_path / "trace.jsonl").read_text(encoding="utf-8").count("\n") == 1
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from teamspeak_meeting_notes.stages import Stage, run_stages
+
+
+def test_run_stages_overlaps_independent_work_and_reports_critical_path() -> None:
+    def sleeper(seconds: float, value: str):
+        def run(inputs: dict[str, object]) -> str:
+            time.sleep(seconds)
+            return value + "".join(str(inputs[key]) for key in sorted(inputs))
+
+        return run
+
+    stages = [
+        Stage(name="parse", run=sleeper(0.0, "p")),
+        Stage(name="bundle", run=sleeper(0.15, "b"), depends_on=("parse",)),
+        Stage(name="asr", run=sleeper(0.1, "a"), depends_on=("parse",)),
+        Stage(name="summary", run=sleeper(0.1, "s"), depends_on=("asr",)),
+    ]
+
+    report = run_stages(stages, max_workers=4)
+
+    assert report.results["summary"] == "sap"
+    assert report.critical_path == ["parse", "asr", "summary"]
+    assert report.wall_seconds < report.sequential_seconds
+    assert report.saved_seconds > 0.05
+
+
+def test_run_stages_respects_group_limits() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(_: dict[str, object]) -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    stages = [Stage(name=f"asr:{index}", run=work, group="asr") for index in range(6)]
+
+    run_stages(stages, max_workers=6, group_limits={"asr": 2})
+
+    assert peak == 2
+
+
+def test_run_stages_propagates_failures() -> None:
+    def fail(_: dict[str, object]) -> None:
+        raise RuntimeError("ffmpeg missing")
+
+    stages = [
+        Stage(name="bundle", run=fail),
+        Stage(name="summary", run=lambda inputs: inputs, depends_on=("bundle",)),
+    ]
+
+    with pytest.raises(RuntimeError, match="ffmpeg missing"):
+        run_stages(stages)
+
+
+def test_run_stages_without_fail_fast_skips_only_dependents_of_failures() -> None:
+    def fail(_: dict[str, object]) -> None:
+        raise RuntimeError("boom")
+
+    stages = [
+        Stage(name="a/asr", run=fail),
+        Stage(name="a/merge", run=lambda _: "a", depends_on=("a/asr",)),
+        Stage(name="a/summary", run=lambda _: "a", depends_on=("a/merge",)),
+        Stage(name="b/asr", run=lambda _: "b"),
+        Stage(name="b/summary", run=lambda inputs: inputs["b/asr"], depends_on=("b/asr",)),
+    ]
+
+    report = run_stages(stages, max_workers=2, fail_fast=False)
+
+    assert report.results == {"b/asr": "b", "b/summary": "b"}
+    assert list(report.errors) == ["a/asr"]
+    assert sorted(report.skipped) == ["a/merge", "a/summary"]
@@ -0,0 +1,132 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import teamspeak_meeting_notes
+
+HEAVY_MODULES = ("openai", "torch", "whisper")
+# Importing the pipeline used to take ~0.9s, almost all of it openai; it now takes ~0.1s.
+PIPELINE_IMPORT_BUDGET_SECONDS = 0.5
+
+_SRC = str(Path(teamspeak_meeting_notes.__file__).resolve().parents[1])
+
+_MEETING = """
+import sys
+import wave
+from pathlib import Path
+
+audio_dir = Path(sys.argv[1])
+audio_dir.mkdir()
+for name in (
+    "capture_2026-02-23_00-18-10.090315.wav",
+    "playback_Alice_41_2026-02-23_00-18-11.100000.wav",
+):
+    with wave.open(str(audio_dir / name), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(16000)
+        writer.writeframes(b"\\x00\\x00" * 16000)
+"""
+
+
+def _run(code: str, *args: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": _SRC, "PATH": ""},
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def _loaded_heavy_modules(report: dict) -> list[str]:
+    return [name for name in HEAVY_MODULES if name in report["modules"]]
+
+
+def test_bundle_only_run_does_not_import_asr_or_llm_backends(tmp_path: Path) -> None:
+    code = (
+        _MEETING
+        + """
+import json
+from teamspeak_meeting_notes import cli, pipeline
+
+pipeline.ensure_ffmpeg_tools = lambda: None
+pipeline.bundle_tracks = lambda tracks, output_path: output_path.touch()
+sys.argv = ["teamspeak-meeting-notes", "--audio-dir", str(audio_dir), "--bundle-only",
+            "--output-dir", sys.argv[2], "--recording-starter", "Host"]
+cli.run_cli()
+print(json.dumps({"modules": sorted(sys.modules)}))
+"""
+    )
+
+    report = _run(code, str(tmp_path / "meeting"), str(tmp_path / "out"))
+
+    assert _loaded_heavy_modules(report) == []
+    assert list((tmp_path / "out").glob("*.mka"))
+
+
+def test_heuristic_summary_run_does_not_import_asr_or_llm_backends(tmp_path: Path) -> None:
+    code = (
+        _MEETING
+        + """
+import json
+from teamspeak_meeting_notes import cli, pipeline
+from teamspeak_meeting_notes.models import TranscriptSegment
+
+pipeline.ensure_ffmpeg_tools = lambda: None
+pipeline.transcribe_audio = lambda path, **_: [
+    TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text=path.stem)
+]
+sys.argv = ["teamspeak-meeting-notes", "--audio-dir", str(audio_dir), "--heuristic-summary",
+            "--asr-mode", "cloud", "--output-dir", sys.argv[2], "--recording-starter", "Host"]
+cli.run_cli()
+print(json.dumps({"modules": sorted(sys.modules)}))
+"""
+    )
+
+    report = _run(code, str(tmp_path / "meeting"), str(tmp_path / "out"))
+
+    assert _loaded_heavy_modules(report) == []
+    (note,) = (tmp_path / "out").glob("meeting_notes_*.md")
+    assert "Host、Alice" in note.read_text(encoding="utf-8")
+
+
+def test_pipeline_import_stays_within_startup_budget() -> None:
+    code = """
+    import json
+    import sys
+    import time
+
+    started = time.perf_counter()
+    import teamspeak_meeting_notes.pipeline
+
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+    """
+
+    # Best of a few cold interpreters so a busy machine does not fail the budget.
+    reports = [_run(code) for _ in range(3)]
+
+    assert all(_loaded_heavy_modules(report) == [] for report in reports)
+    assert min(report["seconds"] for report in reports) < PIPELINE_IMPORT_BUDGET_SECONDS
+
+
+def test_summarizer_does_not_import_the_asr_stack() -> None:
+    code = """
+    import json
+    import sys
+
+    import teamspeak_meeting_notes.summarize
+
+    print(json.dumps({"modules": sorted(sys.modules)}))
+    """
+
+    report = _run(code)
+
+    asr_modules = ("transcribe", "audio_encode", "chunking", "vad")
+    assert [
+        name for name in asr_modules if f"teamspeak_meeting_notes.{name}" in report["modules"]
+    ] == []
@@ -0,0 +1,222 @@
+import threading
+import types
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from teamspeak_meeting_notes import summarize
+from teamspeak_meeting_notes.models import TimelineUtterance
+from teamspeak_meeting_notes.summarize import estimate_tokens, split_windows
+
+
+def _utterances(count: int, text: str = "我们需要确认下周的安排") -> list[TimelineUtterance]:
+    base = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+    return [
+        TimelineUtterance(
+            speaker_name="A" if index % 2 else "B",
+            start_at=base + timedelta(seconds=10 * index),
+            end_at=base + timedelta(seconds=10 * index + 5),
+            text=text,
+            source_file=Path("a.wav"),
+        )
+        for index in range(count)
+    ]
+
+
+def test_estimate_tokens_counts_cjk_per_character() -> None:
+    assert estimate_tokens("会议助手") == 4
+    assert estimate_tokens("abcdefgh") == 2
+
+
+def test_split_windows_respects_token_budget_and_order() -> None:
+    rows = _utterances(10)
+
+    windows = split_windows(rows, max_tokens=60)
+
+    assert len(windows) > 1
+    assert [row for window in windows for row in window] == rows
+    for window in windows:
+        assert sum(estimate_tokens(summarize._utterance_line(row)) + 1 for row in window) <= 60
+
+
+class _FakeResponses:
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+        self.lock = threading.Lock()
+
+    def create(self, model: str, input: list[dict[str, str]]) -> object:
+        with self.lock:
+            self.prompts.append(input[1]["content"])
+            index = len(self.prompts)
+        return types.SimpleNamespace(output_text=f"会议助手00:{index:02d} 片段{index}")
+
+
+def test_summarize_hierarchical_maps_windows_then_reduces(monkeypatch) -> None:
+    responses = _FakeResponses()
+    client = types.SimpleNamespace(responses=responses)
+    monkeypatch.setattr(summarize, "_ollama_client", lambda: (client, "test-model"))
+
+    result = summarize.summarize_hierarchical(
+        _utterances(12), meeting_title="周会", window_tokens=80, concurrency=3
+    )
+
+    windows = len(split_windows(_utterances(12), max_tokens=80))
+    assert len(responses.prompts) == windows + 1
+    assert "综合观察" in responses.prompts[-1]
+    assert result.startswith("会议助手")
+
+
+def test_summary_stats_reach_the_final_prompt_only(monkeypatch) -> None:
+    responses = _FakeResponses()
+    client = types.SimpleNamespace(responses=responses)
+    monkeypatch.setattr(summarize, "_ollama_client", lambda: (client, "test-model"))
+
+    summarize.summarize_hierarchical(
+        _utterances(12), meeting_title="周会", window_tokens=80, with_stats=True
+    )
+
+    assert "会议统计" in responses.prompts[-1]
+    assert "发言时长占比：B 50%、A 50%" in responses.prompts[-1]
+    assert not any("会议统计" in prompt for prompt in responses.prompts[:-1])
+
+
+def test_summarize_heuristic_reports_talk_time_from_the_timeline() -> None:
+    note = summarize.summarize_heuristic(_utterances(12), "周会")
+
+    assert note.startswith("会议助手00:18 B和A在该时段发言较为集中（有效发言约1分00秒）")
+    assert "发言时长占比：B 50%、A 50%。有效发言共1分00秒（占会议时长52%）" in note
+    assert "插话0次" in note
+
+
+def test_summarize_heuristic_uses_configured_keywords(tmp_path: Path) -> None:
+    rows = _utterances(6, text="Ship the RELEASE on Friday")
+    path = tmp_path / "keywords.json"
+    path.write_text('{"action": ["release"], "off_topic": []}', encoding="utf-8")
+
+    default_note = summarize.summarize_heuristic(rows, "周会")
+    custom_note = summarize.summarize_heuristic(
+        rows, "周会", keywords=summarize.load_heuristic_keywords(path)
+    )
+    no_keywords = summarize.summarize_heuristic(
+        rows, "周会", keywords=summarize.HeuristicKeywords(action=(), off_topic=())
+    )
+
+    assert "未检出高置信度结论与行动项" in default_note
+    assert "已出现部分行动导向信息" in custom_note
+    assert "出现了可执行导向的表达" in custom_note
+    # "release" inside another word is not a hit.
+    rows = _utterances(6, text="prerelease notes")
+    assert "未形成明确行动项" in summarize.summarize_heuristic(
+        rows, "周会", keywords=summarize.load_heuristic_keywords(path)
+    )
+    assert "未检出高置信度结论与行动项" in no_keywords
+
+
+def test_keyword_pattern_matches_chinese_keywords_inside_sentences(tmp_path: Path) -> None:
+    pattern = summarize._keyword_pattern(("需要", "下周", "游戏", "release"))
+
+    for text in ("我们需要跟进", "下周安排一下", "这个游戏好玩", "发布release版本"):
+        assert pattern.search(text), text
+    assert not pattern.search("prerelease notes")
+
+    path = tmp_path / "keywords.json"
+    path.write_text('{"action": ["跟进"], "off_topic": []}', encoding="utf-8")
+    note = summarize.summarize_heuristic(
+        _utterances(6, text="这件事我们下周继续跟进一下"),
+        "周会",
+        keywords=summarize.load_heuristic_keywords(path),
+    )
+    assert "出现了可执行导向的表达" in note
+
+
+def test_compact_transcript_merges_runs_aliases_speakers_and_drops_noise(monkeypatch) -> None:
+    base = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+
+    def row(speaker: str, start: float, text: str) -> TimelineUtterance:
+        return TimelineUtterance(
+            speaker_name=speaker,
+            start_at=base + timedelta(seconds=start),
+            end_at=base + timedelta(seconds=start + 4),
+            text=text,
+            source_file=Path(f"{speaker}.wav"),
+        )
+
+    rows = [
+        row("张三丰", 0, "我们先看上周的进度"),
+        row("Bob", 4, "嗯嗯。"),
+        row("张三丰", 5, "构建已经修好了"),
+        row("张三丰", 10, "  "),
+        row("张三丰", 12, "下周需要补测试"),
+        row("Bob", 40, "[ASR unavailable for Bob.wav: timeout]"),
+        row("Bob", 41, "Um, uh..."),
+        row("Bob", 42, "I'll follow up"),
+        # Too long after the previous line to be the same run.
+        row("Bob", 90, "ok"),
+    ]
+
+    compacted = summarize.compact_transcript(rows)
+
+    assert compacted.aliases == {"张三丰": "S1", "Bob": "S2"}
+    assert [(r.speaker_name, r.text) for r in compacted.utterances] == [
+        ("张三丰", "我们先看上周的进度 构建已经修好了 下周需要补测试"),
+        ("Bob", "I'll follow up"),
+        ("Bob", "ok"),
+    ]
+    assert compacted.utterances[0].end_at == base + timedelta(seconds=16)
+    assert compacted.dropped == 4
+    assert compacted.tokens_after < compacted.tokens_before
+    assert rows[0].text == "我们先看上周的进度"
+
+    responses = _FakeResponses()
+    client = types.SimpleNamespace(responses=responses)
+    monkeypatch.setattr(summarize, "_ollama_client", lambda: (client, "test-model"))
+    summarize.summarize_hierarchical(rows, meeting_title="周会", compact=True)
+
+    (prompt,) = responses.prompts
+    assert "发言人代号：S1=张三丰，S2=Bob" in prompt
+    assert "[00:18] S1: 我们先看上周的进度 构建已经修好了 下周需要补测试" in prompt
+    assert "ASR unavailable" not in prompt
+
+
+def test_llm_retry_backs_off_without_holding_a_limiter_slot(monkeypatch) -> None:
+    events: list[tuple[str, int]] = []
+
+    class _Limiter:
+        @contextmanager
+        def slot(self, tokens: int = 0) -> Iterator[None]:
+            events.append(("acquire", tokens))
+            try:
+                yield
+            finally:
+                events.append(("release", tokens))
+
+    responses = iter([ConnectionError("reset"), types.SimpleNamespace(output_text=" 纪要 ")])
+
+    def create(**_: object) -> object:
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client = types.SimpleNamespace(responses=types.SimpleNamespace(create=create))
+    retries = summarize.with_retries
+    monkeypatch.setattr(summarize, "endpoint_limiter", lambda _: _Limiter())
+    monkeypatch.setattr(
+        summarize,
+        "with_retries",
+        lambda request, what, **kwargs: retries(
+            request, what, sleep=lambda _: events.append(("sleep", 0)), **kwargs
+        ),
+    )
+
+    assert summarize._complete(client, "m", "系统", "会议") == "纪要"
+
+    tokens = estimate_tokens("系统") + estimate_tokens("会议")
+    assert events == [
+        ("acquire", tokens),
+        ("release", tokens),
+        ("sleep", 0),
+        ("acquire", tokens),
+        ("release", tokens),
+    ]
@@ -0,0 +1,85 @@
+import os
+import time
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from teamspeak_meeting_notes import summarize
+from teamspeak_meeting_notes.models import TimelineUtterance
+from teamspeak_meeting_notes.summary_cache import SummaryCache
+
+
+def _utterances(count: int) -> list[TimelineUtterance]:
+    base = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+    return [
+        TimelineUtterance(
+            speaker_name="A" if index % 2 else "B",
+            start_at=base + timedelta(seconds=10 * index),
+            end_at=base + timedelta(seconds=10 * index + 5),
+            text=f"第{index}条：我们需要确认下周的安排",
+            source_file=Path("a.wav"),
+        )
+        for index in range(count)
+    ]
+
+
+class _CountingResponses:
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def create(self, model: str, input: list[dict[str, str]]) -> object:
+        self.prompts.append(input[1]["content"])
+        return types.SimpleNamespace(output_text=f"会议助手00:00 第{len(self.prompts)}次生成")
+
+
+def test_summary_cache_reuses_whole_notes_and_unchanged_windows(monkeypatch, tmp_path) -> None:
+    responses = _CountingResponses()
+    client = types.SimpleNamespace(responses=responses)
+    monkeypatch.setattr(summarize, "_ollama_client", lambda: (client, "test-model"))
+    cache = SummaryCache(root=tmp_path / "summaries")
+    rows = _utterances(12)
+
+    first = summarize.summarize_hierarchical(rows, "周会", window_tokens=80, cache=cache)
+    calls = len(responses.prompts)
+    streamed: list[str] = []
+    again = summarize.summarize_hierarchical(
+        rows, "周会", window_tokens=80, cache=cache, on_delta=streamed.append
+    )
+
+    assert again == first
+    assert streamed == [first]
+    assert len(responses.prompts) == calls
+
+    # A longer transcript only summarizes its new windows, then reduces again.
+    windows = summarize.split_windows(rows, max_tokens=80)
+    grown = summarize.split_windows(_utterances(16), max_tokens=80)
+    summarize.summarize_hierarchical(_utterances(16), "周会", window_tokens=80, cache=cache)
+    reused = sum(a == b for a, b in zip(windows, grown, strict=False))
+    assert reused == len(windows)
+    assert len(responses.prompts) - calls == len(grown) - reused + 1
+
+
+def test_summary_cache_evicts_stale_and_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = SummaryCache(root=tmp_path / "cache", max_age_seconds=3600)
+    key = cache.key_for("summary", "transcript", "system", "model", "http://host/v1")
+    assert key != cache.key_for("summary", "transcript", "system", "model", "http://other/v1")
+    assert key != cache.key_for("window", "transcript", "system", "model", "http://host/v1")
+
+    cache.put(key, "纪要")
+    assert cache.get(key) == "纪要"
+    (entry,) = (tmp_path / "cache").glob("*/*.json")
+    stale = time.time() - 7200
+    os.utime(entry, (stale, stale))
+    assert cache.get(key) is None
+    assert not entry.exists()
+
+    cache.put("aa" + "0" * 62, "一")
+    (entry,) = (tmp_path / "cache").glob("*/*.json")
+    cache.max_bytes = entry.stat().st_size * 2
+    os.utime(entry, (time.time() - 60, time.time() - 60))
+    cache.put("bb" + "0" * 62, "二")
+    cache.put("cc" + "0" * 62, "三")
+
+    assert cache.get("aa" + "0" * 62) is None
+    assert cache.get("bb" + "0" * 62) == "二"
+    assert cache.get("cc" + "0" * 62) == "三"
@@ -2,7 +2,7 @@ from datetime import datetime
 from pathlib import Path
 
 from teamspeak_meeting_notes.models import ParsedTrack, TranscriptSegment
-from teamspeak_meeting_notes.timeline import merge_timeline
+from teamspeak_meeting_notes.timeline import iter_timeline, merge_timeline
 
 
 def test_merge_timeline_orders_by_absolute_time() -> None:
@@ -39,3 +39,44 @@ def test_merge_timeline_orders_by_absolute_time() -> None:
     )
 
     assert [item.text for item in timeline] == ["a first", "b first", "a second"]
+
+
+def test_iter_timeline_matches_stable_sort_tie_breaking() -> None:
+    base = datetime.strptime("2026-02-23_00-18-10.090315", "%Y-%m-%d_%H-%M-%S.%f")
+    tracks = [
+        ParsedTrack(
+            path=Path(f"{name}.wav"),
+            kind="playback",
+            speaker_name=speaker,
+            speaker_id=None,
+            started_at=base,
+        )
+        for name, speaker in (("b1", "B"), ("a", "A"), ("b2", "B"))
+    ]
+    track_segments = [
+        (
+            track,
+            [
+                TranscriptSegment(start_seconds=1.0, end_seconds=2.0, text=f"{track.path.stem}-1"),
+                TranscriptSegment(start_seconds=1.0, end_seconds=2.0, text=f"{track.path.stem}-2"),
+                TranscriptSegment(start_seconds=3.0, end_seconds=3.5, text=f"{track.path.stem}-3"),
+            ],
+        )
+        for track in tracks
+    ]
+
+    stream = iter_timeline(track_segments)
+    first = next(stream)
+
+    assert [first.text, *(item.text for item in stream)] == [
+        "a-1",
+        "a-2",
+        "b1-1",
+        "b1-2",
+        "b2-1",
+        "b2-2",
+        "a-3",
+        "b1-3",
+        "b2-3",
+    ]
+    assert [item.text for item in merge_timeline(track_segments)][:2] == ["a-1", "a-2"]
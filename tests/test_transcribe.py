@@ -0,0 +1,190 @@
+import sys
+import types
+import wave
+from pathlib import Path
+
+import pytest
+
+from teamspeak_meeting_notes import transcribe
+from teamspeak_meeting_notes.chunking import ChunkSettings
+from teamspeak_meeting_notes.clients import DEFAULT_RETRY_POLICY
+from teamspeak_meeting_notes.instrument import recording
+from teamspeak_meeting_notes.models import TranscriptSegment
+from teamspeak_meeting_notes.transcript_cache import TranscriptCache
+
+
+class _FakeModel:
+    def __init__(self, device: str) -> None:
+        self.device = device
+        self.calls: list[str] = []
+
+    def transcribe(self, audio: str, **_: object) -> dict[str, object]:
+        self.calls.append(audio)
+        if self.device == "mps":
+            raise RuntimeError("mps kernel missing")
+        return {
+            "segments": [
+                {"start": 0.5, "end": 1.5, "text": " hello "},
+                {"start": 2.0, "end": 2.5, "text": "   "},
+            ]
+        }
+
+
+def _install_fake_whisper(monkeypatch) -> list[tuple[str, str]]:
+    loads: list[tuple[str, str]] = []
+
+    def load_model(name: str, device: str) -> _FakeModel:
+        loads.append((name, device))
+        return _FakeModel(device)
+
+    monkeypatch.setitem(sys.modules, "whisper", types.SimpleNamespace(load_model=load_model))
+    monkeypatch.setattr(transcribe, "_whisper_models", {})
+    return loads
+
+
+def test_inprocess_whisper_loads_model_once(monkeypatch) -> None:
+    loads = _install_fake_whisper(monkeypatch)
+
+    for name in ("a.wav", "b.wav"):
+        segments = transcribe.transcribe_with_whisper_inprocess(
+            Path(name), language="zh", whisper_device="cpu", whisper_model="tiny"
+        )
+        assert [(seg.start_seconds, seg.end_seconds, seg.text) for seg in segments] == [
+            (0.5, 1.5, "hello")
+        ]
+
+    assert loads == [("tiny", "cpu")]
+
+
+def test_inprocess_whisper_retries_mps_on_cpu(monkeypatch) -> None:
+    loads = _install_fake_whisper(monkeypatch)
+
+    segments = transcribe.transcribe_with_whisper_inprocess(
+        Path("a.wav"), language=None, whisper_device="mps", whisper_model="tiny"
+    )
+
+    assert [seg.text for seg in segments] == ["hello"]
+    assert loads == [("tiny", "mps"), ("tiny", "cpu")]
+
+
+def _write_silence(path: Path, seconds: int) -> None:
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(8000)
+        writer.writeframes(b"\x00\x00" * 8000 * seconds)
+
+
+def test_chunked_asr_spans_report_each_chunks_own_audio(monkeypatch, tmp_path: Path) -> None:
+    track = tmp_path / "long.wav"
+    _write_silence(track, 100)
+    monkeypatch.setattr(
+        transcribe,
+        "transcribe_with_local_whisper",
+        lambda path, **_: [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text=path.stem)],
+    )
+
+    with recording() as recorder:
+        transcribe.transcribe_audio(
+            track,
+            asr_mode="local",
+            whisper_device="cpu",
+            language=None,
+            chunking=ChunkSettings(chunk_seconds=20.0, overlap_seconds=0.0),
+        )
+
+    spans = [item for item in recorder.spans if item.name == "asr"]
+    assert len(spans) == 5
+    assert sum(item.attributes["audio_seconds"] for item in spans) == pytest.approx(100.0)
+    assert {item.attributes["file"] for item in spans} == {"long.wav"}
+
+
+def test_chunked_transcript_cache_ignores_workers_and_mixed_backends(
+    monkeypatch, tmp_path: Path
+) -> None:
+    track = tmp_path / "long.wav"
+    _write_silence(track, 60)
+    cache = TranscriptCache(root=tmp_path / "cache")
+    local_calls: list[str] = []
+
+    def local(path: Path, **_: object) -> list[TranscriptSegment]:
+        local_calls.append(path.stem)
+        if path.stem.endswith("chunk0001"):
+            raise RuntimeError("whisper crashed")
+        return [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text="local")]
+
+    monkeypatch.setattr(transcribe, "transcribe_with_local_whisper", local)
+    monkeypatch.setattr(
+        transcribe,
+        "transcribe_with_openai",
+        lambda path, **_: [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text="cloud")],
+    )
+
+    def run(asr_mode: str, workers: int) -> list[str]:
+        segments = transcribe.transcribe_audio(
+            track,
+            asr_mode=asr_mode,
+            whisper_device="cpu",
+            language=None,
+            cache=cache,
+            chunking=ChunkSettings(chunk_seconds=20.0, overlap_seconds=0.0, workers=workers),
+        )
+        return [segment.text for segment in segments]
+
+    # Chunk 1 fell back to the cloud, so the result belongs to neither backend's cache entry.
+    assert run("hybrid", workers=1) == ["local", "cloud", "local"]
+    assert not list(cache.root.glob("*/*.json"))
+
+    monkeypatch.setattr(transcribe, "transcribe_with_local_whisper", lambda path, **_: [])
+    assert run("local", workers=1) == []
+    monkeypatch.setattr(transcribe, "transcribe_with_local_whisper", local)
+    local_calls.clear()
+    assert run("local", workers=4) == []
+    assert local_calls == []
+
+
+def test_chunked_cloud_asr_retries_once_per_chunk_without_holding_its_slot(
+    monkeypatch, tmp_path: Path
+) -> None:
+    track = tmp_path / "long.wav"
+    _write_silence(track, 40)
+    limits = transcribe.build_asr_limits(local_workers=1, cloud_workers=1)
+    requests: list[str] = []
+    free_while_sleeping: list[bool] = []
+
+    def create(file: object, **_: object) -> object:
+        requests.append(Path(file.name).stem)
+        raise ConnectionError("reset")
+
+    def sleep(_: float) -> None:
+        free = limits.cloud.acquire(blocking=False)
+        if free:
+            limits.cloud.release()
+        free_while_sleeping.append(free)
+
+    client = types.SimpleNamespace(
+        audio=types.SimpleNamespace(transcriptions=types.SimpleNamespace(create=create))
+    )
+    retries = transcribe.with_retries
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(transcribe, "shared_openai_client", lambda api_key: client)
+    monkeypatch.setattr(
+        transcribe,
+        "with_retries",
+        lambda request, what, **kwargs: retries(request, what, sleep=sleep, **kwargs),
+    )
+
+    segments = transcribe.transcribe_audio(
+        track,
+        asr_mode="cloud",
+        whisper_device="cpu",
+        language=None,
+        limits=limits,
+        chunking=ChunkSettings(chunk_seconds=20.0, overlap_seconds=0.0, workers=1),
+        upload_format="wav",
+    )
+
+    # Each chunk gets one retried request (4 attempts); the chunk loop does not repeat it.
+    assert len(requests) == 2 * DEFAULT_RETRY_POLICY.max_attempts
+    assert free_while_sleeping and all(free_while_sleeping)
+    assert all(segment.text.startswith("[ASR unavailable") for segment in segments)
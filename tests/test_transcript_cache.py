@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+
+from teamspeak_meeting_notes import transcribe
+from teamspeak_meeting_notes.models import TranscriptSegment
+from teamspeak_meeting_notes.transcript_cache import TranscriptCache
+
+
+def _wav(tmp_path: Path, name: str, payload: bytes) -> Path:
+    path = tmp_path / name
+    path.write_bytes(payload)
+    return path
+
+
+def test_cache_key_depends_on_content_model_and_language(tmp_path: Path) -> None:
+    cache = TranscriptCache(root=tmp_path / "cache")
+    a = _wav(tmp_path, "a.wav", b"RIFF-a")
+    a_copy = _wav(tmp_path, "copy.wav", b"RIFF-a")
+    b = _wav(tmp_path, "b.wav", b"RIFF-b")
+
+    key = cache.key_for(a, backend="whisper", model="turbo", language="zh")
+    assert key == cache.key_for(a_copy, backend="whisper", model="turbo", language="zh")
+    assert key != cache.key_for(b, backend="whisper", model="turbo", language="zh")
+    assert key != cache.key_for(a, backend="whisper", model="small", language="zh")
+    assert key != cache.key_for(a, backend="whisper", model="turbo", language=None)
+    assert key != cache.key_for(a, backend="openai", model="turbo", language="zh")
+
+
+def test_cache_round_trip_and_lru_eviction(tmp_path: Path) -> None:
+    cache = TranscriptCache(root=tmp_path / "cache", max_bytes=10_000)
+    segments = [TranscriptSegment(start_seconds=1.0, end_seconds=2.5, text="你好")]
+    cache.put("aa" + "0" * 62, segments)
+    assert cache.get("aa" + "0" * 62) == segments
+
+    entries = sorted((tmp_path / "cache").glob("*/*.json"))
+    entry_size = entries[0].stat().st_size
+    cache.max_bytes = entry_size * 2
+    os.utime(entries[0], (1, 1))
+    cache.put("bb" + "0" * 62, segments)
+    cache.put("cc" + "0" * 62, segments)
+
+    assert cache.get("aa" + "0" * 62) is None
+    assert cache.get("bb" + "0" * 62) == segments
+    assert cache.get("cc" + "0" * 62) == segments
+
+
+def test_transcribe_audio_consults_cache_before_asr(monkeypatch, tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def fake_local(path: Path, **_: object) -> list[TranscriptSegment]:
+        calls.append(path.name)
+        return [TranscriptSegment(start_seconds=0.0, end_seconds=1.0, text="hi")]
+
+    monkeypatch.setattr(transcribe, "transcribe_with_local_whisper", fake_local)
+    wav = _wav(tmp_path, "a.wav", b"RIFF-a")
+    cache = TranscriptCache(root=tmp_path / "cache")
+
+    for _ in range(2):
+        segments = transcribe.transcribe_audio(
+            wav, asr_mode="hybrid", whisper_device="cpu", language="zh", cache=cache
+        )
+        assert [seg.text for seg in segments] == ["hi"]
+    assert calls == ["a.wav"]
+
+    cache.refresh = True
+    transcribe.transcribe_audio(
+        wav, asr_mode="hybrid", whisper_device="cpu", language="zh", cache=cache
+    )
+    assert calls == ["a.wav", "a.wav"]
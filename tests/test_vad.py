@@ -0,0 +1,78 @@
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from teamspeak_meeting_notes.models import TranscriptSegment
+from teamspeak_meeting_notes.vad import (
+    SpeechRegion,
+    detect_speech_regions,
+    remap_segments,
+    speech_only_audio,
+    write_speech_only_wav,
+)
+
+SAMPLE_RATE = 16000
+
+
+def _write_wav(path: Path, speech: list[tuple[float, float]], duration: float) -> None:
+    samples = np.zeros(int(duration * SAMPLE_RATE), dtype=np.float32)
+    rng = np.random.default_rng(0)
+    samples += rng.normal(0.0, 0.0005, size=samples.shape).astype(np.float32)
+    for start, end in speech:
+        t = np.arange(int((end - start) * SAMPLE_RATE)) / SAMPLE_RATE
+        begin = int(start * SAMPLE_RATE)
+        samples[begin : begin + len(t)] += 0.3 * np.sin(2 * np.pi * 220 * t)
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(SAMPLE_RATE)
+        writer.writeframes(pcm.tobytes())
+
+
+def test_detect_speech_regions_finds_tone_bursts(tmp_path: Path) -> None:
+    path = tmp_path / "playback.wav"
+    _write_wav(path, speech=[(2.0, 3.0), (10.0, 12.0)], duration=20.0)
+
+    regions = detect_speech_regions(path)
+
+    assert len(regions) == 2
+    assert abs(regions[0].start_seconds - 1.7) < 0.1
+    assert abs(regions[0].end_seconds - 3.3) < 0.1
+    assert abs(regions[1].start_seconds - 9.7) < 0.1
+    assert abs(regions[1].end_seconds - 12.3) < 0.1
+
+
+def test_remap_segments_restores_original_track_time(tmp_path: Path) -> None:
+    path = tmp_path / "playback.wav"
+    _write_wav(path, speech=[], duration=20.0)
+    regions = [
+        SpeechRegion(start_seconds=2.0, end_seconds=3.0),
+        SpeechRegion(start_seconds=10.0, end_seconds=12.0),
+    ]
+
+    spans = write_speech_only_wav(path, regions, tmp_path / "compact.wav", gap_seconds=0.5)
+    with wave.open(str(tmp_path / "compact.wav"), "rb") as reader:
+        assert reader.getnframes() == int(3.5 * SAMPLE_RATE)
+
+    remapped = remap_segments(
+        [
+            TranscriptSegment(start_seconds=0.2, end_seconds=0.9, text="first"),
+            TranscriptSegment(start_seconds=1.6, end_seconds=3.4, text="second"),
+        ],
+        spans,
+    )
+
+    assert [(round(s.start_seconds, 3), round(s.end_seconds, 3)) for s in remapped] == [
+        (2.2, 2.9),
+        (10.1, 11.9),
+    ]
+
+
+def test_speech_only_audio_reports_silent_track(tmp_path: Path) -> None:
+    path = tmp_path / "playback.wav"
+    _write_wav(path, speech=[], duration=5.0)
+
+    with speech_only_audio(path) as audio:
+        assert audio.spans == []
@@ -0,0 +1,151 @@
+import threading
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+from teamspeak_meeting_notes import watch
+from teamspeak_meeting_notes.pipeline import PipelineConfig
+from teamspeak_meeting_notes.watch import (
+    WatchSettings,
+    _FileState,
+    _is_settled,
+    _update_file_states,
+    group_meetings,
+    scan_recordings,
+)
+
+
+def _write_wav(path: Path, seconds: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(100)
+        writer.writeframes(b"\x00\x00" * int(seconds * 100))
+
+
+def test_group_meetings_keeps_late_joiners_and_splits_on_gap(tmp_path: Path) -> None:
+    # Meeting one runs 10:00-11:00; B joins at 10:40. Meeting two starts at 13:00.
+    _write_wav(tmp_path / "playback_A_1_2026-02-23_10-00-00.000000.wav", 3600)
+    _write_wav(tmp_path / "playback_B_2_2026-02-23_10-40-00.000000.wav", 600)
+    _write_wav(tmp_path / "playback_A_1_2026-02-23_13-00-00.000000.wav", 60)
+    _write_wav(tmp_path / "other" / "playback_C_3_2026-02-23_10-05-00.000000.wav", 60)
+    (tmp_path / "notes.wav").write_bytes(b"")
+
+    groups = group_meetings(scan_recordings(tmp_path, None), gap_seconds=600)
+
+    summary = sorted(
+        (group.directory.name, sorted(track.speaker_name for track in group.tracks))
+        for group in groups
+    )
+    assert summary == [
+        ("other", ["C"]),
+        (tmp_path.name, ["A"]),
+        (tmp_path.name, ["A", "B"]),
+    ]
+
+
+def test_meeting_settles_only_after_tracks_stop_growing(tmp_path: Path) -> None:
+    path = tmp_path / "playback_A_1_2026-02-23_10-00-00.000000.wav"
+    _write_wav(path, 1)
+    states: dict[Path, _FileState] = {}
+    tracks = scan_recordings(tmp_path, None)
+    (group,) = group_meetings(tracks, gap_seconds=600)
+
+    _update_file_states(tracks, states, now=0.0)
+    assert not _is_settled(group, states, now=30.0, settle_seconds=60)
+
+    _write_wav(path, 2)
+    _update_file_states(tracks, states, now=50.0)
+    assert not _is_settled(group, states, now=100.0, settle_seconds=60)
+
+    _update_file_states(tracks, states, now=120.0)
+    assert _is_settled(group, states, now=120.0, settle_seconds=60)
+
+
+def test_processed_state_round_trips(tmp_path: Path) -> None:
+    state = watch.load_watch_state(tmp_path)
+    state.processed["meeting"] = "abc"
+    state.save()
+
+    assert watch.load_watch_state(tmp_path).processed == {"meeting": "abc"}
+
+
+def test_concurrent_state_updates_are_all_saved(tmp_path: Path) -> None:
+    state = watch.load_watch_state(tmp_path)
+
+    def mark(worker: int) -> None:
+        for index in range(50):
+            state.mark_processed(f"meeting-{worker}-{index}", "abc")
+
+    threads = [threading.Thread(target=mark, args=(worker,)) for worker in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(watch.load_watch_state(tmp_path).processed) == 150
+    assert [path.name for path in tmp_path.iterdir()] == [watch.WATCH_STATE_FILE]
+
+
+def test_failed_meeting_backs_off_and_gives_up_until_tracks_change(tmp_path: Path) -> None:
+    state = watch.load_watch_state(tmp_path)
+
+    assert state.mark_failed("meeting", "abc", now=0.0, backoff_seconds=10) == 1
+    assert not state.is_due("meeting", "abc", now=5.0, max_attempts=3)
+    assert state.is_due("meeting", "abc", now=10.0, max_attempts=3)
+
+    assert state.mark_failed("meeting", "abc", now=10.0, backoff_seconds=10) == 2
+    assert not state.is_due("meeting", "abc", now=25.0, max_attempts=3)
+    assert state.is_due("meeting", "abc", now=30.0, max_attempts=3)
+
+    state.mark_failed("meeting", "abc", now=30.0, backoff_seconds=10)
+    restored = watch.load_watch_state(tmp_path)
+    assert not restored.is_due("meeting", "abc", now=1e9, max_attempts=3)
+    assert restored.is_due("meeting", "changed", now=30.0, max_attempts=3)
+
+    restored.mark_processed("meeting", "changed")
+    assert watch.load_watch_state(tmp_path).failures == {}
+
+
+def test_watch_stops_resubmitting_a_meeting_that_keeps_failing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    audio_dir = tmp_path / "audio"
+    _write_wav(audio_dir / "playback_A_1_2026-02-23_10-00-00.000000.wav", 1)
+    calls: list[PipelineConfig] = []
+
+    def failing_pipeline(config: PipelineConfig) -> Path:
+        calls.append(config)
+        raise RuntimeError("ASR endpoint down")
+
+    monkeypatch.setattr(watch, "run_pipeline", failing_pipeline)
+    config = PipelineConfig(
+        audio_dir=audio_dir,
+        recording_starter=None,
+        output_dir=tmp_path / "output",
+        bundle_multitrack=False,
+        bundle_only=False,
+        bundle_path=None,
+        asr_mode="cloud",
+        whisper_device="cpu",
+        language=None,
+        meeting_title=None,
+    )
+    settings = WatchSettings(
+        poll_interval=0.01,
+        settle_seconds=0.0,
+        use_inotify=False,
+        max_attempts=2,
+        retry_backoff_seconds=0.0,
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=watch.watch_meetings, args=(audio_dir, config, settings, stop))
+    thread.start()
+    time.sleep(0.5)
+    stop.set()
+    thread.join()
+
+    assert len(calls) == 2